@@ -0,0 +1,1264 @@
+# optimizer_gui.py - PySide6-Oberfläche; die Engine liegt in ultimate_optimizer.py
+import sys
+import os
+import time
+
+# Zeitmarken für --profile-startup
+STARTUP_MARKS = [("GUI-Modul", time.perf_counter())]
+
+# 1. ZUERST: Versuche einfache Paketprüfung
+print("🔍 Starte Ultimate Optimizer...")
+
+try:
+    # Nur die benötigten Klassen: ein Stern-Import legt jeden Typ der drei Module an
+    from PySide6.QtWidgets import (
+        QAbstractItemView, QApplication, QCheckBox, QComboBox, QFrame, QGridLayout, QHBoxLayout,
+        QHeaderView, QLabel, QLineEdit, QMainWindow, QMessageBox, QPlainTextEdit, QProgressBar, QPushButton,
+        QScrollArea, QTabWidget, QTableWidget, QTableWidgetItem, QTextEdit, QVBoxLayout, QWidget,
+    )
+    from PySide6.QtCore import QObject, QRectF, QTimer, Qt, Signal, Slot
+    from PySide6.QtGui import QColor, QPainter, QTextCharFormat, QTextCursor
+    print("✅ PySide6 geladen")
+except ImportError as e:
+    print(f"❌ PySide6 Fehler: {e}")
+    print("\n👉 INSTALLIERE PySide6 mit:")
+    print("pip install PySide6")
+    input("\nDrücke Enter zum Beenden...")
+    sys.exit(1)
+
+from ultimate_optimizer import *
+
+STARTUP_MARKS.append(("Qt + Engine importiert", time.perf_counter()))
+
+
+# ========== THEME ==========
+
+# Akzentfarben der Karten und Buttons; im Stylesheet über die Property "accent" ausgewählt
+ACCENTS = {
+    'cyan': "#00ffff", 'blue': "#00aaff", 'sky': "#0088ff", 'orange': "#ff9900", 'purple': "#aa00ff",
+    'magenta': "#ff00ff", 'green': "#00ff00", 'yellow': "#ffff00", 'red': "#ff5555",
+}
+
+
+def build_stylesheet():
+    # Ein einziges Stylesheet für die ganze Anwendung. Widgets wählen ihre Regeln über
+    # objectName bzw. die dynamischen Properties "role" und "accent" – Qt parst das
+    # Sheet einmal, statt für jede Karte ein eigenes f-String-Sheet zu kaskadieren.
+    sheet = """
+        QMainWindow { background-color: #0a0a0a; }
+        QWidget { color: #ffffff; font-family: 'Segoe UI'; font-size: 12px; }
+        
+        #sidebar { background-color: #111111; border-right: 1px solid #333333; }
+        #logo { color: #00ffff; font-size: 20px; font-weight: bold; padding: 10px; }
+        QPushButton[role="nav"] {
+            background-color: #1a1a1a; color: #cccccc; border: 1px solid #333333; border-radius: 5px;
+            padding: 10px; padding-left: 15px; text-align: left;
+        }
+        QPushButton[role="nav"]:hover { background-color: #222222; border-color: #00ffff; }
+        QPushButton[role="nav"]:pressed { background-color: #333333; }
+        #statusFrame { background-color: #151515; border: 1px solid #333333; border-radius: 5px; padding: 10px; }
+        QLabel[role="status"] { font-size: 11px; font-weight: bold; }
+        #quickFrame { margin-top: 10px; }
+        
+        QPushButton[role="primary"] {
+            background-color: #00aa00; color: white; border: none; border-radius: 5px;
+            padding: 12px; font-weight: bold;
+        }
+        QPushButton[role="primary"]:hover { background-color: #00cc00; }
+        #saveSettings { font-size: 13px; margin-top: 20px; }
+        QPushButton[role="danger"] {
+            background-color: #aa0000; color: white; border: none; border-radius: 5px;
+            padding: 10px; font-size: 11px; margin-top: 5px;
+        }
+        QPushButton[role="danger"]:hover { background-color: #cc0000; }
+        
+        #mainContent { background-color: #0f0f0f; }
+        #header { background-color: #111111; border: 1px solid #333333; border-radius: 5px; padding: 15px; }
+        #headerTitle { font-size: 20px; font-weight: bold; color: #ffffff; }
+        #statusIndicator {
+            color: #00ff00; font-weight: bold; padding: 5px 15px; background-color: #1a1a1a;
+            border-radius: 15px; border: 1px solid #333333;
+        }
+        QTabWidget::pane { border: 1px solid #222222; background-color: #111111; border-radius: 5px; }
+        QTabBar::tab {
+            background-color: #1a1a1a; color: #cccccc; padding: 10px 20px; margin-right: 2px;
+            border-top-left-radius: 5px; border-top-right-radius: 5px;
+        }
+        QTabBar::tab:selected { background-color: #00aaaa; color: #000000; font-weight: bold; }
+        QTabBar::tab:hover { background-color: #333333; }
+        QScrollArea { background-color: #111111; border: none; }
+        QScrollArea > QWidget > QWidget { background-color: #111111; }
+        
+        #footer { background-color: #111111; border: 1px solid #222222; border-radius: 5px; padding: 10px; }
+        #progressLabel { color: #00ffff; }
+        QProgressBar {
+            border: 1px solid #333333; border-radius: 3px; text-align: center; height: 20px; color: white;
+        }
+        QProgressBar::chunk { background-color: #00aa00; border-radius: 3px; }
+        #logConsole {
+            background-color: #0a0a0a; color: #cccccc; border: 1px solid #222222; border-radius: 3px;
+            padding: 8px; font-family: 'Consolas'; font-size: 10px;
+        }
+        
+        QFrame[role="card"] {
+            background-color: #1a1a1a; border: 1px solid #333333; border-radius: 5px; padding: 15px; margin: 5px;
+        }
+        QLabel[role="card-title"] { font-size: 14px; font-weight: bold; }
+        QPushButton[role="card-button"] {
+            background-color: #222222; border: 1px solid #333333; border-radius: 3px; padding: 8px; margin-top: 10px;
+        }
+        QPushButton[role="card-button"]:hover { background-color: #333333; }
+        #benchButton { margin-top: 0px; }
+        QFrame[role="stat"] { background-color: #1a1a1a; border: 1px solid #333333; border-radius: 5px; padding: 15px; }
+        QLabel[role="stat-value"] { font-size: 24px; font-weight: bold; }
+        QLabel[role="stat-name"] { color: #888888; }
+        QPushButton[role="export"] {
+            background-color: #333333; border: 1px solid #333333; border-radius: 3px; padding: 8px;
+        }
+        QPushButton[role="export"]:hover { background-color: #444444; }
+        QCheckBox { color: #cccccc; font-size: 13px; }
+        QComboBox, QLineEdit { color: #ffffff; background-color: #222222; padding: 5px; border: 1px solid #333333; }
+        QTableWidget { color: #ffffff; background-color: #111111; gridline-color: #333333; }
+    """
+    for name, color in ACCENTS.items():
+        sheet += f"""
+        QFrame[role="card"][accent="{name}"], QFrame[role="stat"][accent="{name}"] {{ border-color: {color}; }}
+        QLabel[accent="{name}"] {{ color: {color}; }}
+        QPushButton[role="card-button"][accent="{name}"], QPushButton[role="export"][accent="{name}"] {{
+            color: {color}; border-color: {color};
+        }}"""
+    return sheet
+
+
+def apply_theme(app=None):
+    app = app or QApplication.instance()
+    if app is not None and not app.property("themed"):
+        app.setStyleSheet(build_stylesheet())
+        app.setProperty("themed", True)
+
+
+def styled(widget, role=None, accent=None, name=None):
+    # Property/objectName setzen, bevor das Widget gepolisht wird
+    if role:
+        widget.setProperty("role", role)
+    if accent:
+        widget.setProperty("accent", accent)
+    if name:
+        widget.setObjectName(name)
+    return widget
+
+
+def make_button(text, slot=None, role="card-button", accent=None):
+    button = styled(QPushButton(text), role, accent)
+    if slot is not None:
+        button.clicked.connect(slot)
+    return button
+
+
+def make_card(title, button_text, slot, accent):
+    card = styled(QFrame(), "card", accent)
+    layout = QVBoxLayout(card)
+    layout.addWidget(styled(QLabel(title), "card-title", accent))
+    layout.addWidget(make_button(button_text, slot, accent=accent))
+    return card
+
+
+def make_scroll_tab(widgets):
+    tab = QWidget()
+    layout = QVBoxLayout(tab)
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    scroll_content = QWidget()
+    scroll_layout = QVBoxLayout(scroll_content)
+    for widget in widgets:
+        scroll_layout.addWidget(widget)
+    scroll_layout.addStretch()
+    scroll.setWidget(scroll_content)
+    layout.addWidget(scroll)
+    return tab, scroll_layout
+
+
+def _legacy_card(title, button_text, color):
+    # Bisheriger Aufbau mit eigenem Stylesheet pro Widget, nur noch für den Vergleichs-Benchmark
+    frame = QFrame()
+    frame.setStyleSheet(f"""
+        QFrame {{
+            background-color: #1a1a1a;
+            border: 1px solid {color};
+            border-radius: 5px;
+            padding: 15px;
+            margin: 5px;
+        }}
+    """)
+    layout = QVBoxLayout(frame)
+    label = QLabel(title)
+    label.setStyleSheet(f"color: {color}; font-size: 14px; font-weight: bold;")
+    layout.addWidget(label)
+    btn = QPushButton(button_text)
+    btn.setStyleSheet(f"""
+        QPushButton {{
+            background-color: #222222;
+            color: {color};
+            border: 1px solid {color};
+            border-radius: 3px;
+            padding: 8px;
+            font-size: 12px;
+            margin-top: 10px;
+        }}
+        QPushButton:hover {{
+            background-color: #333333;
+        }}
+    """)
+    layout.addWidget(btn)
+    return frame
+
+
+def bench_widget_construction(cards=400, rounds=3):
+    # Karten bauen, anzeigen (offscreen) und bis zum ersten Frame polishen: pro Widget-Sheets gegen App-Sheet
+    import psutil
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = QApplication.instance() or QApplication([])
+    process = psutil.Process()
+    colors = list(ACCENTS.items())
+    results = {}
+    for name in ('legacy', 'themed'):
+        app.setStyleSheet(build_stylesheet() if name == 'themed' else "")
+        app.setProperty("themed", name == 'themed')
+        times = []
+        rss_delta = 0
+        for r in range(rounds + 1):
+            rss_before = process.memory_info().rss
+            t0 = time.perf_counter()
+            container = QWidget()
+            layout = QVBoxLayout(container)
+            for i in range(cards):
+                accent, color = colors[i % len(colors)]
+                if name == 'legacy':
+                    layout.addWidget(_legacy_card(f"Karte {i}", "Starten", color))
+                else:
+                    layout.addWidget(make_card(f"Karte {i}", "Starten", None, accent))
+            container.show()
+            app.processEvents()
+            if r:  # erste Runde wärmt Schriften und Style-Caches auf
+                times.append(time.perf_counter() - t0)
+                rss_delta = max(rss_delta, process.memory_info().rss - rss_before)
+            container.close()
+            container.deleteLater()
+            app.processEvents()
+        results[name] = {
+            'cards': cards,
+            'build_and_show_ms': round(statistics.median(times) * 1000, 1),
+            'rss_delta_mb': round(rss_delta / 1024**2, 1),
+        }
+    return results
+
+
+# ========== UI-BRIDGE & LOG ==========
+
+class UiBridge(QObject):
+    # Worker-Threads dürfen keine Widgets anfassen. Sie legen Fortschritt und Log-Zeilen
+    # hier ab; ein Frame-Timer im GUI-Thread (~16 ms) gibt pro Frame nur den letzten
+    # Fortschrittswert und einen gesammelten Log-Block an die Widgets weiter.
+    progress_changed = Signal(int, str)
+    progress_visible = Signal(bool)
+    log_batch = Signal(list)
+    invoke = Signal(object)
+    _wake = Signal()
+    
+    FRAME_MS = 16
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._progress = None
+        self._progress_text = ""
+        self._visible = None
+        self._logs = []
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._schedule, Qt.ConnectionType.QueuedConnection)
+        self.invoke.connect(self._run_callable, Qt.ConnectionType.QueuedConnection)
+    
+    def post_progress(self, value, text=""):
+        with self._lock:
+            self._progress = value
+            if text:
+                self._progress_text = text
+            wake = self._mark_pending()
+        if wake:
+            self._wake.emit()
+    
+    def post_visible(self, visible):
+        with self._lock:
+            self._visible = visible
+            wake = self._mark_pending()
+        if wake:
+            self._wake.emit()
+    
+    def post_log(self, entry):
+        with self._lock:
+            self._logs.append(entry)
+            wake = self._mark_pending()
+        if wake:
+            self._wake.emit()
+    
+    def _mark_pending(self):
+        if self._scheduled:
+            return False
+        self._scheduled = True
+        return True
+    
+    @Slot()
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    @Slot()
+    def flush(self):
+        with self._lock:
+            progress, text = self._progress, self._progress_text
+            visible, logs = self._visible, self._logs
+            self._progress, self._progress_text, self._visible = None, "", None
+            self._logs = []
+            self._scheduled = False
+        
+        if visible is True:
+            self.progress_visible.emit(True)
+        if progress is not None:
+            self.progress_changed.emit(progress, text)
+        if logs:
+            self.log_batch.emit(logs)
+        if visible is False:
+            self.progress_visible.emit(False)
+    
+    @Slot(object)
+    def _run_callable(self, func):
+        func()
+
+
+LOG_COLORS = {
+    'DEBUG': "#555555", 'INFO': "#888888", 'SUCCESS': "#00ff00",
+    'WARNING': "#ffff00", 'ERROR': "#ff5555", 'CRITICAL': "#ff0000",
+}
+
+
+class LogConsole(QPlainTextEdit):
+    # Begrenzte Log-Konsole: QPlainTextEdit verwirft alte Zeilen ab max_lines selbst,
+    # Einfügen passiert blockweise mit vorberechneten Formaten statt HTML pro Zeile.
+    def __init__(self, max_lines=5000, min_level="INFO", parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+        self.min_level = LOG_LEVELS.get(min_level, 1)
+        
+        self._formats = {}
+        for level, color in LOG_COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._formats[level] = fmt
+    
+    def set_min_level(self, level):
+        self.min_level = LOG_LEVELS.get(level, 1)
+    
+    def accepts(self, level):
+        return LOG_LEVELS.get(level, 1) >= self.min_level
+    
+    def append_batch(self, entries):
+        max_lines = self.maximumBlockCount()
+        if max_lines and len(entries) > max_lines:
+            # Was sofort wieder herausfallen würde, gar nicht erst einfügen
+            entries = entries[-max_lines:]
+        
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        
+        # Aufeinanderfolgende Zeilen gleichen Levels gehen in einem insertText() raus
+        runs = []
+        for timestamp, message, level in entries:
+            if runs and runs[-1][0] == level:
+                runs[-1][1].append(f"[{timestamp}] {message}")
+            else:
+                runs.append((level, [f"[{timestamp}] {message}"]))
+        
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        prefix = "" if self.document().isEmpty() else "\n"
+        default = self._formats['INFO']
+        for level, lines in runs:
+            cursor.insertText(prefix + "\n".join(lines), self._formats.get(level, default))
+            prefix = "\n"
+        cursor.endEditBlock()
+        
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+
+def bench_log_console(count=100_000, legacy=False):
+    app = QApplication.instance() or QApplication([])
+    process = psutil.Process()
+    results = {}
+    
+    variants = [('log_console', None)]
+    if legacy:
+        variants.insert(0, ('qtextedit_append', None))
+    
+    for name, _ in variants:
+        rss_before = process.memory_info().rss
+        ui_time = 0.0
+        if name == 'log_console':
+            bridge = UiBridge()
+            console = LogConsole(max_lines=5000)
+            bridge.log_batch.connect(console.append_batch)
+            t_wall = time.perf_counter()
+            for i in range(count):
+                bridge.post_log(("12:00:00", f"Datei {i} gelöscht", "INFO" if i % 10 else "SUCCESS"))
+                if i % 2000 == 1999:
+                    # Ein Frame: Flush im GUI-Thread messen
+                    t0 = time.perf_counter()
+                    bridge.flush()
+                    app.processEvents()
+                    ui_time += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            bridge.flush()
+            app.processEvents()
+            ui_time += time.perf_counter() - t0
+            lines = console.document().blockCount()
+        else:
+            console = QTextEdit()
+            t_wall = time.perf_counter()
+            for i in range(count):
+                t0 = time.perf_counter()
+                console.append(f"[12:00:00] <span style='color: #888888'>Datei {i} gelöscht</span>")
+                ui_time += time.perf_counter() - t0
+            app.processEvents()
+            lines = console.document().blockCount()
+        wall = time.perf_counter() - t_wall
+        rss_after = process.memory_info().rss
+        results[name] = {
+            'messages': count,
+            'ui_thread_time': round(ui_time, 3),
+            'wall_time': round(wall, 3),
+            'retained_lines': lines,
+            'rss_delta_mb': round((rss_after - rss_before) / 1024**2, 1),
+        }
+        print(f"{name:>16}: UI-Thread {ui_time:.3f}s, RSS +{results[name]['rss_delta_mb']} MB, {lines} Zeilen")
+        console.deleteLater()
+    return results
+
+
+# ========== TREEMAP ==========
+
+class TreemapWidget(QWidget):
+    # Unterordner als Kacheln (zwei Ebenen), Fläche = Größe aus dem DirSizeIndex.
+    # Links-Klick öffnet einen Ordner, Rechts-Klick geht eine Ebene zurück. Das Layout wird
+    # nur bei neuem Ordner oder neuer Größe berechnet, paintEvent zeichnet nur die Liste.
+    path_changed = Signal(str)
+    
+    COLORS = ["#00aaaa", "#0088ff", "#aa00ff", "#ff00ff", "#ff9900", "#00aa00", "#aaaa00", "#ff5555"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None
+        self.root = None
+        self.path = None
+        self._tiles = []
+        self.setMinimumHeight(250)
+        self.setMouseTracking(True)
+    
+    def set_index(self, index, root):
+        self.index, self.root = index, root
+        self.set_path(root)
+    
+    def set_path(self, path):
+        self.path = path
+        self._relayout()
+        self.update()
+        self.path_changed.emit(path)
+    
+    def go_up(self):
+        if self.path and self.path != self.root:
+            self.set_path(os.path.dirname(self.path.rstrip(os.sep)) or self.root)
+    
+    def resizeEvent(self, event):
+        self._relayout()
+        super().resizeEvent(event)
+    
+    def _relayout(self):
+        self._tiles = []
+        if self.index is None or self.path is None:
+            return
+        top = squarify([(size, (path, size)) for path, size, _ in self.index.children(self.path, limit=60)],
+                       0, 0, self.width(), self.height())
+        for i, (x, y, w, h, (path, size)) in enumerate(top):
+            color = QColor(self.COLORS[i % len(self.COLORS)])
+            inner = []
+            if path and w > 60 and h > 40:
+                inner = squarify([(s, (p or path, s)) for p, s, _ in self.index.children(path, limit=30)],
+                                 x + 3, y + 18, w - 6, h - 21)
+            self._tiles.append((QRectF(x, y, w, h), path, size, color.darker(300 if inner else 170), 0))
+            for ix, iy, iw, ih, (inner_path, inner_size) in inner:
+                self._tiles.append((QRectF(ix, iy, iw, ih), inner_path, inner_size, color.darker(170), 1))
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#111111"))
+        if not self._tiles:
+            painter.setPen(QColor("#888888"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Noch keine Analyse")
+            return
+        metrics = painter.fontMetrics()
+        for rect, path, size, color, depth in self._tiles:
+            painter.fillRect(rect, color)
+            painter.setPen(QColor("#0a0a0a"))
+            painter.drawRect(rect)
+            if rect.width() > 50 and rect.height() > 14:
+                name = os.path.basename(path.rstrip(os.sep)) if path else "(Dateien)"
+                text = metrics.elidedText(f"{name}  {format_bytes(size)}", Qt.TextElideMode.ElideRight,
+                                          int(rect.width()) - 6)
+                painter.setPen(QColor("#ffffff" if depth == 0 else "#cccccc"))
+                painter.drawText(rect.adjusted(3, 1, -3, -1),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, text)
+    
+    def _tile_at(self, pos, depth):
+        for rect, path, size, _, tile_depth in self._tiles:
+            if tile_depth == depth and rect.contains(pos):
+                return path, size
+        return None
+    
+    def mouseMoveEvent(self, event):
+        tile = self._tile_at(event.position(), 1) or self._tile_at(event.position(), 0)
+        self.setToolTip(f"{tile[0] or self.path}\n{format_bytes(tile[1])}" if tile else "")
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.RightButton:
+            self.go_up()
+            return
+        tile = self._tile_at(event.position(), 0)
+        if tile and tile[0]:
+            self.set_path(tile[0])
+
+
+class UltimateOptimizer(QMainWindow, OptimizerCore):
+    def __init__(self, log_stdout=False):
+        super().__init__()
+        try:
+            self.ui_bridge = UiBridge(self)
+            self.stat_labels = {}
+            self.setup_core(stdout_mirror=StdoutMirror() if log_stdout else None)
+            
+            self.initUI()
+            print("✅ GUI erfolgreich initialisiert")
+        except Exception as e:
+            print(f"❌ Fehler bei GUI-Initialisierung: {e}")
+            QMessageBox.critical(None, "Fehler", f"GUI konnte nicht geladen werden:\n{e}")
+    
+    def initUI(self):
+        # Fenster-Einstellungen
+        self.setWindowTitle("⚡ PC OPTIMIZER v6.0")
+        self.setGeometry(100, 100, 1000, 700)
+        self.setMinimumSize(900, 600)
+        
+        # Dark Theme: ein Stylesheet für die ganze App statt eines pro Widget
+        apply_theme()
+        
+        # Haupt-Widget
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        main_layout = QHBoxLayout(main_widget)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(0)
+        
+        # ========== LINKER SIDEBAR ==========
+        sidebar = styled(QFrame(), name="sidebar")
+        sidebar.setFixedWidth(200)
+        sidebar_layout = QVBoxLayout(sidebar)
+        sidebar_layout.setContentsMargins(10, 20, 10, 20)
+        sidebar_layout.setSpacing(10)
+        
+        # Logo
+        logo_label = styled(QLabel("⚡ OPTIMIZER"), name="logo")
+        logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        sidebar_layout.addWidget(logo_label)
+        
+        # Navigation Buttons
+        nav_buttons = [
+            ("🧹 Reinigung", self.show_cleanup_tab),
+            ("🎮 Gaming", self.show_gaming_tab),
+            ("⚡ Leistung", self.show_performance_tab),
+            ("🤖 Automatik", self.show_auto_tab),
+            ("⚙️ Einstellungen", self.show_settings_tab),
+            ("📊 Statistiken", self.show_stats_tab),
+            ("💽 Speicher", self.show_disk_tab),
+        ]
+        
+        for text, func in nav_buttons:
+            sidebar_layout.addWidget(make_button(text, func, role="nav"))
+        
+        sidebar_layout.addStretch()
+        
+        # System Status
+        status_frame = styled(QFrame(), name="statusFrame")
+        status_layout = QVBoxLayout(status_frame)
+        
+        self.cpu_label = styled(QLabel("⚡ CPU: --%"), "status", "green")
+        status_layout.addWidget(self.cpu_label)
+        
+        self.ram_label = styled(QLabel("💾 RAM: --%"), "status", "blue")
+        status_layout.addWidget(self.ram_label)
+        
+        self.disk_label = styled(QLabel("💿 C: -- GB frei"), "status", "orange")
+        status_layout.addWidget(self.disk_label)
+        
+        sidebar_layout.addWidget(status_frame)
+        
+        # Quick Actions
+        quick_frame = styled(QFrame(), name="quickFrame")
+        quick_layout = QVBoxLayout(quick_frame)
+        quick_layout.addWidget(make_button("🚀 One-Click Optimieren", self.ultimate_one_click_optimization, role="primary"))
+        quick_layout.addWidget(make_button("🛑 Notstopp", self.emergency_restore, role="danger"))
+        
+        sidebar_layout.addWidget(quick_frame)
+        
+        # ========== HAUPTBEREICH ==========
+        main_content = styled(QWidget(), name="mainContent")
+        main_content.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        content_layout = QVBoxLayout(main_content)
+        content_layout.setContentsMargins(15, 15, 15, 15)
+        content_layout.setSpacing(10)
+        
+        # Header
+        header = styled(QFrame(), name="header")
+        header_layout = QHBoxLayout(header)
+        
+        self.header_title = styled(QLabel("ULTIMATE PC OPTIMIZER"), name="headerTitle")
+        header_layout.addWidget(self.header_title)
+        
+        header_layout.addStretch()
+        
+        self.status_indicator = styled(QLabel("● Bereit"), name="statusIndicator")
+        header_layout.addWidget(self.status_indicator)
+        
+        content_layout.addWidget(header)
+        
+        # Tab Widget
+        self.tab_widget = QTabWidget()
+        
+        # Tabs erstellen: nur die Reinigung sofort, die anderen beim ersten Anzeigen
+        self._tab_builders = [
+            (self.create_cleanup_tab, "🧹 Reinigung"),
+            (self.create_gaming_tab, "🎮 Gaming"),
+            (self.create_performance_tab, "⚡ Leistung"),
+            (self.create_auto_tab, "🤖 Automatik"),
+            (self.create_settings_tab, "⚙️ Einstellungen"),
+            (self.create_stats_tab, "📊 Statistiken"),
+            (self.create_disk_tab, "💽 Speicher"),
+        ]
+        self._built_tabs = set()
+        for _, title in self._tab_builders:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(page, title)
+        self._ensure_tab(0)
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+        
+        content_layout.addWidget(self.tab_widget)
+        
+        # Footer
+        footer = styled(QFrame(), name="footer")
+        footer_layout = QVBoxLayout(footer)
+        
+        # Fortschritt
+        self.progress_frame = QFrame()
+        self.progress_frame.setVisible(False)
+        progress_layout = QVBoxLayout(self.progress_frame)
+        
+        self.progress_label = styled(QLabel("Optimierung läuft..."), name="progressLabel")
+        progress_layout.addWidget(self.progress_label)
+        
+        progress_row = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        progress_row.addWidget(self.progress_bar, 1)
+        progress_row.addWidget(make_button("⏸️ Anhalten", self.pause_jobs, role="export", accent="yellow"))
+        progress_layout.addLayout(progress_row)
+        
+        footer_layout.addWidget(self.progress_frame)
+        
+        # Log
+        self.log_text = styled(LogConsole(max_lines=5000), name="logConsole")
+        self.log_text.setMaximumHeight(100)
+        footer_layout.addWidget(self.log_text)
+        
+        content_layout.addWidget(footer)
+        
+        # Alles zusammenfügen
+        main_layout.addWidget(sidebar)
+        main_layout.addWidget(main_content)
+        
+        # Worker-Updates laufen gebündelt über die Bridge in den GUI-Thread
+        self.ui_bridge.progress_changed.connect(self._apply_progress)
+        self.ui_bridge.progress_visible.connect(self.progress_frame.setVisible)
+        self.ui_bridge.log_batch.connect(self._apply_log_batch)
+        
+        # System Monitor: Sampling im Hintergrund, die GUI liest nur den letzten Wert.
+        # Gestartet wird erst, wenn die Event-Loop läuft und das Fenster schon sichtbar ist.
+        self.monitor_timer = QTimer()
+        self.monitor_timer.timeout.connect(self.update_system_monitor)
+        QTimer.singleShot(0, self._start_background)
+        
+        self.log_message("🔥 Ultimate Optimizer gestartet", "SUCCESS")
+        self.report_checkpoints()
+    
+    def _start_background(self):
+        self.watch_memory()
+        self.watch_services()
+        self.sampler.start()
+        self.monitor_timer.start(1000)
+    
+    def _ensure_tab(self, index):
+        if index in self._built_tabs or not 0 <= index < len(self._tab_builders):
+            return
+        self._built_tabs.add(index)
+        self.tab_widget.widget(index).layout().addWidget(self._tab_builders[index][0]())
+    
+    def update_system_monitor(self):
+        latest = self.sampler.latest()
+        if latest is None:
+            return
+        _, values = latest
+        self.cpu_label.setText(f"⚡ CPU: {values['cpu']:.0f}%")
+        self.ram_label.setText(f"💾 RAM: {values['ram_percent']:.0f}%")
+        drive = self.sampler.disk_path.rstrip('\\') or '/'
+        self.disk_label.setText(f"💿 {drive} {values['disk_free'] / (1024**3):.1f} GB frei")
+    
+    def log_message(self, message, level="INFO"):
+        # Thread-sicher: darf aus jedem Worker aufgerufen werden
+        if not self.log_text.accepts(level):
+            return
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.ui_bridge.post_log((timestamp, message, level))
+        if self.stdout_mirror:
+            self.stdout_mirror.write(f"[{timestamp}] {message}")
+    
+    def _apply_log_batch(self, entries):
+        self.log_text.append_batch(entries)
+    
+    def show_progress(self, show=True):
+        self.ui_bridge.post_visible(show)
+    
+    def stats_changed(self):
+        self.ui_bridge.invoke.emit(self._refresh_stat_widgets)
+    
+    def _refresh_stat_widgets(self):
+        for key, label in self.stat_labels.items():
+            value = self.optimization_stats.get(key, 0)
+            label.setText(format_bytes(value) if key == 'bytes_freed' else str(value))
+    
+    def update_progress(self, value, text=""):
+        self.ui_bridge.post_progress(value, text)
+    
+    def _apply_progress(self, value, text):
+        self.progress_bar.setValue(value)
+        if text:
+            self.progress_label.setText(text)
+    
+    # ========== JOBS ==========
+    
+    def _on_job_progress(self, job, value, text):
+        self.update_progress(value, text)
+    
+    def _on_job_state(self, job):
+        super()._on_job_state(job)
+        if job.status == Job.RUNNING:
+            self.update_progress(0, f"{job.name}...")
+            self.show_progress(True)
+        elif job.is_finished and not self.scheduler.busy:
+            self.show_progress(False)
+    
+    # ========== BENCHMARK ==========
+    
+    def benchmark_profile(self):
+        profile = self.bench_profile_combo.currentData()
+        self.start_job(f"Benchmark {self.bench_profile_combo.currentText()}",
+                       lambda job: self._benchmark_profile_thread(job, profile))
+    
+    def benchmark_finished(self, deltas):
+        self.ui_bridge.invoke.emit(lambda: self._show_benchmark(deltas))
+    
+    def disk_usage_finished(self, root):
+        self.ui_bridge.invoke.emit(lambda: self.treemap.set_index(self.get_dir_size_index(), root))
+    
+    def _show_benchmark(self, deltas):
+        self.bench_table.setRowCount(len(deltas))
+        for row, d in enumerate(deltas):
+            label, unit = WORKLOADS[d.name][0], d.unit
+            cells = [
+                label,
+                f"{d.before.mean:.4g} ± {d.before.ci95:.2g} {unit}",
+                f"{d.after.mean:.4g} ± {d.after.ci95:.2g} {unit}",
+                f"{d.change:+.1f}%" + ("" if d.significant else " (n.s.)"),
+            ]
+            for col, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if col == 3 and d.significant:
+                    item.setForeground(QColor("#00ff00" if d.improved else "#ff5555"))
+                self.bench_table.setItem(row, col, item)
+    
+    # ========== TAB ERSTELLUNG ==========
+    
+    def create_cleanup_tab(self):
+        # Reinigungsoptionen
+        return self._build_card_tab("Starten", [
+            ("🗑️ Temp Dateien löschen", self.deep_temp_clean, "cyan"),
+            ("💾 Festplatte optimieren", self.disk_optimization, "blue"),
+            ("📦 System Müll entfernen", self.system_junk_clean, "orange"),
+            ("🚀 Autostart entschlacken", self.registry_cleanup, "purple"),
+        ], extra=[
+            make_card("🔁 Duplikate & große Dateien", "Analysieren", self.duplicate_scan, "magenta"),
+            make_card("📋 Autostart-Analyse", "Startkosten", self.startup_report, "sky"),
+        ])
+    
+    def create_gaming_tab(self):
+        return self._build_card_tab("Anwenden", [
+            ("🔄 Gaming Modus aktivieren", self.ultimate_gaming_mode, "magenta"),
+            ("🎯 GPU optimieren", self.gpu_ultimate_tweaks, "cyan"),
+            ("⚡ CPU Gaming", self.cpu_gaming_optimization, "green"),
+            ("🌐 Netzwerk Gaming", self.network_gaming_tweaks, "sky"),
+        ], extra=[
+            make_card("🎯 Hintergrundprozesse drosseln", "Starten / Stoppen", self.toggle_governor, "yellow"),
+        ])
+    
+    def create_performance_tab(self):
+        return self._build_card_tab("Optimieren", [
+            ("🚀 Windows Dienste optimieren", self.optimize_windows_services_ultimate, "green"),
+            ("💾 Festplatten-Tweaks", self.disk_performance_tweaks, "blue"),
+            ("🎯 System Responsiveness", self.system_responsiveness, "yellow"),
+            ("🔧 Visuelle Effekte", self.visual_performance_tweaks, "orange"),
+        ], extra=[
+            make_card("🧠 Arbeitsspeicher entlasten", "Trimmen & messen", self.memory_trim, "magenta"),
+            make_card("📊 Speicher-Report", "RSS/USS & Lecks", self.memory_report, "cyan"),
+        ])
+    
+    def create_auto_tab(self):
+        return self._build_card_tab("Aktivieren", [
+            ("🏎️ Extreme Gaming", self.extreme_gaming_mode, "magenta"),
+            ("⚡ Ultimate Performance", self.ultimate_performance_mode, "green"),
+            ("🔧 Balanced", self.balanced_optimization, "blue"),
+            ("🧹 Clean Install", self.complete_clean_install, "orange"),
+        ], extra=[
+            # Smart Scan
+            make_card("🔍 Smart System Scan", "System analysieren", self.smart_system_scan, "cyan"),
+        ])
+    
+    def _build_card_tab(self, button_text, options, extra=()):
+        cards = [make_card(title, button_text, func, accent) for title, func, accent in options]
+        tab, _ = make_scroll_tab(cards + list(extra))
+        return tab
+    
+    def create_settings_tab(self):
+        # Einstellungen
+        settings = [
+            ("🔒 Im sicheren Modus optimieren", True),
+            ("💾 Automatische Backups", True),
+            ("🗑️ Auto Temp-Bereinigung", True),
+            ("🗜️ Backups komprimieren", True),
+        ]
+        
+        self.settings_checkboxes = []
+        for text, default in settings:
+            cb = QCheckBox(text)
+            cb.setChecked(default)
+            self.settings_checkboxes.append(cb)
+        
+        tab, scroll_layout = make_scroll_tab(self.settings_checkboxes)
+        
+        # Save Button
+        save_btn = make_button("💾 Einstellungen speichern", self.save_settings, role="primary")
+        scroll_layout.addWidget(styled(save_btn, name="saveSettings"))
+        
+        return tab
+    
+    def create_stats_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        # Stats Grid
+        grid = QGridLayout()
+        
+        stats = [
+            ("Dateien gelöscht", "files_deleted", "green"),
+            ("Registry-Änderungen", "registry_changes", "magenta"),
+            ("Dienste optimiert", "services_optimized", "cyan"),
+            ("Performance-Tweaks", "performance_tweaks", "yellow"),
+            ("Speicher freigegeben", "bytes_freed", "orange"),
+            ("Optimierungen", "total_optimizations", "red"),
+        ]
+        
+        for i, (name, key, accent) in enumerate(stats):
+            frame = styled(QFrame(), "stat", accent)
+            frame_layout = QVBoxLayout(frame)
+            
+            value_label = styled(QLabel(), "stat-value", accent)
+            value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            frame_layout.addWidget(value_label)
+            self.stat_labels[key] = value_label
+            
+            name_label = styled(QLabel(name), "stat-name")
+            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            frame_layout.addWidget(name_label)
+            
+            grid.addWidget(frame, i // 2, i % 2)
+        
+        layout.addLayout(grid)
+        self._refresh_stat_widgets()
+        
+        # Export Buttons
+        btn_frame = QFrame()
+        btn_layout = QHBoxLayout(btn_frame)
+        btn_layout.addWidget(make_button("📄 CSV Export", self.export_stats_csv, role="export", accent="green"))
+        btn_layout.addWidget(make_button("📊 Report erstellen", self.generate_report, role="export", accent="red"))
+        layout.addWidget(btn_frame)
+        
+        # Vorher/Nachher-Benchmark
+        bench_frame = styled(QFrame(), "card", "blue")
+        bench_layout = QVBoxLayout(bench_frame)
+        bench_layout.addWidget(styled(QLabel("🧪 Vorher/Nachher-Benchmark"), "card-title", "blue"))
+        
+        bench_row = QHBoxLayout()
+        self.bench_profile_combo = QComboBox()
+        catalog = self.get_catalog()
+        for profile in catalog.profiles:
+            self.bench_profile_combo.addItem(catalog.profile_label(profile), profile)
+        bench_row.addWidget(self.bench_profile_combo, 1)
+        bench_btn = make_button("Messen & anwenden", self.benchmark_profile, accent="blue")
+        bench_row.addWidget(styled(bench_btn, name="benchButton"))
+        bench_layout.addLayout(bench_row)
+        
+        self.bench_table = QTableWidget(0, 4)
+        self.bench_table.setHorizontalHeaderLabels(["Workload", "Vorher", "Nachher", "Δ"])
+        self.bench_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.bench_table.verticalHeader().setVisible(False)
+        self.bench_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        bench_layout.addWidget(self.bench_table)
+        
+        layout.addWidget(bench_frame)
+        layout.addStretch()
+        
+        return tab
+    
+    def create_disk_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        # Startordner + Navigation
+        row = QHBoxLayout()
+        self.disk_path_edit = QLineEdit(self.disk_usage_root or get_system_drive())
+        row.addWidget(self.disk_path_edit, 1)
+        row.addWidget(make_button("⬆️ Zurück", lambda: self.treemap.go_up(), role="export", accent="cyan"))
+        row.addWidget(make_button("Analysieren", self.disk_usage, role="export", accent="cyan"))
+        layout.addLayout(row)
+        
+        self.treemap_label = styled(QLabel(), "stat-name")
+        layout.addWidget(self.treemap_label)
+        
+        self.treemap = TreemapWidget()
+        self.treemap.path_changed.connect(self._show_treemap_path)
+        layout.addWidget(self.treemap, 1)
+        
+        # Ergebnis der letzten Analyse steht noch im Index
+        root = os.path.abspath(self.disk_path_edit.text())
+        if self.get_dir_size_index().entry(root):
+            self.treemap.set_index(self.get_dir_size_index(), root)
+        
+        return tab
+    
+    def _show_treemap_path(self, path):
+        entry = self.get_dir_size_index().entry(path)
+        total = f" – {format_bytes(entry[2])} in {entry[3]} Dateien" if entry else ""
+        self.treemap_label.setText(f"📁 {path}{total}  (Klick: öffnen, Rechtsklick: zurück)")
+    
+    # ========== TAB NAVIGATION ==========
+    
+    def show_cleanup_tab(self):
+        self.tab_widget.setCurrentIndex(0)
+        self.header_title.setText("🧹 System-Reinigung")
+    
+    def show_gaming_tab(self):
+        self.tab_widget.setCurrentIndex(1)
+        self.header_title.setText("🎮 Gaming-Optimierung")
+    
+    def show_performance_tab(self):
+        self.tab_widget.setCurrentIndex(2)
+        self.header_title.setText("⚡ System-Leistung")
+    
+    def show_auto_tab(self):
+        self.tab_widget.setCurrentIndex(3)
+        self.header_title.setText("🤖 Automatische Optimierung")
+    
+    def show_settings_tab(self):
+        self.tab_widget.setCurrentIndex(4)
+        self.header_title.setText("⚙️ Einstellungen")
+    
+    def show_stats_tab(self):
+        self.tab_widget.setCurrentIndex(5)
+        self.header_title.setText("📊 Statistiken")
+    
+    def show_disk_tab(self):
+        self.tab_widget.setCurrentIndex(6)
+        self.header_title.setText("💽 Speicherbelegung")
+    
+    # ========== OPTIMIERUNGS-FUNKTIONEN ==========
+    
+    def deep_temp_clean(self):
+        self.submit_action('deep_temp_clean')
+    
+    def disk_optimization(self):
+        self.submit_action('disk_optimization')
+    
+    def system_junk_clean(self):
+        self.submit_action('system_junk_clean')
+    
+    def registry_cleanup(self):
+        self.submit_action('registry_cleanup')
+    
+    def startup_report(self):
+        self.submit_action('startup_report')
+    
+    def duplicate_scan(self):
+        self.submit_action('duplicate_scan')
+    
+    def memory_trim(self):
+        self.submit_action('memory_trim')
+    
+    def memory_report(self):
+        self.submit_action('memory_report')
+    
+    def disk_usage(self):
+        self.disk_usage_root = self.disk_path_edit.text().strip() or None
+        self.submit_action('disk_usage')
+    
+    def ultimate_gaming_mode(self):
+        self.start_job("Gaming-Modus", self._ultimate_gaming_mode_thread)
+    
+    def _ultimate_gaming_mode_thread(self, job):
+        self.run_profile(job, 'gaming_mode')
+        self.start_governor()
+    
+    def toggle_governor(self):
+        if self.governor is not None and self.governor.running:
+            self.stop_governor()
+        else:
+            self.start_governor()
+    
+    def gpu_ultimate_tweaks(self):
+        self.start_job("GPU-Tweaks", self._gpu_ultimate_tweaks_thread)
+    
+    def _gpu_ultimate_tweaks_thread(self, job):
+        self.run_profile(job, 'gpu')
+    
+    def cpu_gaming_optimization(self):
+        self.start_job("CPU Gaming", self._cpu_gaming_optimization_thread)
+    
+    def _cpu_gaming_optimization_thread(self, job):
+        self.run_profile(job, 'cpu_gaming')
+    
+    def network_gaming_tweaks(self):
+        self.start_job("Netzwerk Gaming", self._network_gaming_tweaks_thread)
+    
+    def _network_gaming_tweaks_thread(self, job):
+        self.run_profile(job, 'network_gaming')
+    
+    def optimize_windows_services_ultimate(self):
+        self.start_job("Dienste-Optimierung", self._optimize_windows_services_ultimate_thread)
+    
+    def _optimize_windows_services_ultimate_thread(self, job):
+        self.run_profile(job, 'services')
+    
+    def disk_performance_tweaks(self):
+        self.start_job("Festplatten-Tweaks", self._disk_performance_tweaks_thread)
+    
+    def _disk_performance_tweaks_thread(self, job):
+        self.run_profile(job, 'disk_tweaks')
+    
+    def system_responsiveness(self):
+        self.start_job("System Responsiveness", self._system_responsiveness_thread)
+    
+    def _system_responsiveness_thread(self, job):
+        self.run_profile(job, 'responsiveness')
+    
+    def visual_performance_tweaks(self):
+        self.start_job("Visuelle Effekte", self._visual_performance_tweaks_thread)
+    
+    def _visual_performance_tweaks_thread(self, job):
+        self.run_profile(job, 'visual')
+    
+    # ========== AUTOMATIK FUNKTIONEN ==========
+    
+    def extreme_gaming_mode(self):
+        self.start_job("Extreme Gaming", self._extreme_gaming_thread)
+    
+    def _extreme_gaming_thread(self, job):
+        self.run_profile(job, 'extreme_gaming')
+        self.start_governor()
+    
+    def ultimate_performance_mode(self):
+        self.start_job("Ultimate Performance", self._ultimate_performance_thread)
+    
+    def _ultimate_performance_thread(self, job):
+        self.run_profile(job, 'ultimate_performance')
+    
+    def balanced_optimization(self):
+        self.start_job("Balanced", self._balanced_optimization_thread)
+    
+    def _balanced_optimization_thread(self, job):
+        self.run_profile(job, 'balanced')
+    
+    def complete_clean_install(self):
+        self.start_job("Clean Install", self._complete_clean_install_thread)
+    
+    def _complete_clean_install_thread(self, job):
+        self.run_profile(job, 'clean_install')
+    
+    def smart_system_scan(self):
+        self.submit_action('smart_scan')
+    
+    # ========== ONE-CLICK OPTIMIERUNG ==========
+    
+    def ultimate_one_click_optimization(self):
+        reply = QMessageBox.question(
+            self, "One-Click Optimierung",
+            "Alle Optimierungen anwenden?\nDauert 2-5 Minuten.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            self.start_job("One-Click Optimierung", self._ultimate_optimization_thread)
+    
+    def _ultimate_optimization_thread(self, job):
+        results = self.run_profile(job, 'one_click')
+        if results:
+            # Dialoge nur im GUI-Thread öffnen
+            self.ui_bridge.invoke.emit(self._ask_restart)
+    
+    def _ask_restart(self):
+        reply = QMessageBox.question(
+            self, "Optimierung abgeschlossen",
+            "Für beste Ergebnisse jetzt neu starten?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                os.system('shutdown /r /t 30')
+            except:
+                pass
+    
+    # ========== NOTFALL-FUNKTIONEN ==========
+    
+    def emergency_restore(self):
+        reply = QMessageBox.critical(
+            self, "Notstopp",
+            "Alle Änderungen rückgängig machen?\nKann zu Systeminstabilität führen!",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            # Laufende und wartende Optimierungen zuerst abbrechen
+            self.scheduler.cancel_all()
+            self.submit_action('emergency_restore')
+    
+    def pause_jobs(self):
+        # Kooperativ: Jobs halten an der nächsten Batch-Grenze, Bereinigungen sichern ihren Checkpoint
+        self.scheduler.cancel_all()
+        self.log_message("⏸️ Anhalten angefordert", "WARNING")
+    
+    def closeEvent(self, event):
+        if self.scheduler.busy:
+            reply = QMessageBox.question(
+                self, "Beenden",
+                "Es laufen noch Aufgaben.\nAnhalten und beenden? Bereinigungen werden beim nächsten Start fortgesetzt.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+        # Jobs nicht als Daemon-Threads mitten im Schritt abschießen, sondern abbrechen und abwarten
+        self.monitor_timer.stop()
+        self.shutdown(cancel=True)
+        event.accept()
+    
+    # ========== EINSTELLUNGEN ==========
+    
+    def save_settings(self):
+        self.log_message("✅ Einstellungen gespeichert", "SUCCESS")
+        QMessageBox.information(self, "Einstellungen", "Einstellungen wurden gespeichert!")
+    
+    def export_stats_csv(self):
+        self.start_job("CSV Export", self._export_stats_csv_thread, mutating=False)
+    
+    def generate_report(self):
+        self.start_job("Report", self._generate_report_thread, mutating=False)
+
+
+
+def report_startup(marks):
+    # Zeiten ab dem frühesten Import (Engine oder GUI-Modul); der Interpreterstart selbst fehlt
+    marks = sorted(marks + [("Engine-Import gestartet", IMPORT_STARTED)], key=lambda m: m[1])
+    start = previous = marks[0][1]
+    print("⏱️ Startzeit-Profil:")
+    for name, at in marks:
+        print(f"  {name:<28} +{(at - previous) * 1000:7.1f} ms   (gesamt {(at - start) * 1000:7.1f} ms)")
+        previous = at
+
+
+def main(log_stdout=False, profile_startup=False):
+    try:
+        app = QApplication(sys.argv)
+        STARTUP_MARKS.append(("QApplication", time.perf_counter()))
+        
+        # Dark Theme
+        app.setStyle("Fusion")
+        palette = app.palette()
+        palette.setColor(palette.ColorRole.Window, QColor(10, 10, 10))
+        palette.setColor(palette.ColorRole.WindowText, QColor(240, 240, 240))
+        palette.setColor(palette.ColorRole.Base, QColor(25, 25, 25))
+        palette.setColor(palette.ColorRole.Text, QColor(240, 240, 240))
+        palette.setColor(palette.ColorRole.Button, QColor(40, 40, 40))
+        palette.setColor(palette.ColorRole.ButtonText, QColor(240, 240, 240))
+        app.setPalette(palette)
+        apply_theme(app)
+        
+        print("=" * 50)
+        print("ULTIMATE PC OPTIMIZER v6.0 - STABILE VERSION")
+        print("=" * 50)
+        
+        window = UltimateOptimizer(log_stdout=log_stdout)
+        STARTUP_MARKS.append(("Fenster aufgebaut", time.perf_counter()))
+        window.show()
+        
+        if profile_startup:
+            # Erster Durchlauf der Event-Loop = Fenster ist gezeichnet
+            def visible():
+                STARTUP_MARKS.append(("Fenster sichtbar", time.perf_counter()))
+                report_startup(STARTUP_MARKS)
+                app.quit()
+            QTimer.singleShot(0, visible)
+        
+        print("✅ Programm erfolgreich gestartet!")
+        sys.exit(app.exec())
+        
+    except Exception as e:
+        print(f"❌ KRITISCHER FEHLER: {e}")
+        import traceback
+        traceback.print_exc()
+        input("\nDrücke Enter zum Beenden...")
+
+
+if __name__ == "__main__":
+    main(log_stdout='--log-stdout' in sys.argv, profile_startup='--profile-startup' in sys.argv)
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from ultimate_optimizer import (HeadlessOptimizer, Job, MemoryRegistryBackend, PlanExecutor, RegistryWriter, Tweak,
+                                TweakCatalog, TweakPlanner, job_succeeded)
+
+
+class BrokenIndex:
+    def scan(self, *args, **kwargs):
+        raise OSError("Laufwerk weg")
+
+
+@pytest.fixture
+def core(tmp_path, monkeypatch):
+    # Datenverzeichnis (Statistik, Checkpoints, Journal) in tmp_path statt im Profil
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    core = HeadlessOptimizer(io.StringIO())
+    core.get_dir_size_index = lambda: BrokenIndex()
+    yield core
+    core.close()
+
+
+def test_failing_action_fails_its_job(core):
+    job = core.submit_action('disk_usage')
+    assert job.wait(10)
+    assert job.status == Job.FAILED
+    assert isinstance(job.error, OSError)
+    assert not job_succeeded(job)
+
+
+def test_failing_action_step_is_not_reported_as_done(core):
+    catalog = TweakCatalog({'usage': Tweak('usage', {'kind': 'action', 'target': 'disk_usage'})},
+                           {'p': {'tweaks': ['usage']}})
+    executor = PlanExecutor(RegistryWriter(MemoryRegistryBackend()).apply_batch, None, core._run_action)
+    job = Job(1, 'p', None, True, core.scheduler)
+    [(tweak, ok, detail)] = executor.execute(TweakPlanner(catalog).compile('p'), job)
+    assert tweak.id == 'usage'
+    assert not ok
+    assert detail == "Laufwerk weg"
@@ -0,0 +1,52 @@
+import itertools
+
+import pytest
+
+import ultimate_optimizer
+from ultimate_optimizer import BenchmarkSuite, t_critical
+
+
+def test_t_critical_table():
+    assert t_critical(0) == float('inf')
+    assert t_critical(1) == 12.706
+    assert t_critical(2) == 4.303
+    # Zwischen den Tabellenwerten wird der nächstgrößere (konservativere) genommen
+    assert t_critical(11) == 2.179
+    assert t_critical(30) == 2.042
+    assert t_critical(31) == 1.96
+
+
+def stub_suite(monkeypatch, tmp_path, values):
+    # Ein Aufwärmlauf (999, verworfen), danach drei Messungen pro Workload
+    feeds = {name: iter(v) for name, v in values.items()}
+    monkeypatch.setitem(ultimate_optimizer.WORKLOADS, 'stub_up', ("Stub", "ops/s", True, lambda d: next(feeds['stub_up'])))
+    monkeypatch.setitem(ultimate_optimizer.WORKLOADS, 'stub_down', ("Stub", "ms", False, lambda d: next(feeds['stub_down'])))
+    return BenchmarkSuite(['stub_up', 'stub_down'], trials=3, warmup=1, work_dir=str(tmp_path)).run()
+
+
+def test_suite_compare_against_hand_computed_values(monkeypatch, tmp_path):
+    before = stub_suite(monkeypatch, tmp_path, {'stub_up': [999, 10, 12, 14], 'stub_down': [999, 10, 12, 14]})
+    after = stub_suite(monkeypatch, tmp_path, {'stub_up': [999, 20, 22, 24], 'stub_down': [999, 11, 13, 15]})
+    
+    up = before['stub_up']
+    assert up.samples == [10, 12, 14]
+    assert up.mean == 12
+    # t(2) * s / sqrt(n) = 4.303 * 2 / sqrt(3)
+    assert up.ci95 == pytest.approx(4.968676, abs=1e-5)
+    
+    deltas = {d.name: d for d in BenchmarkSuite.compare(before, after)}
+    # 22 - 12 = 10 > 2 * 4.9687 -> signifikant, höher ist besser -> verbessert
+    assert deltas['stub_up'].change == pytest.approx(83.333333, abs=1e-5)
+    assert deltas['stub_up'].significant
+    assert deltas['stub_up'].improved
+    # 13 - 12 = 1 liegt im Rauschen; bei "niedriger ist besser" ist mehr schlechter
+    assert not deltas['stub_down'].significant
+    assert not deltas['stub_down'].improved
+
+
+def test_single_sample_has_no_interval(monkeypatch, tmp_path):
+    counter = itertools.count()
+    monkeypatch.setitem(ultimate_optimizer.WORKLOADS, 'stub', ("Stub", "x", True, lambda d: next(counter)))
+    result = BenchmarkSuite(['stub'], trials=1, warmup=0, work_dir=str(tmp_path)).run()['stub']
+    assert result.samples == [0]
+    assert result.ci95 == 0.0
@@ -0,0 +1,84 @@
+import functools
+import io
+import os
+import time
+
+import pytest
+
+import ultimate_optimizer
+from ultimate_optimizer import (CancelToken, Checkpointer, CheckpointStore, EvictionPlanner, HeadlessOptimizer, JobCancelled,
+                                ScanIndex)
+
+FILES = 2000
+
+
+class FakeJob:
+    # Bricht ab, sobald die Löschphase den ersten Fortschritt meldet
+    def __init__(self, cancel_on_delete=False):
+        self.token = CancelToken()
+        self.cancel_on_delete = cancel_on_delete
+
+    def set_progress(self, value, text=""):
+        if self.cancel_on_delete and text.startswith("Bereinige"):
+            self.token.cancel()
+
+    def check_cancelled(self):
+        self.token.raise_if_cancelled()
+
+
+@pytest.fixture
+def temp(tmp_path, monkeypatch):
+    root = tmp_path / 'temp'
+    root.mkdir()
+    old = time.time() - 86400
+    for i in range(FILES):
+        path = root / f"{i}.tmp"
+        path.write_bytes(b'x' * 1024)
+        os.utime(path, (old, old))
+    monkeypatch.setattr(ultimate_optimizer, 'get_temp_roots', lambda: [str(root)])
+    return root
+
+
+@pytest.fixture
+def core(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'appdata'))
+    core = HeadlessOptimizer(io.StringIO())
+    yield core
+    core.close()
+
+
+def test_checkpointer_throttles_and_forces(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'cp.sqlite3'))
+    try:
+        checkpoint = Checkpointer(store, 'job', interval=60)
+        assert not checkpoint.resumed
+        assert not checkpoint.update({'n': 1})
+        assert checkpoint.update({'n': 2}, force=True)
+        assert Checkpointer(store, 'job').state == {'n': 2}
+        checkpoint.finish()
+        assert store.pending() == {}
+    finally:
+        store.close()
+
+
+def test_cancelled_cleanup_resumes_without_rescanning(core, temp, monkeypatch):
+    # Kleine Seiten: der Abbruch greift nach der ersten Seite
+    monkeypatch.setattr(ultimate_optimizer, 'EvictionPlanner', functools.partial(EvictionPlanner, page_size=500))
+    with pytest.raises(JobCancelled):
+        core._clean_indexed(FakeJob(cancel_on_delete=True), 'temp', "Temp-Dateien")
+
+    [(state, _)] = core.checkpoints.pending().values()
+    deleted = state['files_deleted']
+    assert deleted == 500
+    assert len(os.listdir(temp)) == FILES - deleted
+
+    def no_rescan(*args, **kwargs):
+        raise AssertionError("Fortsetzung darf nicht neu scannen")
+
+    monkeypatch.setattr(ScanIndex, 'scan', no_rescan)
+    stats = core._clean_indexed(FakeJob(), 'temp', "Temp-Dateien")
+    # Zähler des unterbrochenen Laufs sind in der Fortsetzung enthalten
+    assert stats.files_deleted == FILES
+    assert stats.bytes_freed == FILES * 1024
+    assert os.listdir(temp) == []
+    assert core.checkpoints.pending() == {}
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from ultimate_optimizer import DirSizeIndex, squarify
+
+
+def write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fh:
+        fh.write(b'x' * size)
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = DirSizeIndex(str(tmp_path / 'sizes.sqlite3'), workers=2)
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    a = str(tmp_path / 'a')
+    write(os.path.join(a, 'top.bin'), 100)
+    write(os.path.join(a, 'b', 'mid.bin'), 300)
+    write(os.path.join(a, 'b', 'c', 'leaf.bin'), 600)
+    return a
+
+
+def test_totals_roll_up_the_tree(index, tree):
+    result = index.scan(tree)
+    assert result['total_size'] == 1000
+    assert result['dirs'] == result['dirs_listed'] == 3
+    assert index.entry(tree) == (100, 1, 1000, 3)
+    assert index.entry(os.path.join(tree, 'b')) == (300, 1, 900, 2)
+    # Unterordner nach Größe, die eigenen Dateien als Eintrag ohne Pfad
+    assert index.children(tree) == [(os.path.join(tree, 'b'), 900, 2), (None, 100, 1)]
+
+
+def test_rescan_only_lists_changed_directories(index, tree):
+    index.scan(tree)
+    assert index.scan(tree)['dirs_listed'] == 0
+    write(os.path.join(tree, 'b', 'c', 'new.bin'), 50)
+    result = index.scan(tree)
+    assert result['dirs_listed'] == 1
+    assert result['total_size'] == 1050
+
+
+def test_subfolder_scan_keeps_it_in_the_outer_tree(index, tree):
+    index.scan(tree)
+    b = os.path.join(tree, 'b')
+    write(os.path.join(b, 'c', 'more.bin'), 500)
+    assert index.scan(b)['total_size'] == 1400
+    # Der äußere Ordner ist unverändert und muss b trotzdem wieder einsammeln
+    assert index.scan(tree)['total_size'] == 1500
+    assert index.entry(b) == (300, 1, 1400, 3)
+    assert index.children(tree)[0] == (b, 1400, 3)
+
+
+def test_vanished_directory_is_dropped(index, tree):
+    index.scan(tree)
+    c = os.path.join(tree, 'b', 'c')
+    os.remove(os.path.join(c, 'leaf.bin'))
+    os.rmdir(c)
+    assert index.scan(tree)['total_size'] == 400
+    assert index.entry(c) is None
+
+
+def test_squarify_fills_the_rectangle():
+    rects = squarify([(6, 'a'), (6, 'b'), (4, 'c'), (3, 'd'), (2, 'e'), (2, 'f'), (1, 'g')], 0, 0, 6, 4)
+    assert [r[4] for r in rects] == list('abcdefg')
+    assert sum(w * h for _, _, w, h, _ in rects) == pytest.approx(24)
+    for x, y, w, h, _ in rects:
+        assert 0 <= x and x + w <= 6 + 1e-9 and 0 <= y and y + h <= 4 + 1e-9
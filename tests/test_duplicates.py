@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from ultimate_optimizer import PARTIAL_HASH_BYTES, DuplicateFinder, JobCancelled
+
+KB = 1024
+
+
+def write(root, name, data):
+    path = os.path.join(str(root), name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return path
+
+
+@pytest.fixture
+def files(tmp_path):
+    root = tmp_path / 'data'
+    big = os.urandom(2 * PARTIAL_HASH_BYTES + 64 * KB)
+    # Gleicher Anfang und gleiches Ende, nur die Mitte weicht ab -> erst der volle Hash trennt sie
+    middle = bytearray(big)
+    middle[len(big) // 2] ^= 0xFF
+    return {
+        'a': write(root, 'a.bin', b'A' * 8 * KB),
+        'a_copy': write(root, 'sub/a.bin', b'A' * 8 * KB),
+        'b': write(root, 'b.bin', b'B' * 8 * KB),  # gleiche Größe, anderer Inhalt
+        'big': write(root, 'big.bin', big),
+        'big_copy': write(root, 'deep/er/big.bin', big),
+        'big_middle': write(root, 'big_middle.bin', bytes(middle)),
+        'tiny': write(root, 'tiny.bin', b'T' * 100),
+        'tiny_copy': write(root, 'tiny2.bin', b'T' * 100),
+    }, str(root)
+
+
+@pytest.fixture
+def finder(tmp_path):
+    f = DuplicateFinder(str(tmp_path / 'dup.sqlite3'), workers=0)
+    yield f
+    f.close()
+
+
+def groups(finder):
+    return sorted((size, sorted(paths)) for size, _, paths in finder.duplicates())
+
+
+def test_index_skips_files_below_min_size(finder, files):
+    paths, root = files
+    assert finder.index([root]) == 6
+    assert finder.stats['candidates'] == 6
+    assert finder.largest(1)[0][0] == os.path.getsize(paths['big'])
+
+
+def test_only_identical_contents_form_groups(finder, files):
+    paths, root = files
+    finder.index([root])
+    big = os.path.getsize(paths['big'])
+    assert groups(finder) == [
+        (8 * KB, sorted([paths['a'], paths['a_copy']])),
+        (big, sorted([paths['big'], paths['big_copy']])),
+    ]
+    assert finder.stats['groups'] == 2
+    assert finder.stats['wasted_bytes'] == 8 * KB + big
+    # Nur die drei großen Dateien mit gleichem Anfang/Ende wurden komplett gelesen
+    assert finder.stats['full_hashed'] == 3
+
+
+def test_process_pool_finds_the_same_groups(tmp_path, finder, files):
+    _, root = files
+    finder.index([root])
+    expected = groups(finder)
+    pooled = DuplicateFinder(str(tmp_path / 'pool.sqlite3'), workers=2, batch_files=2)
+    try:
+        pooled.index([root])
+        assert groups(pooled) == expected
+    finally:
+        pooled.close()
+
+
+def test_reindex_replaces_the_previous_file_list(finder, files):
+    paths, root = files
+    finder.index([root])
+    os.remove(paths['a_copy'])
+    finder.index([root])
+    assert [sorted(p) for _, p in groups(finder)] == [sorted([paths['big'], paths['big_copy']])]
+
+
+def test_cancel_stops_indexing(finder, files):
+    _, root = files
+
+    class Cancelled:
+        def raise_if_cancelled(self):
+            raise JobCancelled()
+
+    with pytest.raises(JobCancelled):
+        finder.index([root], Cancelled())
+    assert finder.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
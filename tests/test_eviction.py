@@ -0,0 +1,118 @@
+import os
+import time
+
+import pytest
+
+from ultimate_optimizer import CleanupStats, EvictionPlanner, JobCancelled, ScanIndex, TempCleanupEngine
+
+DAY = 86400
+
+
+@pytest.fixture
+def temp(tmp_path):
+    root = tmp_path / 'temp'
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ScanIndex(str(tmp_path / 'scan.sqlite3'))
+    yield idx
+    idx.close()
+
+
+def put(root, name, size, idle_days):
+    # Leerlaufzeit über mtime und atime, damit MAX(mtime, atime) sie wiedergibt
+    path = root / name
+    path.write_bytes(b'x' * size)
+    stamp = time.time() - idle_days * DAY
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def scan(index, root):
+    index.scan([(str(root), 'temp')])
+
+
+def names(rows):
+    return [os.path.basename(path) for _, path, _ in rows]
+
+
+def test_plan_ranks_by_idle_time_times_size(index, temp):
+    put(temp, 'big_old.tmp', 4000, 30)
+    put(temp, 'big_new.tmp', 4000, 1)
+    put(temp, 'small_old.tmp', 10, 30)
+    put(temp, 'fresh.tmp', 100000, 0)  # jünger als min_age
+    scan(index, temp)
+    planner = EvictionPlanner(index, min_age=3600)
+    # Jede Datei zählt mindestens einen Block (4 KB): 30 Tage x 4 KB schlagen 1 Tag x 8 KB
+    assert names(planner.plan('temp', 10**9)) == ['big_old.tmp', 'small_old.tmp', 'big_new.tmp']
+    # Budget endet nach der ersten Datei, die es erreicht
+    assert names(planner.plan('temp', 4000)) == ['big_old.tmp']
+
+
+def test_evict_stops_once_the_budget_is_met(index, temp):
+    for i in range(10):
+        put(temp, f"f{i}.tmp", 1000, 10 + i)
+    scan(index, temp)
+    stats = EvictionPlanner(index, page_size=3).evict('temp', 2500, TempCleanupEngine(workers=1))
+    assert stats.files_deleted == 3
+    assert stats.bytes_freed == 3000
+    # Die drei am längsten unbenutzten Dateien sind weg
+    assert sorted(os.listdir(temp)) == [f"f{i}.tmp" for i in range(7)]
+    assert index.summary()['temp'] == (7, 7000)
+
+
+def test_evict_without_budget_removes_everything_old_enough(index, temp):
+    for i in range(5):
+        put(temp, f"old{i}.tmp", 100, 2)
+    put(temp, 'fresh.tmp', 100, 0)
+    scan(index, temp)
+    stats = EvictionPlanner(index, page_size=2).evict('temp', None, TempCleanupEngine(workers=2))
+    assert stats.files_deleted == 5
+    assert os.listdir(temp) == ['fresh.tmp']
+
+
+def test_locked_file_is_skipped_until_its_cooldown_ends(index, temp):
+    put(temp, 'ok.tmp', 100, 5)
+    locked = put(temp, 'locked.tmp', 100, 5)
+    scan(index, temp)
+    # Ein Ordner an Stelle der Datei lässt os.remove scheitern wie bei einer gesperrten Datei
+    os.remove(locked)
+    os.mkdir(locked)
+    planner = EvictionPlanner(index, cooldown=60)
+    stats = planner.evict('temp', None, TempCleanupEngine(workers=1))
+    assert (stats.files_deleted, stats.errors) == (1, 1)
+    assert planner.locked_count() == 1
+    assert planner.plan('temp', 10**9) == []
+
+    # Zweiter Fehlschlag verdoppelt die Abklingzeit
+    [(rowid, _, _)] = index.conn.execute("SELECT rowid, path, size FROM files").fetchall()
+    planner.mark_locked([rowid])
+    until, failures = index.conn.execute("SELECT until, failures FROM locked").fetchone()
+    assert failures == 2
+    assert until == pytest.approx(planner._now + 120, abs=1)
+
+
+def test_cancelled_evict_resumes_from_the_index(index, temp):
+    for i in range(6):
+        put(temp, f"f{i}.tmp", 100, 3)
+    scan(index, temp)
+
+    class CancelAfterFirstPage:
+        def raise_if_cancelled(self):
+            raise JobCancelled()
+
+    checkpoints = []
+    planner = EvictionPlanner(index, page_size=2)
+    with pytest.raises(JobCancelled):
+        planner.evict('temp', None, TempCleanupEngine(workers=1), token=CancelAfterFirstPage(),
+                      on_checkpoint=lambda s, force: checkpoints.append((s.files_deleted, force)))
+    assert checkpoints == [(2, True)]
+    assert index.summary()['temp'] == (4, 400)
+
+    # Ohne neuen Scan weiter, nur die Reste
+    stats = planner.evict('temp', None, TempCleanupEngine(workers=1), CleanupStats())
+    assert stats.files_deleted == 4
+    assert os.listdir(temp) == []
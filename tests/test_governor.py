@@ -0,0 +1,91 @@
+import os
+import shutil
+import sys
+import time
+
+import psutil
+import pytest
+
+from ultimate_optimizer import GovernorRule, ResourceGovernor
+
+pytestmark = [
+    pytest.mark.skipif(not sys.platform.startswith('linux'), reason="nice/ionice-Zuordnung wird unter Linux geprüft"),
+    # nice wieder senken braucht Root bzw. CAP_SYS_NICE
+    pytest.mark.skipif(os.name != 'posix' or os.geteuid() != 0, reason="braucht Root für die Rücknahme"),
+]
+
+# Eindeutig pro Testlauf (comm ist auf 15 Zeichen begrenzt)
+VICTIM = f"uo_bg_{os.getpid()}"
+
+
+@pytest.fixture
+def spawn(tmp_path):
+    # Kopie von sleep unter eigenem Namen, damit die Regel nur unsere Kindprozesse trifft
+    procs = []
+
+    def start(name):
+        exe = tmp_path / name
+        if not exe.exists():
+            shutil.copy(shutil.which('sleep'), exe)
+        # psutil.Popen: Process-API plus subprocess-wait, damit das Kind sauber abgeholt wird
+        proc = psutil.Popen([str(exe), '60'])
+        procs.append(proc)
+        return proc
+
+    yield start
+    for proc in procs:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+def governor(**rule):
+    gov = ResourceGovernor([GovernorRule(dict({'label': "Test", 'match': [VICTIM]}, **rule))], interval=0.05)
+    gov.table.register('name')
+    return gov
+
+
+def test_apply_throttles_and_restore_resets(spawn):
+    game = spawn('uo_game')
+    victim = spawn(VICTIM)
+    before = (victim.nice(), tuple(victim.ionice()))
+    gov = governor(priority='idle', io='idle')
+
+    counts = gov.apply(game.pid)
+    assert counts['throttled'] == 1
+    assert gov.throttled_count == 1
+    assert victim.nice() == 19
+    assert victim.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+    assert game.nice() == before[0]  # das Ziel selbst bleibt unberührt
+    # Zweiter Durchlauf fasst bereits gedrosselte Prozesse nicht erneut an
+    assert gov.apply(game.pid)['throttled'] == 0
+
+    assert gov.restore() == {'restored': 1, 'gone': 0, 'failed': 0}
+    assert (victim.nice(), tuple(victim.ionice())) == before
+
+
+def test_never_raises_priority(spawn):
+    game = spawn('uo_game')
+    victim = spawn(VICTIM)
+    victim.nice(19)
+    assert governor(priority='below_normal').apply(game.pid)['throttled'] == 0
+    assert victim.nice() == 19
+
+
+def test_restores_by_itself_when_the_target_exits(spawn):
+    game = spawn('uo_game')
+    victim = spawn(VICTIM)
+    before = victim.nice()
+    gov = governor(priority='below_normal')
+    assert gov.start(game.pid)
+
+    deadline = time.monotonic() + 5
+    while gov.throttled_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert victim.nice() == 10
+
+    game.kill()
+    game.wait(5)
+    assert gov.wait(5)
+    assert victim.nice() == before
+    assert gov.throttled_count == 0
@@ -0,0 +1,90 @@
+import pytest
+
+from ultimate_optimizer import (ChangeJournal, FileJournalBackend, JournalReplayer, MemoryJournalBackend,
+                                MemoryRegistryBackend, RegistryChange, RegistryWriter, ShellResult)
+
+KEY = 'Software\\Test'
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'changes.journal')
+
+
+def test_file_journal_survives_reopen(path):
+    journal = ChangeJournal(FileJournalBackend(path))
+    journal.record('registry', f"HKCU\\{KEY}\\Bin", b'\x00\xff', b'\x01', old_type='BINARY')
+    journal.record('powercfg', 'SCHEME_GUID', 10, 20, scope='dc')
+    assert journal.commit()
+    assert not journal.commit()  # nichts Neues -> kein fsync
+    journal.close()
+
+    reopened = ChangeJournal(FileJournalBackend(path))
+    entries = reopened.pending()
+    assert [e['seq'] for e in entries] == [1, 2]
+    assert entries[0]['old'] == {'hex': '00ff'}
+    assert entries[1]['scope'] == 'dc'
+    # Neue Einträge zählen nach dem Wiederöffnen weiter
+    assert reopened.record('netsh', 'autotuninglevel', 'normal', 'disabled')['seq'] == 3
+    reopened.close()
+
+
+def test_undo_lines_and_torn_tail_on_reload(path):
+    journal = ChangeJournal(FileJournalBackend(path))
+    for i in range(3):
+        journal.record('netsh', f"opt{i}", 'old', 'new')
+    journal.commit()
+    journal.mark_undone([1, 3])
+    journal.close()
+    # Absturz mitten im Schreiben hinterlässt eine halbe letzte Zeile
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write('{"seq": 9, "kind": "net')
+
+    reopened = ChangeJournal(FileJournalBackend(path))
+    assert [e['target'] for e in reopened.pending()] == ['opt1']
+    reopened.close()
+
+
+def test_plan_restores_each_setting_to_its_oldest_value():
+    journal = ChangeJournal(MemoryJournalBackend())
+    journal.record('registry', f"HKCU\\{KEY}\\Value", 1, 2)
+    journal.record('powercfg', 'GUID', 10, 20, scope='ac')
+    journal.record('registry', f"hkcu\\{KEY}\\value", 2, 3)  # gleiche Einstellung, andere Schreibweise
+    journal.record('powercfg', 'GUID', 10, 30, scope='dc')  # anderer Bereich -> eigene Einstellung
+    journal.record('file', 'temp', None, {'files': 5, 'bytes': 500}, irreversible=True)
+
+    restores, irreversible = JournalReplayer.plan(journal.pending())
+    by_target = {(entry['target'].lower(), entry.get('scope')): (entry['old'], seqs) for entry, seqs in restores}
+    assert by_target == {
+        (f"hkcu\\{KEY}\\value".lower(), None): (1, [3, 1]),
+        ('guid', 'ac'): (10, [2]),
+        ('guid', 'dc'): (10, [4]),
+    }
+    assert [e['seq'] for e in irreversible] == [5]
+
+
+def test_replay_restores_oldest_value_and_keeps_failures_pending():
+    backend = MemoryRegistryBackend({f"HKCU\\{KEY}\\Value": (1, 'DWORD')})
+    journal = ChangeJournal(MemoryJournalBackend())
+    writer = RegistryWriter(backend, journal)
+    writer.apply_batch([RegistryChange('HKCU', KEY, 'Value', 2)])
+    writer.apply_batch([RegistryChange('HKCU', KEY, 'Value', 3)])
+    journal.record('powercfg', 'GUID', 10, 20, scope='ac')
+    journal.record('netsh', 'autotuninglevel', 'normal', 'disabled')
+    journal.commit()
+
+    scripts = []
+
+    def run_shell(script):
+        scripts.append(script)
+        return ShellResult(1 if script.startswith('netsh') else 0, "", 0.0)
+
+    result = JournalReplayer(lambda c: writer.apply_batch(c, record=False), run_shell).replay(journal)
+    assert backend.get('HKCU', KEY, 'Value') == (1, 'DWORD')
+    assert sorted(scripts) == ["netsh int tcp set global autotuninglevel=normal",
+                               "powercfg /setacvalueindex GUID 10"]
+    assert result['restored'] == 2
+    [(failed, detail)] = result['failed']
+    assert failed['kind'] == 'netsh' and detail == "Exit-Code 1"
+    # Nur der fehlgeschlagene Eintrag bleibt offen und wird beim nächsten Mal erneut versucht
+    assert [e['kind'] for e in journal.pending()] == ['netsh']
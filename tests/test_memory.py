@@ -0,0 +1,100 @@
+import io
+import os
+
+from ultimate_optimizer import FakeTrimBackend, HeadlessOptimizer, Job, LeakDetector, MemoryTrimmer
+
+MB = 1024**2
+START = 1_700_000_000.0
+
+
+class FakeProc:
+    def __init__(self, created):
+        self.created = created
+    
+    def create_time(self):
+        return self.created
+
+
+class FakeRecord:
+    # Nur die Felder, die LeakDetector.observe liest
+    def __init__(self, pid, name, rss):
+        self.pid = pid
+        self.name = name
+        self.rss = rss
+        self.memory_info = rss
+        self.proc = FakeProc(1000.0 + pid)
+
+
+def feed(detector, series, interval=30.0):
+    # series: {pid: [rss, ...]} -> ein observe pro Zeitpunkt
+    for i in range(max(len(v) for v in series.values())):
+        records = [FakeRecord(pid, f"p{pid}", values[i]) for pid, values in series.items() if i < len(values)]
+        assert detector.observe(records, now=START + i * interval)
+
+
+def test_steady_growth_is_reported():
+    detector = LeakDetector()
+    feed(detector, {1: [100 * MB + i * 20 * MB for i in range(6)]})
+    [suspect] = detector.suspects()
+    assert suspect['pid'] == 1
+    assert suspect['growth'] == 100 * MB
+    assert suspect['duration'] == 150.0
+    # 20 MB pro 30 s
+    assert abs(suspect['bytes_per_min'] - 40 * MB) < 1
+
+
+def test_thresholds_filter_candidates():
+    detector = LeakDetector()
+    feed(detector, {
+        1: [100 * MB + i * 10 * MB for i in range(6)],          # nur 50 MB gewachsen
+        2: [100 * MB + i * 40 * MB for i in range(5)],          # zu wenige Punkte
+        3: [100 * MB, 300 * MB, 150 * MB, 350 * MB, 200 * MB, 400 * MB, 250 * MB, 500 * MB],  # Sägezahn
+        4: [500 * MB - i * 30 * MB for i in range(6)],          # schrumpft
+    })
+    assert detector.suspects() == []
+
+
+def test_monotony_tolerates_small_dips():
+    detector = LeakDetector(monotony=0.8)
+    # 9 von 10 Schritten steigen
+    values = [100 * MB + i * 20 * MB for i in range(11)]
+    values[5] -= 25 * MB
+    feed(detector, {1: values})
+    assert [s['pid'] for s in detector.suspects()] == [1]
+
+
+def test_observe_throttles_and_forgets_dead_processes():
+    detector = LeakDetector(interval=30.0)
+    assert detector.observe([FakeRecord(1, "a", MB), FakeRecord(2, "b", MB)], now=START)
+    assert not detector.observe([FakeRecord(1, "a", MB)], now=START + 10)
+    assert detector.observe([FakeRecord(1, "a", 2 * MB)], now=START + 30)
+    assert [pid for pid, _ in detector.history] == [1]
+    assert detector.span == 30.0
+
+
+def test_trimmer_with_fake_backend():
+    backend = FakeTrimBackend()
+    sleeps = []
+    result = MemoryTrimmer(backend, window=2.0, sleep=sleeps.append).run([10, 11, 12])
+    assert backend.trimmed == [10, 11, 12]
+    assert result['backend'] == "fake"
+    assert (result['trimmed'], result['failed']) == (3, 0)
+    # Vorher- und Nachher-Messung je ein Fenster
+    assert sleeps == [2.0, 2.0]
+
+
+def test_trim_action_trims_through_the_trimmer(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    core = HeadlessOptimizer(io.StringIO())
+    try:
+        core.trim_backend = FakeTrimBackend()
+        core.trim_window = 0.0
+        core.trim_min_rss = 0
+        job = core.submit_action('memory_trim')
+        assert job.wait(10)
+        assert job.status == Job.DONE
+        # Alle Prozesse außer uns selbst
+        assert core.trim_backend.trimmed
+        assert os.getpid() not in core.trim_backend.trimmed
+    finally:
+        core.close()
@@ -0,0 +1,58 @@
+import pytest
+
+from ultimate_optimizer import (JobCancelled, MemoryRegistryBackend, PlanExecutor, RegistryWriter, Tweak, TweakCatalog,
+                                TweakPlanner)
+
+
+def catalog(tweaks, profiles):
+    return TweakCatalog({tid: Tweak(tid, spec) for tid, spec in tweaks.items()}, profiles)
+
+
+def reg(target, value, **extra):
+    return dict({'kind': 'registry', 'target': f"HKCU\\Software\\Test\\{target}", 'value': value}, **extra)
+
+
+def test_same_setting_same_value_runs_once():
+    cat = catalog({
+        'a': reg('X', 1),
+        'b': reg('x', 1),  # gleiche Einstellung, andere id
+        'c': dict(reg('Y', 2), depends=['b']),
+    }, {'p': {'tweaks': ['a', 'b', 'c']}})
+    plan = TweakPlanner(cat).compile('p')
+    assert [t.id for t in plan.steps] == ['a', 'c']
+    # c hängt (über b) an a und landet deshalb in einer späteren Stufe
+    assert [[t.id for t in stage] for stage in plan.stages] == [['a'], ['c']]
+
+
+def test_same_setting_different_value_conflicts():
+    cat = catalog({'a': reg('X', 1), 'b': reg('X', 2)}, {'p': {'tweaks': ['a', 'b']}})
+    with pytest.raises(ValueError, match="Konflikt"):
+        TweakPlanner(cat).compile('p')
+
+
+def run_plan(run_action):
+    cat = catalog({
+        'reg': reg('X', 1),
+        'broken': {'kind': 'action', 'target': 'broken'},
+        'fine': {'kind': 'action', 'target': 'fine'},
+    }, {'p': {'tweaks': ['reg', 'broken', 'fine']}})
+    plan = TweakPlanner(cat).compile('p')
+    executor = PlanExecutor(RegistryWriter(MemoryRegistryBackend()).apply_batch, None, run_action, max_parallel=1)
+    return executor.execute(plan)
+
+
+def test_failing_action_does_not_abort_plan():
+    def run_action(name, job):
+        if name == 'broken':
+            raise RuntimeError("kaputt")
+    
+    results = {t.id: (ok, detail) for t, ok, detail in run_plan(run_action)}
+    assert results == {'reg': (True, "created"), 'broken': (False, "kaputt"), 'fine': (True, "ausgeführt")}
+
+
+def test_cancelled_action_still_aborts_plan():
+    def run_action(name, job):
+        raise JobCancelled()
+    
+    with pytest.raises(JobCancelled):
+        run_plan(run_action)
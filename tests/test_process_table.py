@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+import psutil
+import pytest
+
+from ultimate_optimizer import ProcessTable
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    yield proc
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+def test_only_registered_attributes_are_read():
+    table = ProcessTable()
+    table.refresh()
+    me = table.get(os.getpid())
+    assert me is not None
+    assert me.name is None and me.memory_info is None
+
+    table.register('name', 'memory_info')
+    table.refresh()
+    assert me.name == psutil.Process().name()  # gleicher Record, statisches Attribut nachgeladen
+    assert table.get(os.getpid()) is me
+    assert me.rss > 0
+    assert me.cmdline is None
+
+
+def test_refresh_tracks_new_and_gone_pids(child):
+    table = ProcessTable()
+    table.refresh()
+    assert table.get(child.pid) is not None
+
+    child.kill()
+    child.wait()
+    result = table.refresh()
+    assert result['gone'] >= 1
+    assert table.get(child.pid) is None
+
+    fresh = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    try:
+        result = table.refresh()
+        assert result['new'] >= 1
+        assert table.get(fresh.pid) is not None
+    finally:
+        fresh.kill()
+        fresh.wait()
+
+
+def test_max_age_reuses_a_recent_refresh():
+    table = ProcessTable()
+    assert table.refresh() is not None
+    assert table.refresh(max_age=60) is None
+    assert table.refreshes == 1
+
+
+def test_dynamic_attributes_follow_registrations():
+    table = ProcessTable()
+    table.register('num_threads')
+    table.register('num_threads')
+    assert table.active
+    table.unregister('num_threads')
+    table.refresh()
+    assert table.get(os.getpid()).num_threads >= 1
+    table.unregister('num_threads')
+    assert not table.active
+    with pytest.raises(ValueError, match="Unbekannte"):
+        table.register('bogus')
+
+
+def test_listeners_and_top():
+    table = ProcessTable()
+    table.register('memory_info')
+    seen = []
+    table.listeners.append(seen.append)
+    table.refresh()
+    [records] = seen
+    assert len(records) == len(table)
+    top = table.top(3, key='rss')
+    assert len(top) == 3
+    assert [r.rss for r in top] == sorted((r.rss for r in top), reverse=True)
+    assert top[0].rss == max(r.rss for r in records)
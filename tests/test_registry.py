@@ -0,0 +1,72 @@
+from ultimate_optimizer import (ChangeJournal, JournalReplayer, MemoryJournalBackend, MemoryRegistryBackend,
+                                RegistryChange, RegistryDiff, RegistryWriter)
+
+KEY = 'Software\\Test'
+
+
+def make_backend():
+    return MemoryRegistryBackend({
+        f"HKCU\\{KEY}\\Existing": (1, 'DWORD'),
+        f"HKCU\\{KEY}\\Same": ("x", 'SZ'),
+        f"HKCU\\{KEY}\\Gone": (b'\x01\x02', 'BINARY'),
+    })
+
+
+def changes():
+    return [
+        RegistryChange('HKCU', KEY, 'Existing', 2),
+        RegistryChange('HKCU', KEY, 'Same', "x", 'SZ'),
+        RegistryChange('HKCU', KEY, 'New', 7),
+        RegistryChange('HKCU', KEY, 'Gone', None),
+    ]
+
+
+def test_apply_reports_diff_per_value():
+    backend = make_backend()
+    diffs = {d.change.name: d for d in RegistryWriter(backend).apply_batch(changes())}
+    
+    assert diffs['Existing'].status == RegistryDiff.CHANGED
+    assert diffs['Existing'].old_value == 1
+    assert diffs['Same'].status == RegistryDiff.UNCHANGED
+    assert diffs['New'].status == RegistryDiff.CREATED
+    assert diffs['New'].old_value is None
+    assert diffs['Gone'].status == RegistryDiff.DELETED
+    assert diffs['Gone'].old_kind == 'BINARY'
+    # Ein Schlüssel -> einmal geöffnet, unveränderte Werte werden nicht geschrieben
+    assert backend.opens == 1
+    assert backend.writes == 3
+    assert backend.get('HKCU', KEY, 'existing') == (2, 'DWORD')
+    assert backend.get('HKCU', KEY, 'Gone') is None
+
+
+def test_dry_run_leaves_backend_untouched():
+    backend = make_backend()
+    before = dict(backend.values)
+    diffs = RegistryWriter(backend).apply_batch(changes(), dry_run=True)
+    assert sum(1 for d in diffs if d.written) == 3
+    assert backend.values == before
+    assert backend.writes == 0
+
+
+def test_reapply_is_unchanged():
+    backend = make_backend()
+    writer = RegistryWriter(backend)
+    writer.apply_batch(changes())
+    assert not any(d.written for d in writer.apply_batch(changes()))
+
+
+def test_journal_rollback_restores_original_values():
+    backend = make_backend()
+    before = dict(backend.values)
+    journal = ChangeJournal(MemoryJournalBackend())
+    writer = RegistryWriter(backend, journal)
+    writer.apply_batch(changes())
+    assert backend.values != before
+    # Unveränderte Werte landen nicht im Journal
+    assert sorted(e['target'].rsplit('\\', 1)[1] for e in journal.pending()) == ['Existing', 'Gone', 'New']
+    
+    replayer = JournalReplayer(lambda c: writer.apply_batch(c, record=False), None)
+    result = replayer.replay(journal)
+    assert result['failed'] == []
+    assert backend.values == before
+    assert journal.pending() == []
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from ultimate_optimizer import ScanIndex, TempCleanupEngine
+
+
+def write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fh:
+        fh.write(b'x' * size)
+
+
+def touch_dir(path, ns):
+    # Feste mtime statt Wanduhr, damit "geändert" nicht von der Dateisystem-Auflösung abhängt
+    os.utime(path, ns=(ns, ns))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path / 'temp')
+    write(os.path.join(root, 'a.tmp'), 100)
+    write(os.path.join(root, 'sub', 'b.tmp'), 200)
+    write(os.path.join(root, 'sub', 'deep', 'c.tmp'), 300)
+    for i, path in enumerate((root, os.path.join(root, 'sub'), os.path.join(root, 'sub', 'deep'))):
+        touch_dir(path, 1_000_000_000 + i)
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ScanIndex(str(tmp_path / 'scan.sqlite3'))
+    yield idx
+    idx.close()
+
+
+def test_first_scan_lists_every_directory(index, tree):
+    result = index.scan([(tree, 'temp')])
+    assert result['dirs'] == 3
+    assert result['dirs_listed'] == 3
+    assert result['files_indexed'] == 3
+    assert index.summary() == {'temp': (3, 600)}
+
+
+def test_rescan_only_lists_changed_directories(index, tree):
+    index.scan([(tree, 'temp')])
+    assert index.scan([(tree, 'temp')])['dirs_listed'] == 0
+
+    sub = os.path.join(tree, 'sub')
+    write(os.path.join(sub, 'new.tmp'), 50)
+    touch_dir(sub, 2_000_000_000)
+    result = index.scan([(tree, 'temp')])
+    # Unveränderte Ordner unterhalb von sub werden trotzdem besucht, aber nicht gelistet
+    assert result['dirs'] == 3
+    assert result['dirs_listed'] == 1
+    assert index.summary() == {'temp': (4, 650)}
+
+
+def test_vanished_directory_leaves_the_index(index, tree):
+    index.scan([(tree, 'temp')])
+    deep = os.path.join(tree, 'sub', 'deep')
+    os.remove(os.path.join(deep, 'c.tmp'))
+    os.rmdir(deep)
+    touch_dir(os.path.join(tree, 'sub'), 2_000_000_000)
+    index.scan([(tree, 'temp')])
+    assert index.summary() == {'temp': (2, 300)}
+
+
+def test_cancelled_scan_is_rolled_back(index, tree):
+    class Token:
+        def raise_if_cancelled(self):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        index.scan([(tree, 'temp')], token=Token())
+    assert index.summary() == {}
+
+
+def test_iter_candidates_pages_by_rowid(index, tree):
+    index.scan([(tree, 'temp')])
+    rows = list(index.iter_candidates('temp', page_size=1))
+    assert sorted(size for _, _, size in rows) == [100, 200, 300]
+    assert [rowid for rowid, _, _ in rows] == sorted(rowid for rowid, _, _ in rows)
+    assert list(index.iter_candidates('other')) == []
+
+
+def test_clean_category_deletes_files_and_index_rows(index, tree):
+    index.scan([(tree, 'temp')])
+    stats = index.clean_category('temp', engine=TempCleanupEngine(workers=2))
+    assert stats.files_deleted == 3
+    assert stats.bytes_freed == 600
+    assert index.summary() == {}
+    assert not os.path.exists(os.path.join(tree, 'a.tmp'))
+    # Verzeichnisse bleiben stehen, nur Dateien werden gelöscht
+    assert os.path.isdir(os.path.join(tree, 'sub', 'deep'))
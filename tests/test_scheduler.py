@@ -0,0 +1,81 @@
+import threading
+import time
+
+from ultimate_optimizer import Job, JobScheduler
+
+
+def blocking(release):
+    def func(job):
+        release.wait(5)
+        return 'ok'
+    return func
+
+
+def test_mutating_jobs_run_exclusively_in_order():
+    order = []
+    scheduler = JobScheduler(max_workers=4)
+    jobs = [scheduler.submit(f"j{i}", lambda job, i=i: order.append(i)) for i in range(3)]
+    for job in jobs:
+        assert job.wait(5)
+    scheduler.shutdown()
+    assert order == [0, 1, 2]
+    assert all(job.status == Job.DONE for job in jobs)
+
+
+def test_duplicate_name_is_not_queued_twice():
+    release = threading.Event()
+    scheduler = JobScheduler()
+    first = scheduler.submit('scan', blocking(release))
+    assert scheduler.submit('scan', blocking(release)) is None
+    release.set()
+    assert first.wait(5)
+    scheduler.shutdown()
+
+
+def test_failure_marks_job_failed():
+    scheduler = JobScheduler()
+
+    def boom(job):
+        raise ValueError("kaputt")
+
+    job = scheduler.submit('boom', boom)
+    assert job.wait(5)
+    scheduler.shutdown()
+    assert job.status == Job.FAILED
+    assert isinstance(job.error, ValueError)
+
+
+def test_shutdown_without_cancel_finishes_queued_jobs_as_cancelled():
+    release = threading.Event()
+    started = []
+    scheduler = JobScheduler()
+    running = scheduler.submit('running', blocking(release))
+    queued = scheduler.submit('queued', lambda job: started.append(job))
+
+    closer = threading.Thread(target=scheduler.shutdown, kwargs={'cancel': False})
+    closer.start()
+    while not scheduler._closed:
+        time.sleep(0.01)
+    release.set()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert running.wait(5) and running.status == Job.DONE
+    # Darf weder hängen bleiben noch im beendeten Executor starten
+    assert queued.wait(5) and queued.status == Job.CANCELLED
+    assert started == []
+    assert not scheduler.busy
+
+
+
+def test_state_callback_errors_go_to_log():
+    messages = []
+
+    def on_state(job):
+        raise RuntimeError("Callback")
+
+    scheduler = JobScheduler(on_state=on_state, log=lambda message, level="INFO": messages.append((message, level)))
+    job = scheduler.submit('j', lambda job: None)
+    assert job.wait(5)
+    scheduler.shutdown()
+    assert messages and all(level == "ERROR" for _, level in messages)
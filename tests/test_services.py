@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from ultimate_optimizer import (ChangeJournal, JournalReplayer, MemoryJournalBackend, ServiceInfo, ServicePolicy,
+                                ServiceSampler, ServiceUsage, SystemdFakeServiceBackend, apply_service_plan)
+
+MB = 1024**2
+
+SPEC = {
+    'protect': ["RpcSs", "systemd-*"],
+    'disable': ["DiagTrack", "MapsBroker"],
+    'thresholds': {
+        'disable': {'cpu_percent': 0.5, 'rss_mb': 20, 'wakeups': 5},
+        'delay': {'cpu_percent': 2.0, 'rss_mb': 150, 'wakeups': 50},
+    },
+    'min_observed': 60,
+}
+
+
+def usage(cpu=0.0, rss_mb=5, wakeups=0.0, observed=300.0):
+    return ServiceUsage(cpu, rss_mb * MB, wakeups, observed)
+
+
+def decide(services, samples):
+    return {d.name: d.new for d in ServicePolicy(SPEC).decide(services, samples)}
+
+
+def test_protected_services_are_never_touched():
+    services = [ServiceInfo('rpcss', 'Automatic'), ServiceInfo('systemd-journald', 'Automatic')]
+    samples = {s.name: usage(cpu=90.0, rss_mb=900, wakeups=5000) for s in services}
+    assert decide(services, samples) == {}
+
+
+def test_min_observed_is_required():
+    services = [ServiceInfo('Updater', 'Automatic'), ServiceInfo('DiagTrack', 'Automatic')]
+    samples = {'Updater': usage(cpu=50.0, observed=59.0), 'DiagTrack': usage(wakeups=100, observed=30.0)}
+    assert decide(services, samples) == {}
+    samples['Updater'].observed = 60.0
+    assert decide(services, samples) == {'Updater': 'AutomaticDelayedStart'}
+
+
+def test_disable_list_uses_low_thresholds():
+    services = [ServiceInfo('DiagTrack', 'Automatic'), ServiceInfo('MapsBroker', 'Manual'),
+                ServiceInfo('Other', 'Automatic')]
+    # Gleicher Verbrauch: reicht für die Abschaltliste, nicht für verzögerten Start
+    samples = {name: usage(cpu=1.0, rss_mb=30, wakeups=10) for name in ('DiagTrack', 'MapsBroker', 'Other')}
+    assert decide(services, samples) == {'DiagTrack': 'Disabled', 'MapsBroker': 'Disabled'}
+    quiet = {name: usage(cpu=0.1, rss_mb=10, wakeups=1) for name in samples}
+    assert decide(services, quiet) == {}
+
+
+def test_delay_only_for_automatic_services():
+    services = [ServiceInfo('Auto', 'Automatic'), ServiceInfo('Manual', 'Manual'),
+                ServiceInfo('Delayed', 'AutomaticDelayedStart'), ServiceInfo('DiagTrack', 'Disabled')]
+    samples = {s.name: usage(rss_mb=400) for s in services}
+    assert decide(services, samples) == {'Auto': 'AutomaticDelayedStart'}
+
+
+def test_decisions_sorted_by_score():
+    services = [ServiceInfo(name, 'Automatic') for name in ('a', 'b', 'c')]
+    samples = {'a': usage(cpu=3.0), 'b': usage(wakeups=500), 'c': usage(rss_mb=300)}
+    decisions = ServicePolicy(SPEC).decide(services, samples)
+    assert [(d.name, d.score) for d in decisions] == [('b', 10.0), ('c', 2.0), ('a', 1.5)]
+
+
+def test_unknown_threshold_is_rejected():
+    with pytest.raises(ValueError):
+        ServicePolicy({'thresholds': {'delay': {'handles': 100}}})
+
+
+def test_batched_apply_and_rollback():
+    backend = SystemdFakeServiceBackend({
+        'Updater': {'start': 'Automatic', 'running': True, 'pid': 10},
+        'DiagTrack': {'start': 'Automatic', 'running': True, 'pid': 11},
+        'Idle': {'start': 'Automatic'},
+    })
+    before = {name: unit['start'] for name, unit in backend.units.items()}
+    samples = {'Updater': usage(cpu=30.0), 'DiagTrack': usage(wakeups=20), 'Idle': usage()}
+    decisions = ServicePolicy(SPEC).decide(backend.services(), samples)
+    journal = ChangeJournal(MemoryJournalBackend())
+    
+    results = apply_service_plan(backend, decisions, journal)
+    assert results == {'Updater': (True, "OK"), 'DiagTrack': (True, "OK")}
+    assert backend.apply_calls == 1
+    assert backend.units['DiagTrack']['start'] == 'Disabled'
+    assert not backend.units['DiagTrack']['running']
+    assert backend.units['Updater']['start'] == 'AutomaticDelayedStart'
+    
+    JournalReplayer(None, None, handlers={'service': backend.restore_entry}).replay(journal)
+    assert {name: unit['start'] for name, unit in backend.units.items()} == before
+
+
+def test_sampler_splits_shared_host_process():
+    # Zwei Dienste im selben Host-Prozess teilen sich dessen Verbrauch
+    backend = SystemdFakeServiceBackend({
+        'one': {'start': 'Automatic', 'running': True, 'pid': os.getpid()},
+        'two': {'start': 'Automatic', 'running': True, 'pid': os.getpid()},
+        'stopped': {'start': 'Manual'},
+    })
+    sampler = ServiceSampler(backend)
+    sampler.sample(now=1000.0)
+    sum(i * i for i in range(200_000))
+    sampler.sample(now=1010.0)
+    result = sampler.usage()
+    assert set(result) == {'one', 'two'}
+    assert result['one'].observed == 10.0
+    assert result['one'].rss == result['two'].rss > 0
+    assert result['one'].cpu_percent == result['two'].cpu_percent
+    assert sampler.observed == 10.0
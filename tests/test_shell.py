@@ -0,0 +1,63 @@
+import shutil
+
+import pytest
+
+from ultimate_optimizer import BashDialect, ShellSession, ShellSessionPool
+
+pytestmark = pytest.mark.skipif(shutil.which('bash') is None, reason="bash nicht verfügbar")
+
+
+@pytest.fixture
+def session():
+    session = ShellSession(BashDialect())
+    yield session
+    session.close()
+
+
+def test_exit_code_propagates(session):
+    assert session.run("exit 3").exit_code == 3
+    assert session.run("false").exit_code == 1
+    result = session.run("echo fine")
+    assert result.ok
+    assert result.output == "fine\n"
+
+
+def test_multiline_output_with_sentinel_like_text(session):
+    script = "printf 'eins\\nzwei\\n'\necho '__UO_DONE_deadbeef__ 0'\necho 'drei'; exit 4"
+    result = session.run(script)
+    assert result.exit_code == 4
+    assert result.output.splitlines() == ["eins", "zwei", "__UO_DONE_deadbeef__ 0", "drei"]
+    # Die Session bleibt synchron: das nächste Skript bekommt nur seine eigene Ausgabe
+    assert session.run("echo next").output == "next\n"
+
+
+def test_timeout_respawns_shell(session):
+    pid = session.proc.pid
+    result = session.run("sleep 30", timeout=0.5)
+    assert result.timed_out
+    assert not result.ok
+    assert session.alive
+    assert session.proc.pid != pid
+    assert session.run("echo again").output == "again\n"
+
+
+def test_shell_died_mid_command(session):
+    pid = session.proc.pid
+    # $$ ist auch in der Subshell die PID der Session-Shell
+    result = session.run("echo before; kill -9 $$; sleep 5")
+    assert result.exit_code == -1
+    assert "before" in result.output
+    assert session.alive
+    assert session.proc.pid != pid
+    assert session.run("echo alive").ok
+
+
+def test_pool_replaces_dead_session():
+    pool = ShellSessionPool(BashDialect(), size=1)
+    try:
+        assert pool.run("kill -9 $$").exit_code == -1
+        result = pool.run("echo ok")
+        assert result.ok
+        assert result.output == "ok\n"
+    finally:
+        pool.close()
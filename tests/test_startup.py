@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from ultimate_optimizer import (STARTUP_APPROVED, BootImpactStore, ChangeJournal, FakeStartupBackend, JournalReplayer,
+                                MemoryJournalBackend, MemoryRegistryBackend, RegistryWriter, StartupAnalyzer,
+                                StartupBackend)
+
+MB = 1024**2
+HKCU_RUN = StartupBackend.RUN_KEYS[0][1]
+HKLM_RUN = StartupBackend.RUN_KEYS[1][1]
+ENABLED = b'\x06' + b'\x00' * 11  # explizit aktiv, wie vom Task-Manager geschrieben
+
+
+def image(tmp_path, name, size):
+    path = os.path.join(str(tmp_path), name)
+    with open(path, 'wb') as fh:
+        fh.truncate(size)
+    return path
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    # Synthetisches Inventar: Run-Einträge in HKCU/HKLM, ein Startordner, zwei Aufgaben
+    images = {name: image(tmp_path, f"{name}.exe", size) for name, size in (
+        ('heavy', 40 * MB), ('medium', 2 * MB), ('light', 100 * 1024), ('unmeasured', 50 * MB),
+        ('system', 30 * MB), ('task_heavy', 10 * MB), ('task_light', 10 * 1024), ('linked', 8 * MB),
+    )}
+    folder = os.path.join(str(tmp_path), 'Startup')
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'Linked.lnk'), 'w', encoding='utf-8') as fh:
+        fh.write(images['linked'])
+    registry = MemoryRegistryBackend({
+        f"HKCU\\{HKCU_RUN}\\Heavy": (f'"{images["heavy"]}" --tray', 'SZ'),
+        f"HKCU\\{HKCU_RUN}\\Light": (images['light'], 'SZ'),
+        f"HKCU\\{HKCU_RUN}\\Unmeasured": (images['unmeasured'], 'SZ'),
+        f"HKLM\\{HKLM_RUN}\\Medium": (f'"{images["medium"]}"', 'SZ'),
+        f"HKLM\\{HKLM_RUN}\\System": (images['system'], 'SZ'),
+        f"HKCU\\{STARTUP_APPROVED}\\Run\\Heavy": (ENABLED, 'BINARY'),
+    })
+    tasks = {'\\Vendor\\HeavyTask': (f"{images['task_heavy']} /bg", True),
+             '\\Vendor\\LightTask': (images['task_light'], True)}
+    store = BootImpactStore(os.path.join(str(tmp_path), 'boot.sqlite3'))
+    # Zwei Boots, gemittelt: (CPU s, gelesene Bytes)
+    for boot, factor in ((1, 0.5), (2, 1.5)):
+        store.record(boot, {
+            images['heavy']: (4.0 * factor, 20 * MB * factor),
+            images['medium']: (0.5 * factor, 1 * MB * factor),
+            images['light']: (0.01 * factor, 10 * 1024 * factor),
+            images['system']: (3.0 * factor, 5 * MB * factor),
+            images['task_heavy']: (1.5 * factor, 2 * MB * factor),
+            images['task_light']: (0.05 * factor, 50 * 1024 * factor),
+            images['linked']: (2.0 * factor, 1 * MB * factor),
+        })
+    backend = FakeStartupBackend(registry, [('HKCU', folder)], tasks)
+    yield backend, store, images
+    store.close()
+
+
+def test_ranking_by_boot_impact(inventory):
+    backend, store, images = inventory
+    items = StartupAnalyzer(backend, store).analyze()
+    # Der Speicher-Fake liefert Registry-Namen kleingeschrieben (Windows ist case-insensitiv)
+    by_name = {i.name.lower(): i for i in items}
+    
+    # cost = CPU + I/O / 100 MB/s (gemessen) bzw. Programmgröße / 100 MB/s (ungemessen)
+    assert [i.name.lower() for i in items] == ['heavy', 'system', 'linked.lnk', 'heavytask', 'medium',
+                                               'unmeasured', 'lighttask', 'light']
+    assert by_name['heavy'].cost == pytest.approx(4.0 + 20 / 100)
+    assert by_name['unmeasured'].cost == pytest.approx(50 / 100)
+    assert not by_name['unmeasured'].measured
+    assert by_name['linked.lnk'].image == images['linked']
+    assert {name: i.impact for name, i in by_name.items()} == {
+        'heavy': 'hoch', 'system': 'hoch', 'linked.lnk': 'hoch', 'heavytask': 'hoch',
+        'medium': 'mittel', 'unmeasured': 'hoch', 'lighttask': 'niedrig', 'light': 'niedrig',
+    }
+
+
+def test_expensive_selection(inventory, tmp_path):
+    backend, store, images = inventory
+    items = StartupAnalyzer(backend, store).analyze()
+    for item in items:
+        if item.name == 'HeavyTask':
+            item.enabled = False
+    
+    # Ungemessen, deaktiviert und geschützt fallen raus
+    expensive = StartupAnalyzer.expensive(items, protected=[images['system']])
+    assert sorted(i.name.lower() for i in expensive) == ['heavy', 'linked.lnk']
+    medium = StartupAnalyzer.expensive(items, impact='mittel', protected=[images['system']])
+    assert sorted(i.name.lower() for i in medium) == ['heavy', 'linked.lnk', 'medium']
+
+
+def test_disable_and_rollback_restore_approved_values_bytewise(inventory):
+    backend, store, _ = inventory
+    before = dict(backend.registry.values)
+    before_tasks = dict(backend.task_table)
+    journal = ChangeJournal(MemoryJournalBackend())
+    writer = RegistryWriter(backend.registry, journal)
+    analyzer = StartupAnalyzer(backend, store)
+    items = analyzer.analyze()
+    expensive = StartupAnalyzer.expensive(items)
+    
+    disabled, failed = analyzer.disable(expensive, writer.apply_batch, journal)
+    assert failed == []
+    assert disabled == len(expensive) == 4
+    after = {i.path: i.enabled for i in StartupAnalyzer(backend).analyze()}
+    assert not any(after[i.path] for i in expensive)
+    heavy = backend.registry.get('HKCU', f"{STARTUP_APPROVED}\\Run", 'Heavy')
+    assert heavy[1] == 'BINARY' and heavy[0][0] == 3
+    
+    replayer = JournalReplayer(lambda c: writer.apply_batch(c, record=False), None,
+                               handlers={'task': backend.restore_task})
+    result = replayer.replay(journal)
+    assert result['failed'] == []
+    assert backend.registry.values == before
+    assert backend.registry.get('HKCU', f"{STARTUP_APPROVED}\\Run", 'Heavy') == (ENABLED, 'BINARY')
+    assert backend.task_table == before_tasks
+
+
+class HklmReadOnly(MemoryRegistryBackend):
+    def open_key(self, hive, key, write=False):
+        if write and hive == 'HKLM':
+            raise PermissionError("Zugriff verweigert")
+        return super().open_key(hive, key, write)
+
+
+def test_same_name_in_hkcu_and_hklm_is_reported_per_item(tmp_path):
+    exe = image(tmp_path, "app.exe", 1024)
+    registry = HklmReadOnly({f"HKCU\\{HKCU_RUN}\\App": (exe, 'SZ'), f"HKLM\\{HKLM_RUN}\\App": (exe, 'SZ')})
+    backend = FakeStartupBackend(registry)
+    items = backend.items()
+    assert len(items) == 2
+    journal = ChangeJournal(MemoryJournalBackend())
+    
+    disabled, failed = StartupAnalyzer(backend).disable(items, RegistryWriter(registry, journal).apply_batch, journal)
+    hkcu, hklm = sorted(items, key=lambda i: i.location)
+    assert disabled == 1
+    assert [item for item, _ in failed] == [hklm]
+    assert not hkcu.enabled
+    assert hklm.enabled
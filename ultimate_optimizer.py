@@ -3,1563 +3,6143 @@ import sys
 import os
 import json
 import time
+
+# Startzeitpunkt des Engine-Imports, für --profile-startup
+IMPORT_STARTED = time.perf_counter()
+import queue
+import re
+import shutil
+import tempfile
+import fnmatch
+import argparse
+import itertools
+import collections
+import heapq
+import sqlite3
 import subprocess
 import threading
-import warnings
+import uuid
+import signal
+import socket
+import statistics
+import base64
+import hashlib
+import csv
+from array import array
 from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait as futures_wait
+
+# Engine ohne Qt: die Oberfläche liegt in optimizer_gui.py und wird nur bei Bedarf geladen
+try:
+    import psutil
+except ImportError as e:
+    # Als Bibliothek importierbar bleiben: kein exit beim Import, nur ein Hinweis im Fehler
+    raise ImportError(f"psutil fehlt ({e}) – installieren mit: pip install psutil") from e
+
+# ========== REINIGUNGS-ENGINE ==========
+
+def get_temp_roots():
+    # TEMP und AppData\Local\Temp zeigen meist auf denselben Ordner -> nur einmal bereinigen
+    candidates = [
+        os.environ.get('TEMP', ''),
+        os.environ.get('TMP', ''),
+        os.path.join(os.environ.get('USERPROFILE', ''), 'AppData', 'Local', 'Temp') if os.environ.get('USERPROFILE') else '',
+        tempfile.gettempdir(),
+    ]
+    roots, seen = [], set()
+    for path in candidates:
+        if not path or not os.path.isdir(path):
+            continue
+        key = os.path.normcase(os.path.realpath(path))
+        if key not in seen:
+            seen.add(key)
+            roots.append(path)
+    return roots
+
+
+class CleanupStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files_deleted = 0
+        self.bytes_freed = 0
+        self.errors = 0
+        self.dirs_scanned = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add_batch(self, files, size, errors, dirs=0):
+        with self._lock:
+            self.files_deleted += files
+            self.bytes_freed += size
+            self.errors += errors
+            self.dirs_scanned += dirs
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return max(end - self.started, 1e-9)
+
+    @property
+    def files_per_sec(self):
+        return self.files_deleted / self.elapsed
+
+    def as_dict(self):
+        return {
+            'files_deleted': self.files_deleted,
+            'bytes_freed': self.bytes_freed,
+            'errors': self.errors,
+            'dirs_scanned': self.dirs_scanned,
+            'elapsed': round(self.elapsed, 3),
+            'files_per_sec': round(self.files_per_sec, 1),
+        }
+
+
+class TempCleanupEngine:
+    # Verzeichnisse werden mit os.scandir gelistet (DirEntry cached die stat-Daten,
+    # unter Windows ohne extra Syscall), Unterordner landen in einer gemeinsamen
+    # Queue und werden von einem begrenzten Thread-Pool abgearbeitet.
+    def __init__(self, workers=None, batch_size=512, progress_callback=None, progress_interval=0.25):
+        self.workers = workers or min(32, (os.cpu_count() or 4) * 2)
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self._last_progress = 0.0
+        self._progress_lock = threading.Lock()
+
+    def clean(self, roots, stats=None):
+        stats = stats or CleanupStats()
+        work = queue.Queue()
+        for root in roots:
+            if root and os.path.isdir(root):
+                work.put(root)
+
+        threads = []
+        for _ in range(self.workers):
+            t = threading.Thread(target=self._worker, args=(work, stats), daemon=True)
+            t.start()
+            threads.append(t)
+
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+
+        stats.finish()
+        self._report(stats, force=True)
+        return stats
+
+    def _worker(self, work, stats):
+        batch = []
+        while True:
+            path = work.get()
+            if path is None:
+                work.task_done()
+                break
+            try:
+                try:
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            try:
+                                is_dir = entry.is_dir(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            if is_dir:
+                                work.put(entry.path)
+                                continue
+                            try:
+                                size = entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                size = 0
+                            batch.append((entry.path, size, None))
+                            if len(batch) >= self.batch_size:
+                                self._delete_batch(batch, stats)
+                                batch = []
+                except OSError:
+                    stats.add_batch(0, 0, 1)
+                if batch:
+                    self._delete_batch(batch, stats, dirs=1)
+                    batch = []
+                else:
+                    stats.add_batch(0, 0, 0, dirs=1)
+            finally:
+                work.task_done()
+
+    def delete_entries(self, entries, stats=None, on_deleted=None, on_failed=None, token=None):
+        # Löscht bereits bekannte Dateien (z.B. aus dem ScanIndex) ohne erneutes Durchlaufen
+        # der Verzeichnisse. entries liefert (key, path, size); on_deleted bekommt die Keys,
+        # on_failed die Keys gesperrter/nicht löschbarer Dateien. Nach einem Abbruch über
+        # token werden keine neuen Batches mehr verteilt, angefangene laufen zu Ende.
+        stats = stats or CleanupStats()
+        work = queue.Queue(maxsize=self.workers * 4)
+
+        def worker():
+            while True:
+                batch = work.get()
+                if batch is None:
+                    break
+                self._delete_batch(batch, stats, on_deleted=on_deleted, on_failed=on_failed)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+
+        batch = []
+        for key, path, size in entries:
+            batch.append((path, size, key))
+            if len(batch) >= self.batch_size:
+                work.put(batch)
+                batch = []
+                if token is not None and token.cancelled:
+                    break
+        else:
+            if batch:
+                work.put(batch)
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+
+        stats.finish()
+        self._report(stats, force=True)
+        return stats
+
+    def _delete_batch(self, batch, stats, dirs=0, on_deleted=None, on_failed=None):
+        deleted = freed = errors = 0
+        removed_keys = []
+        failed_keys = []
+        remove = os.remove
+        for path, size, key in batch:
+            try:
+                remove(path)
+                deleted += 1
+                freed += size
+                if key is not None:
+                    removed_keys.append(key)
+            except FileNotFoundError:
+                # Schon weg (z.B. vom Programm selbst aufgeräumt) -> nur aus dem Index entfernen
+                if key is not None:
+                    removed_keys.append(key)
+            except OSError:
+                errors += 1
+                if key is not None:
+                    failed_keys.append(key)
+        stats.add_batch(deleted, freed, errors, dirs)
+        if on_deleted and removed_keys:
+            on_deleted(removed_keys)
+        if on_failed and failed_keys:
+            on_failed(failed_keys)
+        self._report(stats)
+
+    def _report(self, stats, force=False):
+        if not self.progress_callback:
+            return
+        now = time.perf_counter()
+        with self._progress_lock:
+            if not force and now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+        self.progress_callback(stats)
+
+
+def get_data_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    path = os.path.join(base, 'UltimateOptimizer')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_junk_roots():
+    windir = os.environ.get('WINDIR', '')
+    local = os.environ.get('LOCALAPPDATA', '')
+    candidates = [
+        os.path.join(windir, 'Temp') if windir else '',
+        os.path.join(windir, 'SoftwareDistribution', 'Download') if windir else '',
+        os.path.join(local, 'CrashDumps') if local else '',
+    ]
+    return [path for path in candidates if path and os.path.isdir(path)]
+
+
+class ScanIndex:
+    # Kompakter Index der Kandidaten-Dateien (Pfad, Größe, mtime, Kategorie) in SQLite.
+    # Ein erneuter Scan liest nur Verzeichnisse neu ein, deren mtime sich geändert hat;
+    # unveränderte Ordner kosten nur einen stat()-Aufruf.
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'scan_index.sqlite3')
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY, root TEXT NOT NULL, parent TEXT,
+                mtime_ns INTEGER NOT NULL, category TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS dirs_root ON dirs(root);
+            CREATE TABLE IF NOT EXISTS files (
+                dir TEXT NOT NULL, root TEXT NOT NULL, path TEXT NOT NULL,
+                size INTEGER NOT NULL, mtime REAL NOT NULL, category TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+            CREATE INDEX IF NOT EXISTS files_category ON files(category);
+            CREATE TABLE IF NOT EXISTS locked (
+                path TEXT PRIMARY KEY, until REAL NOT NULL, failures INTEGER NOT NULL
+            );
+        """)
+        # Indizes älterer Versionen haben noch keine atime-Spalte
+        if 'atime' not in {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}:
+            self.conn.execute("ALTER TABLE files ADD COLUMN atime REAL NOT NULL DEFAULT 0")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def scan(self, roots, progress_callback=None, token=None):
+        # roots: [(pfad, kategorie), ...]; ein Abbruch verwirft den ganzen Scan (Rollback)
+        result = {'dirs': 0, 'dirs_listed': 0, 'files_indexed': 0, 'elapsed': 0.0}
+        t0 = time.perf_counter()
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for root, category in roots:
+                    self._scan_root(root, category, result, progress_callback, token)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        result['elapsed'] = time.perf_counter() - t0
+        return result
+
+    def _scan_root(self, root, category, result, progress_callback, token=None):
+        conn = self.conn
+        known = {}
+        children = {}
+        for path, parent, mtime_ns in conn.execute(
+                "SELECT path, parent, mtime_ns FROM dirs WHERE root = ?", (root,)):
+            known[path] = mtime_ns
+            if parent is not None:
+                children.setdefault(parent, []).append(path)
+
+        seen = set()
+        stack = [(root, None)]
+        while stack:
+            if token is not None:
+                token.raise_if_cancelled()
+            path, parent = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(path)
+            result['dirs'] += 1
+
+            if known.get(path) == mtime_ns:
+                stack.extend((child, path) for child in children.get(path, ()))
+                continue
+
+            rows = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, path))
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        rows.append((path, root, entry.path, st.st_size, st.st_mtime, st.st_atime, category))
+            except OSError:
+                continue
+
+            conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+            conn.executemany("INSERT INTO files (dir, root, path, size, mtime, atime, category) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO dirs (path, root, parent, mtime_ns, category) VALUES (?, ?, ?, ?, ?)",
+                         (path, root, parent, mtime_ns, category))
+            result['dirs_listed'] += 1
+            result['files_indexed'] += len(rows)
+            if progress_callback and result['dirs_listed'] % 200 == 0:
+                progress_callback(result)
+
+        vanished = [(path,) for path in known if path not in seen]
+        if vanished:
+            conn.executemany("DELETE FROM files WHERE dir = ?", vanished)
+            conn.executemany("DELETE FROM dirs WHERE path = ?", vanished)
+
+    def summary(self):
+        with self._lock:
+            return {category: (count, size or 0) for category, count, size in self.conn.execute(
+                "SELECT category, COUNT(*), SUM(size) FROM files GROUP BY category")}
+
+    def iter_candidates(self, category, page_size=5000):
+        # Keyset-Paginierung über rowid: jede Seite wird komplett gelesen, daher dürfen
+        # parallel Zeilen gelöscht werden, ohne den Cursor zu stören.
+        last = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT rowid, path, size FROM files WHERE category = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (category, last, page_size)).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield from rows
+
+    def remove_rows(self, rowids):
+        with self._lock:
+            self.conn.executemany("DELETE FROM files WHERE rowid = ?", [(r,) for r in rowids])
+
+    def clean_category(self, category, engine=None, stats=None):
+        engine = engine or TempCleanupEngine()
+        return engine.delete_entries(self.iter_candidates(category), stats, on_deleted=self.remove_rows)
+
+
+class EvictionPlanner:
+    # Verdrängung wie in einem Cache: Kandidaten aus dem ScanIndex werden nach
+    # Leerlaufzeit (jüngere von mtime/atime) mal Größe gereiht, gelöscht wird nur bis das
+    # Byte-Budget erreicht ist. Gesperrte Dateien landen mit wachsender Abklingzeit in
+    # der Tabelle "locked" und werden bis dahin gar nicht erst versucht.
+    RANKED = """
+        SELECT f.rowid, f.path, f.size FROM files f LEFT JOIN locked l ON l.path = f.path
+        WHERE f.category = ? AND MAX(f.mtime, f.atime) <= ? AND (l.until IS NULL OR l.until <= ?)
+        ORDER BY (? - MAX(f.mtime, f.atime)) * (f.size + 4096) DESC LIMIT ?
+    """
+    UNRANKED = """
+        SELECT f.rowid, f.path, f.size FROM files f LEFT JOIN locked l ON l.path = f.path
+        WHERE f.category = ? AND MAX(f.mtime, f.atime) <= ? AND (l.until IS NULL OR l.until <= ?)
+            AND f.rowid > ?
+        ORDER BY f.rowid LIMIT ?
+    """
+
+    def __init__(self, index, min_age=3600, cooldown=6 * 3600, max_cooldown=7 * 86400, page_size=5000):
+        self.index = index
+        self.min_age = min_age
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.page_size = page_size
+        self._now = time.time()
+
+    def evict(self, category, budget=None, engine=None, stats=None, token=None, on_checkpoint=None):
+        # budget=None: alles Löschbare (ohne Ranking, in rowid-Reihenfolge).
+        # Gelöschte Dateien verlassen den Index sofort, der Index ist also selbst der Fortschritt:
+        # nach einem Abbruch setzt ein neuer Aufruf ohne Scan dort fort. on_checkpoint(stats, force)
+        # kommt nach jeder Seite und beim Abbruch.
+        engine = engine or TempCleanupEngine()
+        stats = stats or CleanupStats()
+        self._now = time.time()
+        self.prune()
+        try:
+            for rows in self._pages(category, budget, stats):
+                engine.delete_entries(rows, stats, on_deleted=self.index.remove_rows,
+                                      on_failed=self.mark_locked, token=token)
+                if token is not None:
+                    token.raise_if_cancelled()
+                if on_checkpoint:
+                    on_checkpoint(stats, False)
+        except JobCancelled:
+            if on_checkpoint:
+                on_checkpoint(stats, True)
+            raise
+        stats.finish()
+        return stats
+
+    def _pages(self, category, budget, stats):
+        cutoff = self._now - self.min_age
+        if budget is None:
+            last = 0
+            while True:
+                with self.index._lock:
+                    rows = self.index.conn.execute(
+                        self.UNRANKED, (category, cutoff, self._now, last, self.page_size)).fetchall()
+                if not rows:
+                    return
+                last = rows[-1][0]
+                yield rows
+            return
+
+        # Gelöschte Zeilen verschwinden aus dem Index, gesperrte aus dem Ranking -> jede Runde
+        # liefert neue Kandidaten. Die Seitengröße verdoppelt sich, falls das Budget nicht reicht.
+        limit = self.page_size
+        while stats.bytes_freed < budget:
+            with self.index._lock:
+                rows = self.index.conn.execute(
+                    self.RANKED, (category, cutoff, self._now, self._now, limit)).fetchall()
+            if not rows:
+                return
+            planned, remaining = [], budget - stats.bytes_freed
+            for row in rows:
+                planned.append(row)
+                remaining -= row[2]
+                if remaining <= 0:
+                    break
+            yield planned
+            limit *= 2
+
+    def plan(self, category, budget):
+        # Nur die Auswahl, ohne zu löschen (Vorschau/Benchmark)
+        self._now = time.time()
+        planned, total = [], 0
+        with self.index._lock:
+            for row in self.index.conn.execute(
+                    self.RANKED, (category, self._now - self.min_age, self._now, self._now, -1)):
+                if total >= budget:
+                    break
+                planned.append(row)
+                total += row[2]
+        return planned
+
+    def mark_locked(self, rowids):
+        # Abklingzeit verdoppelt sich mit jedem Fehlschlag bis max_cooldown
+        with self.index._lock:
+            self.index.conn.executemany("""
+                INSERT INTO locked (path, until, failures) SELECT path, ?, 1 FROM files WHERE rowid = ?
+                ON CONFLICT(path) DO UPDATE SET failures = failures + 1,
+                    until = ? + MIN(? * (1 << MIN(failures, 20)), ?)
+            """, [(self._now + self.cooldown, rowid, self._now, self.cooldown, self.max_cooldown) for rowid in rowids])
+
+    def prune(self):
+        # Einträge vergessen, deren Datei nicht mehr im Index steht oder deren Sperre lange abgelaufen ist
+        with self.index._lock:
+            self.index.conn.execute(
+                "DELETE FROM locked WHERE until < ? OR path NOT IN (SELECT path FROM files)",
+                (self._now - self.max_cooldown,))
+
+    def locked_count(self):
+        with self.index._lock:
+            return self.index.conn.execute("SELECT COUNT(*) FROM locked WHERE until > ?", (time.time(),)).fetchone()[0]
+
+
+def format_bytes(num):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num < 1024:
+            return f"{num:.1f} {unit}" if unit != 'B' else f"{num} B"
+        num /= 1024
+    return f"{num:.1f} TB"
+
+
+def parse_size(text):
+    # "10GB", "500 MB", "1.5g", "4096" -> Bytes
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", str(text), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Ungültige Größe: {text}")
+    return int(float(match.group(1)) * 1024 ** " KMGT".index(match.group(2).upper() or " "))
+
+
+def _legacy_walk_clean(roots):
+    deleted = 0
+    for path in roots:
+        for root, dirs, files in os.walk(path):
+            for file in files:
+                try:
+                    os.remove(os.path.join(root, file))
+                    deleted += 1
+                except OSError:
+                    continue
+    return deleted
+
+
+def _create_synthetic_tree(base, file_count, files_per_dir=1000, payload=b"x" * 64):
+    created = 0
+    d = 0
+    while created < file_count:
+        dir_path = os.path.join(base, f"d{d // 100:04d}", f"s{d:06d}")
+        os.makedirs(dir_path, exist_ok=True)
+        for i in range(min(files_per_dir, file_count - created)):
+            with open(os.path.join(dir_path, f"f{i:05d}.tmp"), 'wb') as fh:
+                fh.write(payload)
+        created += min(files_per_dir, file_count - created)
+        d += 1
+    return created
+
+
+def bench_temp_cleanup(file_count=1_000_000, base_dir=None, compare_legacy=True):
+    # Synthetischer Baum im tmpfs (/dev/shm), damit die Messung nicht von der Platte dominiert wird
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    results = {}
+    runs = [('engine', lambda root: TempCleanupEngine().clean([root]).as_dict())]
+    if compare_legacy:
+        runs.insert(0, ('os.walk', lambda root: {'files_deleted': _legacy_walk_clean([root])}))
+
+    for name, runner in runs:
+        root = tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+        try:
+            t0 = time.perf_counter()
+            _create_synthetic_tree(root, file_count)
+            gen_time = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            result = runner(root)
+            elapsed = time.perf_counter() - t0
+            result.update({
+                'elapsed': round(elapsed, 3),
+                'files_per_sec': round(result['files_deleted'] / max(elapsed, 1e-9), 1),
+                'generate_time': round(gen_time, 3),
+            })
+            results[name] = result
+            print(f"{name:>8}: {result['files_deleted']} Dateien in {elapsed:.2f}s "
+                  f"({result['files_per_sec']:.0f} Dateien/s)")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def bench_scan_index(file_count=500_000, base_dir=None):
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    root = tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+    db_dir = tempfile.mkdtemp(prefix='uo_bench_db_', dir=base_dir)
+    try:
+        _create_synthetic_tree(root, file_count)
+        index = ScanIndex(os.path.join(db_dir, 'index.sqlite3'))
+        results = {}
+        for name in ('first_scan', 'rescan_unchanged'):
+            r = index.scan([(root, 'temp')])
+            results[name] = {k: (round(v, 3) if isinstance(v, float) else v) for k, v in r.items()}
+            print(f"{name:>16}: {r['elapsed']:.3f}s ({r['dirs']} Ordner, {r['dirs_listed']} neu gelistet)")
+        index.close()
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+def bench_eviction(file_count=200_000, base_dir=None, budget_share=0.1):
+    # Synthetischer Temp-Ordner mit gestreuten Größen (sparse, kostet keinen Platz) und Altern:
+    # komplette Bereinigung gegen Verdrängung bis zu einem Budget von budget_share der Gesamtgröße
+    import random
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    rng = random.Random(42)
+    results = {}
+    for name in ('full_sweep', 'budget'):
+        root = tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+        db_dir = tempfile.mkdtemp(prefix='uo_bench_db_', dir=base_dir)
+        try:
+            _create_synthetic_tree(root, file_count, payload=b"")
+            now = time.time()
+            total_bytes = 0
+            for dirpath, _, files in os.walk(root):
+                for file in files:
+                    path = os.path.join(dirpath, file)
+                    size = int(rng.paretovariate(1.2) * 4096)
+                    os.truncate(path, size)
+                    age = rng.expovariate(1 / (14 * 86400))
+                    os.utime(path, (now - age, now - age))
+                    total_bytes += size
+            index = ScanIndex(os.path.join(db_dir, 'index.sqlite3'))
+            t0 = time.perf_counter()
+            index.scan([(root, 'temp')])
+            scan_time = time.perf_counter() - t0
+            
+            budget = int(total_bytes * budget_share) if name == 'budget' else None
+            t0 = time.perf_counter()
+            stats = EvictionPlanner(index, min_age=0).evict('temp', budget)
+            elapsed = time.perf_counter() - t0
+            index.close()
+            results[name] = {
+                'files_deleted': stats.files_deleted,
+                'bytes_freed': stats.bytes_freed,
+                'share_of_bytes': round(stats.bytes_freed / max(total_bytes, 1), 3),
+                'scan_time': round(scan_time, 3),
+                'evict_time': round(elapsed, 3),
+            }
+            print(f"{name:>10}: {stats.files_deleted} Dateien, {format_bytes(stats.bytes_freed)} in {elapsed:.2f}s")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.rmtree(db_dir, ignore_errors=True)
+    return results
+
+
+# ========== DUPLIKAT-SUCHE ==========
+
+PARTIAL_HASH_BYTES = 64 * 1024
+_hash_buffer = None
+
+
+def _partial_digest(path, size):
+    # Nur die ersten und letzten 64 KB; kleinere Dateien sind damit schon vollständig gelesen
+    try:
+        with open(path, 'rb') as fh:
+            digest = hashlib.blake2b(fh.read(PARTIAL_HASH_BYTES), digest_size=16)
+            if size > PARTIAL_HASH_BYTES:
+                fh.seek(max(size - PARTIAL_HASH_BYTES, PARTIAL_HASH_BYTES))
+                digest.update(fh.read(PARTIAL_HASH_BYTES))
+        return digest.digest()
+    except OSError:
+        return None
+
+
+def _full_digest(path):
+    # readinto in einen pro Prozess wiederverwendeten Puffer statt eines neuen bytes-Objekts pro Block
+    global _hash_buffer
+    if _hash_buffer is None:
+        _hash_buffer = bytearray(1024 * 1024)
+    view = memoryview(_hash_buffer)
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb', buffering=0) as fh:
+            while True:
+                n = fh.readinto(_hash_buffer)
+                if not n:
+                    break
+                digest.update(view[:n])
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def _hash_buckets(buckets):
+    # Läuft im Worker-Prozess. buckets: [(größe, [pfad, ...]), ...]
+    # Rückgabe: bestätigte Gruppen und die Zähler (Teil-Hashes, volle Hashes, gelesene Bytes)
+    groups = []
+    partial_count = full_count = bytes_read = 0
+    for size, paths in buckets:
+        partial = collections.defaultdict(list)
+        for path in paths:
+            digest = _partial_digest(path, size)
+            if digest is not None:
+                partial[digest].append(path)
+        partial_count += len(paths)
+        bytes_read += len(paths) * min(size, 2 * PARTIAL_HASH_BYTES)
+        for digest, candidates in partial.items():
+            if len(candidates) < 2:
+                continue
+            if size <= 2 * PARTIAL_HASH_BYTES:
+                groups.append((size, digest.hex(), candidates))
+                continue
+            full = collections.defaultdict(list)
+            for path in candidates:
+                digest = _full_digest(path)
+                if digest is not None:
+                    full[digest].append(path)
+            full_count += len(candidates)
+            bytes_read += len(candidates) * size
+            groups.extend((size, d.hex(), same) for d, same in full.items() if len(same) > 1)
+    return groups, (partial_count, full_count, bytes_read)
+
+
+class DuplicateFinder:
+    # Die Dateiliste liegt in SQLite statt in Python-Listen, gruppiert wird per GROUP BY size.
+    # Größen-Buckets gehen stapelweise an einen Prozess-Pool; jeder Stapel prüft erst
+    # Anfang+Ende, nur Überlebende werden komplett gehasht. Bestätigte Gruppen werden
+    # sofort geliefert, sobald ihr Stapel fertig ist.
+    def __init__(self, db_path=None, workers=None, min_size=4096, batch_files=2000, batch_bytes=256 * 1024**2):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'duplicates.sqlite3')
+        self.workers = (os.cpu_count() or 2) if workers is None else workers
+        self.min_size = min_size
+        self.batch_files = batch_files
+        self.batch_bytes = batch_bytes
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # Wegwerf-Index: wird bei jedem Lauf neu aufgebaut, braucht also kein Journal
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS files (size INTEGER NOT NULL, path TEXT NOT NULL)")
+        self.stats = {'files': 0, 'candidates': 0, 'done': 0, 'partial_hashed': 0, 'full_hashed': 0,
+                      'bytes_read': 0, 'groups': 0, 'wasted_bytes': 0}
+
+    def close(self):
+        self.conn.close()
+
+    def index(self, roots, token=None, progress_callback=None):
+        conn = self.conn
+        conn.execute("DROP INDEX IF EXISTS files_size")
+        conn.execute("DELETE FROM files")
+        insert = "INSERT INTO files (size, path) VALUES (?, ?)"
+        count = 0
+        rows = []
+        conn.execute("BEGIN")
+        try:
+            stack = [root for root in roots if os.path.isdir(root)]
+            while stack:
+                if token:
+                    token.raise_if_cancelled()
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    stack.append(entry.path)
+                                    continue
+                                if not entry.is_file(follow_symlinks=False):
+                                    continue
+                                size = entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                continue
+                            if size >= self.min_size:
+                                rows.append((size, entry.path))
+                except OSError:
+                    continue
+                if len(rows) >= 10_000:
+                    conn.executemany(insert, rows)
+                    count += len(rows)
+                    rows = []
+                    if progress_callback:
+                        progress_callback(count)
+            conn.executemany(insert, rows)
+            count += len(rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("CREATE INDEX files_size ON files(size)")
+        self.stats['files'] = count
+        self.stats['candidates'] = conn.execute(
+            "SELECT COALESCE(SUM(n), 0) FROM (SELECT COUNT(*) AS n FROM files GROUP BY size HAVING n > 1)").fetchone()[0]
+        return count
+
+    def largest(self, limit=20):
+        return self.conn.execute("SELECT size, path FROM files ORDER BY size DESC LIMIT ?", (limit,)).fetchall()
+
+    def _batches(self):
+        # Große Dateien zuerst: dort steckt der meiste verschwendete Platz. Ein Stapel endet nach
+        # batch_files Dateien oder batch_bytes Daten, damit die ersten Gruppen früh eintreffen.
+        sizes = self.conn.execute(
+            "SELECT size FROM files GROUP BY size HAVING COUNT(*) > 1 ORDER BY size DESC")
+        batch, files, volume = [], 0, 0
+        for (size,) in iter(sizes.fetchone, None):
+            paths = [p for (p,) in self.conn.execute("SELECT path FROM files WHERE size = ?", (size,))]
+            batch.append((size, paths))
+            files += len(paths)
+            volume += size * len(paths)
+            if files >= self.batch_files or volume >= self.batch_bytes:
+                yield batch
+                batch, files, volume = [], 0, 0
+        if batch:
+            yield batch
+
+    def duplicates(self, token=None):
+        # Generator über (größe, hash, [pfade]); workers=0 rechnet im eigenen Prozess
+        if not self.workers:
+            for batch in self._batches():
+                if token:
+                    token.raise_if_cancelled()
+                yield from self._collect(batch, _hash_buckets(batch))
+            return
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending = {}
+        try:
+            batches = self._batches()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < self.workers * 2:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                    else:
+                        pending[pool.submit(_hash_buckets, batch)] = batch
+                if not pending:
+                    break
+                finished, _ = futures_wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                if token:
+                    token.raise_if_cancelled()
+                for future in finished:
+                    yield from self._collect(pending.pop(future), future.result())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _collect(self, batch, result):
+        groups, (partial_count, full_count, bytes_read) = result
+        self.stats['done'] += sum(len(paths) for _, paths in batch)
+        self.stats['partial_hashed'] += partial_count
+        self.stats['full_hashed'] += full_count
+        self.stats['bytes_read'] += bytes_read
+        for size, digest, paths in groups:
+            self.stats['groups'] += 1
+            self.stats['wasted_bytes'] += size * (len(paths) - 1)
+            yield size, digest, paths
+
+
+def _legacy_find_duplicates(roots):
+    # Alles im Speicher, jede Datei gleicher Größe wird komplett gelesen
+    by_size = collections.defaultdict(list)
+    for root in roots:
+        for dirpath, _, files in os.walk(root):
+            for file in files:
+                path = os.path.join(dirpath, file)
+                try:
+                    by_size[os.path.getsize(path)].append(path)
+                except OSError:
+                    continue
+    groups = []
+    bytes_read = 0
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        by_hash = collections.defaultdict(list)
+        for path in paths:
+            with open(path, 'rb') as fh:
+                by_hash[hashlib.md5(fh.read()).hexdigest()].append(path)
+            bytes_read += size
+        groups.extend(same for same in by_hash.values() if len(same) > 1)
+    return groups, bytes_read
+
+
+def bench_duplicates(file_count=1000, base_dir=None, workers=None):
+    # Gemischter Baum: echte Duplikate, gleich große Dateien mit anderem Anfang (fallen beim
+    # Teil-Hash raus) und mit anderer Mitte (erst der volle Hash trennt sie)
+    import random
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    root = tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+    db_dir = tempfile.mkdtemp(prefix='uo_bench_db_', dir=base_dir)
+    rng = random.Random(7)
+    try:
+        sizes = [(i + 2) * 128 * 1024 for i in range(20)]
+        blobs = {size: rng.randbytes(size) for size in sizes}
+        total_bytes = 0
+        for i in range(file_count):
+            size = sizes[i % len(sizes)]
+            data = bytearray(blobs[size])
+            kind = (i // len(sizes)) % 10
+            if kind < 6:
+                data[:16] = i.to_bytes(16, 'little')
+            elif kind < 8:
+                data[size // 2:size // 2 + 16] = i.to_bytes(16, 'little')
+            dir_path = os.path.join(root, f"d{i // 200:03d}")
+            os.makedirs(dir_path, exist_ok=True)
+            with open(os.path.join(dir_path, f"f{i:05d}.bin"), 'wb') as fh:
+                fh.write(data)
+            total_bytes += size
+        
+        results = {'files': file_count, 'total_bytes': total_bytes}
+        t0 = time.perf_counter()
+        groups, bytes_read = _legacy_find_duplicates([root])
+        results['legacy'] = {'elapsed': round(time.perf_counter() - t0, 3), 'groups': len(groups),
+                             'bytes_read': bytes_read}
+        
+        for name, w in (('inline', 0), ('pool', workers)):
+            finder = DuplicateFinder(os.path.join(db_dir, f'{name}.sqlite3'), workers=w)
+            t0 = time.perf_counter()
+            finder.index([root])
+            first = None
+            for _ in finder.duplicates():
+                if first is None:
+                    first = time.perf_counter() - t0
+            results[name] = {'elapsed': round(time.perf_counter() - t0, 3),
+                             'first_group': round(first or 0, 3),
+                             'groups': finder.stats['groups'], 'bytes_read': finder.stats['bytes_read'],
+                             'full_hashed': finder.stats['full_hashed']}
+            finder.close()
+        for name in ('legacy', 'inline', 'pool'):
+            r = results[name]
+            print(f"{name:>7}: {r['elapsed']:.2f}s, {r['groups']} Gruppen, {format_bytes(r['bytes_read'])} gelesen")
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+# ========== SPEICHERBELEGUNG ==========
+
+class DirSizeIndex:
+    # Ordnergrößen (eigene Dateien + Summe des Teilbaums) in SQLite. Ein Ordner wird nur neu
+    # gelistet, wenn sich seine mtime geändert hat (Datei angelegt/gelöscht/umbenannt);
+    # unveränderte Teilbäume kosten einen stat() pro Ordner. Gewachsene Dateien ohne
+    # mtime-Änderung am Ordner fallen dabei erst beim nächsten Listing auf.
+    def __init__(self, db_path=None, workers=None):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'dir_sizes.sqlite3')
+        self.workers = workers or min(16, (os.cpu_count() or 2) * 2)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER NOT NULL,
+                own_size INTEGER NOT NULL, own_files INTEGER NOT NULL,
+                total_size INTEGER NOT NULL, total_files INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+        """)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def scan(self, root, token=None, progress_callback=None):
+        root = os.path.abspath(root)
+        result = {'dirs': 0, 'dirs_listed': 0, 'total_size': 0, 'elapsed': 0.0}
+        t0 = time.perf_counter()
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            known = {}
+            children = collections.defaultdict(list)
+            # Ist root Unterordner eines schon erfassten Laufwerks, behält er seinen Elternordner;
+            # sonst fiele er beim nächsten Scan des äußeren Ordners aus dessen Teilbaum heraus
+            root_parent = None
+            for row in self.conn.execute(
+                    "SELECT path, parent, mtime_ns, own_size, own_files, total_size, total_files FROM dirs "
+                    "WHERE path = ? OR substr(path, 1, ?) = ?", (root, len(prefix), prefix)):
+                known[row[0]] = row[2:]
+                if row[0] == root:
+                    root_parent = row[1]
+                elif row[1] is not None:
+                    children[row[1]].append(row[0])
+
+        # Paralleles Durchlaufen wie in TempCleanupEngine: gemeinsame Queue, begrenzter Thread-Pool
+        seen = {}
+        work = queue.Queue()
+        work.put((root, root_parent))
+        # Wie "du -x": andere Dateisysteme (Mounts, /proc) werden nicht mitgezählt
+        root_dev = os.stat(root).st_dev
+
+        def worker():
+            while True:
+                item = work.get()
+                if item is None:
+                    work.task_done()
+                    return
+                path, parent = item
+                try:
+                    if token is not None and token.cancelled:
+                        continue
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if st.st_dev != root_dev:
+                        continue
+                    mtime_ns = st.st_mtime_ns
+                    cached = known.get(path)
+                    if cached is not None and cached[0] == mtime_ns:
+                        seen[path] = (parent, mtime_ns, cached[1], cached[2], False)
+                        for child in children.get(path, ()):
+                            work.put((child, path))
+                        continue
+                    own_size = own_files = 0
+                    try:
+                        with os.scandir(path) as it:
+                            for entry in it:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        work.put((entry.path, path))
+                                    elif entry.is_file(follow_symlinks=False):
+                                        own_size += entry.stat(follow_symlinks=False).st_size
+                                        own_files += 1
+                                except OSError:
+                                    continue
+                    except OSError:
+                        pass
+                    seen[path] = (parent, mtime_ns, own_size, own_files, True)
+                    if progress_callback and len(seen) % 500 == 0:
+                        progress_callback(len(seen))
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+        if token is not None:
+            token.raise_if_cancelled()
+
+        # Summen von unten nach oben: tiefste Ordner zuerst
+        totals = {path: [info[2], info[3]] for path, info in seen.items()}
+        for path in sorted(seen, key=lambda p: p.count(os.sep), reverse=True):
+            parent = seen[path][0]
+            if parent in totals:
+                totals[parent][0] += totals[path][0]
+                totals[parent][1] += totals[path][1]
+
+        rows = []
+        for path, (parent, mtime_ns, own_size, own_files, listed) in seen.items():
+            total_size, total_files = totals[path]
+            cached = known.get(path)
+            if listed or cached is None or cached[3] != total_size or cached[4] != total_files:
+                rows.append((path, parent, mtime_ns, own_size, own_files, total_size, total_files))
+        vanished = [(path,) for path in known if path not in seen]
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self.conn.executemany("DELETE FROM dirs WHERE path = ?", vanished)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        result['dirs'] = len(seen)
+        result['dirs_listed'] = sum(1 for info in seen.values() if info[4])
+        result['total_size'] = totals.get(root, [0])[0]
+        result['elapsed'] = time.perf_counter() - t0
+        return result
+
+    def entry(self, path):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT own_size, own_files, total_size, total_files FROM dirs WHERE path = ?", (path,)).fetchone()
+
+    def children(self, path, limit=None):
+        # Unterordner absteigend nach Größe; die Dateien direkt im Ordner als eigener Eintrag (pfad None)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path, total_size, total_files FROM dirs WHERE parent = ? ORDER BY total_size DESC LIMIT ?",
+                (path, -1 if limit is None else limit)).fetchall()
+        own = self.entry(path)
+        if own and own[0]:
+            rows.append((None, own[0], own[1]))
+            rows.sort(key=lambda r: r[1], reverse=True)
+        return rows
+
+
+def squarify(items, x, y, w, h):
+    # Squarified-Treemap (Bruls et al.): items = [(wert, daten), ...] absteigend sortiert.
+    # Rückgabe [(x, y, w, h, daten), ...]; Zeilen werden so gefüllt, dass die Kacheln
+    # möglichst quadratisch bleiben.
+    items = [(value, data) for value, data in items if value > 0]
+    total = sum(value for value, _ in items)
+    if not items or w <= 0 or h <= 0:
+        return []
+    scale = w * h / total
+    areas = [(value * scale, data) for value, data in items]
+    rects = []
+
+    def worst(row_sum, row_min, row_max, side):
+        side2, sum2 = side * side, row_sum * row_sum
+        return max(side2 * row_max / sum2, sum2 / (side2 * row_min))
+
+    start = 0
+    while start < len(areas):
+        side = min(w, h)
+        end = start + 1
+        row_sum = row_min = row_max = areas[start][0]
+        current = worst(row_sum, row_min, row_max, side)
+        while end < len(areas):
+            area = areas[end][0]
+            candidate = worst(row_sum + area, min(row_min, area), max(row_max, area), side)
+            if candidate > current:
+                break
+            row_sum += area
+            row_min, row_max = min(row_min, area), max(row_max, area)
+            current = candidate
+            end += 1
+        # Zeile entlang der kürzeren Seite legen
+        if w >= h:
+            col_w = row_sum / h
+            cy = y
+            for area, data in areas[start:end]:
+                rects.append((x, cy, col_w, area / col_w, data))
+                cy += area / col_w
+            x, w = x + col_w, w - col_w
+        else:
+            row_h = row_sum / w
+            cx = x
+            for area, data in areas[start:end]:
+                rects.append((cx, y, area / row_h, row_h, data))
+                cx += area / row_h
+            y, h = y + row_h, h - row_h
+        start = end
+    return rects
+
+
+def _legacy_dir_sizes(root):
+    total = 0
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            try:
+                total += os.lstat(os.path.join(dirpath, file)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def bench_dir_sizes(file_count=200_000, base_dir=None, path=None):
+    # Mit path wird ein vorhandener Ordner nur gelesen, sonst ein synthetischer Baum angelegt
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    root = path or tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+    db_dir = tempfile.mkdtemp(prefix='uo_bench_db_', dir=base_dir)
+    try:
+        if path is None:
+            _create_synthetic_tree(root, file_count, files_per_dir=100)
+        results = {}
+        t0 = time.perf_counter()
+        total = _legacy_dir_sizes(root)
+        results['os.walk'] = {'elapsed': round(time.perf_counter() - t0, 3), 'total_size': total}
+        
+        index = DirSizeIndex(os.path.join(db_dir, 'dirs.sqlite3'))
+        runs = ['first_scan', 'rescan_unchanged']
+        if path is None:
+            runs.append('rescan_one_changed')
+        for name in runs:
+            if name == 'rescan_one_changed':
+                changed = os.path.join(root, 'd0000', 's000000')
+                with open(os.path.join(changed, 'neu.tmp'), 'wb') as fh:
+                    fh.write(b"x" * 4096)
+            r = index.scan(root)
+            results[name] = {k: (round(v, 3) if isinstance(v, float) else v) for k, v in r.items()}
+        index.close()
+        for name, r in results.items():
+            print(f"{name:>20}: {r['elapsed']:.3f}s ({format_bytes(r['total_size'])})")
+        return results
+    finally:
+        if path is None:
+            shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+# ========== JOB-SCHEDULER ==========
+
+class JobCancelled(BaseException):
+    # BaseException, damit die "except Exception"-Blöcke der Worker einen Abbruch nicht schlucken
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        self._event.set()
+    
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+    
+    def wait(self, timeout):
+        return self._event.wait(timeout)
+
+
+class Job:
+    QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+    
+    def __init__(self, job_id, name, func, mutating, scheduler):
+        self.id = job_id
+        self.name = name
+        self.func = func
+        self.mutating = mutating
+        self.token = CancelToken()
+        self.status = Job.QUEUED
+        self.progress = 0
+        self.progress_text = ""
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._scheduler = scheduler
+        self._done = threading.Event()
+    
+    @property
+    def is_finished(self):
+        return self._done.is_set()
+    
+    @property
+    def duration(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+    
+    def set_progress(self, value, text=""):
+        self.progress = value
+        if text:
+            self.progress_text = text
+        self._scheduler._notify_progress(self, value, text)
+    
+    def sleep(self, seconds):
+        # Abbrechbares sleep für Worker
+        if self.token.wait(seconds):
+            raise JobCancelled()
+    
+    def check_cancelled(self):
+        self.token.raise_if_cancelled()
+    
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+class JobScheduler:
+    # Zentrale Warteschlange für alle Aktionen. Lesende Jobs (Scans) dürfen parallel
+    # laufen, verändernde Jobs (Tweaks, Bereinigung) laufen exklusiv und in
+    # Einreihungs-Reihenfolge – ein wartender verändernder Job blockiert nachfolgende Scans.
+    def __init__(self, max_workers=4, on_progress=None, on_state=None, log=None):
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.on_state = on_state
+        self.log = log or (lambda message, level="INFO": None)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="uo-job")
+        self._lock = threading.Lock()
+        self._queue = collections.deque()
+        self._running = {}
+        self._ids = itertools.count(1)
+        self._closed = False
+    
+    def submit(self, name, func, mutating=True, unique=True):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scheduler wurde beendet")
+            if unique and any(j.name == name for j in itertools.chain(self._queue, self._running.values())):
+                return None
+            job = Job(next(self._ids), name, func, mutating, self)
+            self._queue.append(job)
+            runnable = self._take_runnable()
+        self._notify_state(job)
+        self._start(runnable)
+        return job
+    
+    def cancel(self, job):
+        with self._lock:
+            queued = job in self._queue
+            if queued:
+                self._queue.remove(job)
+        job.token.cancel()
+        if queued:
+            self._finish(job, Job.CANCELLED)
+    
+    def cancel_all(self):
+        with self._lock:
+            jobs = list(self._queue) + list(self._running.values())
+        for job in jobs:
+            self.cancel(job)
+    
+    def active_jobs(self):
+        with self._lock:
+            return list(self._running.values()) + list(self._queue)
+    
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._running or self._queue)
+    
+    def shutdown(self, wait=True, cancel=True):
+        if cancel:
+            self.cancel_all()
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait)
+    
+    def _take_runnable(self):
+        # Nur unter self._lock aufrufen
+        runnable = []
+        while self._queue and len(self._running) < self.max_workers:
+            job = self._queue[0]
+            if job.mutating:
+                if self._running:
+                    break
+            elif any(j.mutating for j in self._running.values()):
+                break
+            self._queue.popleft()
+            self._running[job.id] = job
+            runnable.append(job)
+            if job.mutating:
+                break
+        return runnable
+    
+    def _start(self, jobs):
+        for job in jobs:
+            try:
+                self._executor.submit(self._run, job)
+            except RuntimeError:
+                # Executor wurde zwischen Einreihen und Start beendet
+                with self._lock:
+                    self._running.pop(job.id, None)
+                job.token.cancel()
+                self._finish(job, Job.CANCELLED)
+    
+    def _run(self, job):
+        job.status = Job.RUNNING
+        job.started = time.time()
+        self._notify_state(job)
+        status = Job.DONE
+        try:
+            job.token.raise_if_cancelled()
+            job.result = job.func(job)
+        except JobCancelled:
+            status = Job.CANCELLED
+        except Exception as e:
+            job.error = e
+            status = Job.FAILED
+        
+        with self._lock:
+            self._running.pop(job.id, None)
+            if self._closed:
+                # Nach shutdown() startet nichts mehr; Wartende werden als abgebrochen beendet
+                dropped, runnable = list(self._queue), []
+                self._queue.clear()
+            else:
+                dropped, runnable = [], self._take_runnable()
+        self._finish(job, status)
+        for queued in dropped:
+            queued.token.cancel()
+            self._finish(queued, Job.CANCELLED)
+        self._start(runnable)
+    
+    def _finish(self, job, status):
+        job.status = status
+        job.finished = time.time()
+        job._done.set()
+        self._notify_state(job)
+    
+    def _notify_progress(self, job, value, text):
+        if self.on_progress:
+            self.on_progress(job, value, text)
+    
+    def _notify_state(self, job):
+        if self.on_state:
+            try:
+                self.on_state(job)
+            except Exception as e:
+                self.log(f"❌ Scheduler Callback Fehler: {e}", "ERROR")
+
+
+class CheckpointStore:
+    # Zwischenstände langer Jobs (JSON pro Name), überleben Abbruch, Absturz und Neustart
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'checkpoints.sqlite3')
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                name TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL
+            )
+        """)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def load(self, name):
+        with self._lock:
+            row = self.conn.execute("SELECT state FROM checkpoints WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, name, state):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO checkpoints (name, state, updated) VALUES (?, ?, ?)",
+                              (name, json.dumps(state), time.time()))
+
+    def clear(self, name):
+        with self._lock:
+            self.conn.execute("DELETE FROM checkpoints WHERE name = ?", (name,))
+
+    def pending(self):
+        with self._lock:
+            rows = self.conn.execute("SELECT name, state, updated FROM checkpoints ORDER BY updated").fetchall()
+        return {name: (json.loads(state), updated) for name, state, updated in rows}
+
+
+class Checkpointer:
+    # Ein Checkpoint pro Job-Name. update() schreibt höchstens alle interval Sekunden
+    # (force: sofort, z.B. beim Abbruch); overhead summiert die Zeit in den Schreibvorgängen.
+    def __init__(self, store, name, interval=2.0):
+        self.store = store
+        self.name = name
+        self.interval = interval
+        self.state = store.load(name)
+        self.resumed = self.state is not None
+        self.saves = 0
+        self.overhead = 0.0
+        self._last = time.perf_counter()
+
+    def update(self, state, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return False
+        self.store.save(self.name, state)
+        self.state = state
+        self._last = time.perf_counter()
+        self.overhead += self._last - now
+        self.saves += 1
+        return True
+
+    def finish(self):
+        self.store.clear(self.name)
+        self.state = None
+
+
+def bench_checkpoints(file_count=500_000, base_dir=None, interval=2.0):
+    # Verdrängung über den ganzen Index ohne Checkpoints, mit Checkpoints im Standardtakt und
+    # mit einem Checkpoint pro Seite; danach Abbruch nach der Hälfte und Fortsetzen ohne Scan
+    base_dir = base_dir or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    results = {}
+    for name, every in (('none', None), ('default', interval), ('every_page', 0.0), ('resume', interval)):
+        root = tempfile.mkdtemp(prefix='uo_bench_', dir=base_dir)
+        db_dir = tempfile.mkdtemp(prefix='uo_bench_db_', dir=base_dir)
+        try:
+            _create_synthetic_tree(root, file_count)
+            index = ScanIndex(os.path.join(db_dir, 'index.sqlite3'))
+            index.scan([(root, 'temp')])
+            store = CheckpointStore(os.path.join(db_dir, 'checkpoints.sqlite3'))
+            checkpoint = Checkpointer(store, 'bench', every) if every is not None else None
+            token = CancelToken()
+            interrupt = [file_count // 2] if name == 'resume' else [None]
+            
+            def save(stats, force):
+                if checkpoint is not None:
+                    checkpoint.update({'files_deleted': stats.files_deleted}, force)
+                if interrupt[0] is not None and stats.files_deleted >= interrupt[0]:
+                    interrupt[0] = None
+                    token.cancel()
+            
+            t0 = time.perf_counter()
+            stats = CleanupStats()
+            try:
+                EvictionPlanner(index, min_age=0).evict('temp', None, stats=stats, token=token, on_checkpoint=save)
+            except JobCancelled:
+                # "Neustart": frischer Checkpointer liest den Stand, der Index wird nicht neu gescannt
+                checkpoint = Checkpointer(store, 'bench', every)
+                stats = CleanupStats()
+                stats.add_batch(checkpoint.state['files_deleted'], 0, 0)
+                token = CancelToken()
+                EvictionPlanner(index, min_age=0).evict('temp', None, stats=stats, token=token, on_checkpoint=save)
+            elapsed = time.perf_counter() - t0
+            results[name] = {
+                'files_deleted': stats.files_deleted,
+                'elapsed': round(elapsed, 3),
+                'checkpoints': checkpoint.saves if checkpoint else 0,
+                'overhead_ms': round(checkpoint.overhead * 1000, 1) if checkpoint else 0.0,
+                'overhead_pct': round(100 * checkpoint.overhead / elapsed, 2) if checkpoint else 0.0,
+            }
+            print(f"{name:>10}: {stats.files_deleted} Dateien in {elapsed:.2f}s, "
+                  f"{results[name]['checkpoints']} Checkpoints ({results[name]['overhead_pct']}%)")
+            store.close()
+            index.close()
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.rmtree(db_dir, ignore_errors=True)
+    return results
+
+
+# ========== SHELL-SESSIONS ==========
+
+class ShellResult:
+    def __init__(self, exit_code, output, duration, timed_out=False):
+        self.exit_code = exit_code
+        self.output = output
+        self.duration = duration
+        self.timed_out = timed_out
+    
+    @property
+    def ok(self):
+        return self.exit_code == 0 and not self.timed_out
+    
+    def __repr__(self):
+        return f"ShellResult(exit_code={self.exit_code}, timed_out={self.timed_out}, duration={self.duration:.3f})"
+
+
+class PowerShellDialect:
+    # Jedes Skript geht Base64-kodiert als eine einzige Zeile über stdin, weil
+    # "powershell -Command -" mehrzeilige Blöcke sonst zeilenweise auswertet.
+    name = "powershell"
+    argv = ['powershell', '-NoLogo', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-Command', '-']
+    
+    def wrap(self, script, marker):
+        encoded = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        return (
+            "$global:LASTEXITCODE = 0; $__uo_ok = $true; "
+            "try { & ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('"
+            + encoded +
+            "')))) *>&1 | Out-String -Stream } catch { $__uo_ok = $false; $_ | Out-String -Stream }; "
+            "$__uo_rc = if (-not $__uo_ok) { 1 } elseif ($LASTEXITCODE) { $LASTEXITCODE } else { 0 }; "
+            f"[Console]::Out.WriteLine('{marker} ' + $__uo_rc)\n"
+        )
+    
+    def oneshot_argv(self, script):
+        return ['powershell', '-NoLogo', '-NoProfile', '-NonInteractive', '-Command', script]
+
+
+class BashDialect:
+    # Stand-in für Linux (Tests/Benchmarks): gleiches Sentinel-Protokoll über bash -s
+    name = "bash"
+    argv = ['bash', '--noprofile', '--norc', '-s']
+    
+    def wrap(self, script, marker):
+        quoted = "'" + script.replace("'", "'\\''") + "'"
+        return f"( eval {quoted} ) </dev/null 2>&1; echo \"{marker} $?\"\n"
+    
+    def oneshot_argv(self, script):
+        return ['bash', '--noprofile', '--norc', '-c', script]
+
+
+def default_shell_dialect():
+    return PowerShellDialect() if sys.platform == 'win32' else BashDialect()
+
+
+class ShellSession:
+    # Eine langlebige Shell. Ausgabe wird von einem Reader-Thread zeilenweise in eine
+    # Queue geschoben; das Ende eines Skripts markiert eine eindeutige Sentinel-Zeile.
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.proc = None
+        self._lines = None
+        self.scripts_run = 0
+        self.start()
+    
+    def start(self):
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        else:
+            # Eigene Prozessgruppe, damit beim Timeout auch Kindprozesse sterben
+            kwargs['start_new_session'] = True
+        self.proc = subprocess.Popen(
+            self.dialect.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding='utf-8', errors='replace', bufsize=1, **kwargs)
+        self._lines = queue.SimpleQueue()
+        threading.Thread(target=self._read, args=(self.proc.stdout, self._lines), daemon=True).start()
+    
+    @staticmethod
+    def _read(stream, lines):
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+        lines.put(None)
+    
+    @property
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+    
+    def run(self, script, timeout=60, token=None):
+        marker = f"__UO_DONE_{uuid.uuid4().hex}__"
+        started = time.perf_counter()
+        deadline = started + timeout
+        try:
+            self.proc.stdin.write(self.dialect.wrap(script, marker))
+            self.proc.stdin.flush()
+        except (OSError, ValueError):
+            self.restart()
+            return ShellResult(-1, "Shell-Session beendet", time.perf_counter() - started)
+        
+        output = []
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self.restart()
+                return ShellResult(None, "".join(output), time.perf_counter() - started, timed_out=True)
+            if token is not None and token.cancelled:
+                self.restart()
+                raise JobCancelled()
+            try:
+                line = self._lines.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            if line is None:
+                self.restart()
+                return ShellResult(-1, "".join(output), time.perf_counter() - started)
+            if line.startswith(marker):
+                self.scripts_run += 1
+                try:
+                    code = int(line[len(marker):].strip() or 0)
+                except ValueError:
+                    code = -1
+                return ShellResult(code, "".join(output), time.perf_counter() - started)
+            output.append(line)
+    
+    def restart(self):
+        self.close()
+        self.start()
+    
+    def close(self):
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            if proc.poll() is None:
+                self._kill_tree(proc)
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        # stdout schließt der Reader-Thread bei EOF selbst; close() hier würde blockieren,
+        # solange ein Kindprozess die Pipe noch offen hält
+    
+    @staticmethod
+    def _kill_tree(proc):
+        if sys.platform == 'win32':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True,
+                           creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        else:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                proc.kill()
+
+
+class ShellSessionPool:
+    # Hält bis zu `size` Shells warm, statt pro Tweak einen neuen Interpreter zu starten.
+    # Abgestürzte oder hängende Sessions werden automatisch neu gestartet.
+    def __init__(self, dialect=None, size=2, default_timeout=60):
+        self.dialect = dialect or default_shell_dialect()
+        self.size = size
+        self.default_timeout = default_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def run(self, script, timeout=None, token=None):
+        with self._slots:
+            session = self._acquire()
+            try:
+                return session.run(script, timeout or self.default_timeout, token)
+            finally:
+                self._release(session)
+    
+    def _acquire(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Shell-Pool wurde geschlossen")
+            while self._idle:
+                session = self._idle.pop()
+                if session.alive:
+                    return session
+                session.close()
+        return ShellSession(self.dialect)
+    
+    def _release(self, session):
+        with self._lock:
+            if self._closed or not session.alive:
+                session.close()
+            else:
+                self._idle.append(session)
+    
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+
+def bench_shell_pool(count=50, dialect=None):
+    dialect = dialect or default_shell_dialect()
+    script = "echo ok" if dialect.name == "bash" else "Write-Output 'ok'"
+    results = {}
+    
+    t0 = time.perf_counter()
+    for _ in range(count):
+        subprocess.run(dialect.oneshot_argv(script), capture_output=True, timeout=60)
+    spawn = time.perf_counter() - t0
+    results['spawn_per_script'] = {'scripts': count, 'elapsed': round(spawn, 3),
+                                   'ms_per_script': round(spawn * 1000 / count, 2)}
+    
+    pool = ShellSessionPool(dialect, size=1)
+    failed = 0
+    t0 = time.perf_counter()
+    for _ in range(count):
+        result = pool.run(script)
+        if not (result.ok and result.output.strip() == "ok"):
+            failed += 1
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    results['session_pool'] = {'scripts': count, 'elapsed': round(elapsed, 3), 'failed': failed,
+                               'ms_per_script': round(elapsed * 1000 / count, 2)}
+    
+    for name, r in results.items():
+        print(f"{name:>16}: {r['ms_per_script']:.2f} ms/Skript ({dialect.name})")
+    return results
+
+
+# ========== REGISTRY ==========
+
+REG_KINDS = ('DWORD', 'QWORD', 'SZ', 'EXPAND_SZ', 'MULTI_SZ', 'BINARY')
+
+
+class RegistryChange:
+    __slots__ = ('hive', 'key', 'name', 'value', 'kind')
+    
+    def __init__(self, hive, key, name, value, kind='DWORD'):
+        if kind not in REG_KINDS:
+            raise ValueError(f"Unbekannter Registry-Typ: {kind}")
+        self.hive = hive.upper().rstrip(':')
+        self.key = key.strip('\\')
+        self.name = name
+        self.value = value
+        self.kind = kind
+    
+    @property
+    def path(self):
+        return f"{self.hive}\\{self.key}\\{self.name}"
+    
+    def __repr__(self):
+        return f"RegistryChange({self.path}={self.value!r} [{self.kind}])"
+
+
+class RegistryDiff:
+    __slots__ = ('change', 'old_value', 'old_kind', 'status', 'error')
+    
+    CREATED, CHANGED, DELETED, UNCHANGED, FAILED = "created", "changed", "deleted", "unchanged", "failed"
+    
+    def __init__(self, change, old_value, old_kind, status, error=None):
+        self.change = change
+        self.old_value = old_value
+        self.old_kind = old_kind
+        self.status = status
+        self.error = error
+    
+    @property
+    def written(self):
+        return self.status in (RegistryDiff.CREATED, RegistryDiff.CHANGED, RegistryDiff.DELETED)
+    
+    def __repr__(self):
+        return f"RegistryDiff({self.change.path}: {self.old_value!r} -> {self.change.value!r}, {self.status})"
+
+
+class RegistryBackend:
+    # Schnittstelle: open_key liefert ein Handle mit get/set/delete/values/close.
+    # get() gibt (wert, typ) oder None zurück, wenn der Wert nicht existiert;
+    # values() listet alle Werte des Schlüssels als (name, wert, typ).
+    def open_key(self, hive, key, write=False):
+        raise NotImplementedError
+
+
+class WinRegBackend(RegistryBackend):
+    def __init__(self):
+        try:
+            import winreg
+        except ImportError:
+            raise OSError("Registry-Zugriff (winreg) ist nur unter Windows verfügbar")
+        self.winreg = winreg
+        self.hives = {
+            'HKLM': winreg.HKEY_LOCAL_MACHINE, 'HKCU': winreg.HKEY_CURRENT_USER,
+            'HKCR': winreg.HKEY_CLASSES_ROOT, 'HKU': winreg.HKEY_USERS,
+        }
+        self.kinds = {
+            'DWORD': winreg.REG_DWORD, 'QWORD': winreg.REG_QWORD, 'SZ': winreg.REG_SZ,
+            'EXPAND_SZ': winreg.REG_EXPAND_SZ, 'MULTI_SZ': winreg.REG_MULTI_SZ, 'BINARY': winreg.REG_BINARY,
+        }
+        self.kind_names = {v: k for k, v in self.kinds.items()}
+    
+    def open_key(self, hive, key, write=False):
+        winreg = self.winreg
+        if write:
+            handle = winreg.CreateKeyEx(self.hives[hive], key, 0, winreg.KEY_READ | winreg.KEY_SET_VALUE)
+        else:
+            try:
+                handle = winreg.OpenKey(self.hives[hive], key, 0, winreg.KEY_READ)
+            except FileNotFoundError:
+                return _MissingKeyHandle()
+        return _WinRegHandle(self, handle)
+
+
+class _WinRegHandle:
+    def __init__(self, backend, handle):
+        self.backend = backend
+        self.handle = handle
+    
+    def get(self, name):
+        try:
+            value, kind = self.backend.winreg.QueryValueEx(self.handle, name)
+        except FileNotFoundError:
+            return None
+        return value, self.backend.kind_names.get(kind, str(kind))
+    
+    def set(self, name, value, kind):
+        self.backend.winreg.SetValueEx(self.handle, name, 0, self.backend.kinds[kind], value)
+    
+    def delete(self, name):
+        try:
+            self.backend.winreg.DeleteValue(self.handle, name)
+        except FileNotFoundError:
+            pass
+    
+    def values(self):
+        result = []
+        for i in itertools.count():
+            try:
+                name, value, kind = self.backend.winreg.EnumValue(self.handle, i)
+            except OSError:
+                return result
+            result.append((name, value, self.backend.kind_names.get(kind, str(kind))))
+    
+    def close(self):
+        self.handle.Close()
+
+
+class _MissingKeyHandle:
+    def get(self, name):
+        return None
+    
+    def values(self):
+        return []
+    
+    def close(self):
+        pass
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    # In-Memory-Fake für Tests und Benchmarks unter Linux; Schlüssel case-insensitive wie Windows
+    def __init__(self, values=None):
+        self.values = {}
+        self.reads = 0
+        self.writes = 0
+        self.opens = 0
+        self._lock = threading.Lock()
+        for path, (value, kind) in (values or {}).items():
+            hive, rest = path.split('\\', 1)
+            key, name = rest.rsplit('\\', 1)
+            self.values[self._id(hive, key, name)] = (value, kind)
+    
+    @staticmethod
+    def _id(hive, key, name):
+        return (hive.upper(), key.lower(), name.lower())
+    
+    def open_key(self, hive, key, write=False):
+        with self._lock:
+            self.opens += 1
+        return _MemoryHandle(self, hive, key)
+    
+    def get(self, hive, key, name):
+        with self._lock:
+            self.reads += 1
+            return self.values.get(self._id(hive, key, name))
+
+
+class _MemoryHandle:
+    def __init__(self, backend, hive, key):
+        self.backend = backend
+        self.hive = hive
+        self.key = key
+    
+    def get(self, name):
+        return self.backend.get(self.hive, self.key, name)
+    
+    def set(self, name, value, kind):
+        with self.backend._lock:
+            self.backend.writes += 1
+            self.backend.values[self.backend._id(self.hive, self.key, name)] = (value, kind)
+    
+    def delete(self, name):
+        with self.backend._lock:
+            self.backend.writes += 1
+            self.backend.values.pop(self.backend._id(self.hive, self.key, name), None)
+    
+    def values(self):
+        # Namen liegen nur kleingeschrieben vor
+        hive, key = self.hive.upper(), self.key.lower()
+        with self.backend._lock:
+            return [(name, value, kind) for (h, k, name), (value, kind) in self.backend.values.items()
+                    if h == hive and k == key]
+    
+    def close(self):
+        pass
+
+
+def default_registry_backend():
+    return WinRegBackend()
+
+
+class RegistryWriter:
+    # Schreibt einen ganzen Stapel Werte im eigenen Prozess: jeder Schlüssel wird nur einmal
+    # geöffnet, Werte mit identischem Inhalt werden übersprungen, Ergebnis ist ein Diff pro Wert.
+    # value=None löscht den Wert. Mit Journal landen die alten Werte vor dem Schreiben im Journal.
+    def __init__(self, backend=None, journal=None):
+        self.backend = backend or default_registry_backend()
+        self.journal = journal
+        self.listeners = []
+    
+    def read_many(self, changes):
+        result = {}
+        for (hive, key), group in self._group(changes).items():
+            handle = self.backend.open_key(hive, key, write=False)
+            try:
+                for change in group:
+                    result[change.path] = handle.get(change.name)
+            finally:
+                handle.close()
+        return result
+    
+    def apply_batch(self, changes, dry_run=False, record=True):
+        if self.journal is not None and record and not dry_run:
+            self._record(changes)
+        diffs = []
+        for (hive, key), group in self._group(changes).items():
+            try:
+                handle = self.backend.open_key(hive, key, write=not dry_run)
+            except OSError as e:
+                diffs.extend(RegistryDiff(c, None, None, RegistryDiff.FAILED, e) for c in group)
+                continue
+            try:
+                for change in group:
+                    current = handle.get(change.name)
+                    if _registry_unchanged(current, change):
+                        old_value, old_kind = current if current is not None else (None, None)
+                        diffs.append(RegistryDiff(change, old_value, old_kind, RegistryDiff.UNCHANGED))
+                        continue
+                    if change.value is None:
+                        status = RegistryDiff.DELETED
+                    else:
+                        status = RegistryDiff.CREATED if current is None else RegistryDiff.CHANGED
+                    old_value, old_kind = current if current is not None else (None, None)
+                    try:
+                        if not dry_run and change.value is None:
+                            handle.delete(change.name)
+                        elif not dry_run:
+                            handle.set(change.name, change.value, change.kind)
+                        diffs.append(RegistryDiff(change, old_value, old_kind, status))
+                    except OSError as e:
+                        diffs.append(RegistryDiff(change, old_value, old_kind, RegistryDiff.FAILED, e))
+            finally:
+                handle.close()
+        
+        if not dry_run:
+            written = [d for d in diffs if d.written]
+            for listener in self.listeners:
+                listener(written)
+        return diffs
+    
+    def _record(self, changes):
+        # Write-Ahead: alte Werte aller tatsächlich betroffenen Einträge mit einem fsync sichern
+        current = self.read_many(changes)
+        for change in changes:
+            old = current.get(change.path)
+            if _registry_unchanged(old, change):
+                continue
+            self.journal.record('registry', change.path, old[0] if old else None, change.value,
+                                old_type=old[1] if old else None, type=change.kind)
+        self.journal.commit()
+    
+    @staticmethod
+    def _group(changes):
+        groups = {}
+        for change in changes:
+            groups.setdefault((change.hive, change.key.lower()), []).append(change)
+        # Original-Schreibweise des Schlüssels für open_key verwenden
+        return {(hive, group[0].key): group for (hive, _), group in groups.items()}
+
+
+def _registry_unchanged(current, change):
+    if change.value is None:
+        return current is None
+    return current is not None and current[1] == change.kind and current[0] == change.value
+
+
+def bench_registry_batch(count=10_000):
+    changes = [RegistryChange('HKLM', f"SOFTWARE\\UltimateOptimizer\\Bench\\K{i // 50}", f"V{i}", i)
+               for i in range(count)]
+    backend = MemoryRegistryBackend()
+    writer = RegistryWriter(backend)
+    results = {}
+    for name in ('first_apply', 'reapply_unchanged'):
+        opens, writes = backend.opens, backend.writes
+        t0 = time.perf_counter()
+        diffs = writer.apply_batch(changes)
+        elapsed = time.perf_counter() - t0
+        results[name] = {
+            'values': count,
+            'written': sum(1 for d in diffs if d.written),
+            'keys_opened': backend.opens - opens,
+            'backend_writes': backend.writes - writes,
+            'elapsed': round(elapsed, 4),
+            'us_per_value': round(elapsed * 1e6 / count, 2),
+        }
+        print(f"{name:>18}: {results[name]['written']} geschrieben, {results[name]['keys_opened']} Schlüssel geöffnet, "
+              f"{results[name]['us_per_value']} µs/Wert")
+    return results
+
+
+# ========== TWEAK-KATALOG ==========
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tweak_catalog.json')
+TWEAK_KINDS = ('registry', 'powercfg', 'netsh', 'service', 'command', 'action')
+SHELL_KINDS = ('powercfg', 'netsh', 'service', 'command')
+
+
+class Tweak:
+    __slots__ = ('id', 'label', 'category', 'kind', 'target', 'value', 'type', 'scope', 'depends')
+    
+    def __init__(self, tweak_id, spec):
+        self.id = tweak_id
+        self.label = spec.get('label', tweak_id)
+        self.category = spec.get('category', 'system')
+        self.kind = spec['kind']
+        self.target = spec['target']
+        self.value = spec.get('value')
+        self.type = spec.get('type', 'DWORD')
+        self.scope = spec.get('scope', 'ac')
+        self.depends = tuple(spec.get('depends', ()))
+        if self.kind not in TWEAK_KINDS:
+            raise ValueError(f"Tweak {tweak_id}: unbekannter Typ '{self.kind}'")
+    
+    @property
+    def state_key(self):
+        # Zwei Tweaks mit gleichem state_key verändern dieselbe Einstellung
+        if self.kind == 'registry':
+            return ('registry', self.target.lower())
+        if self.kind == 'powercfg':
+            return ('powercfg', self.scope, self.target.upper())
+        if self.kind in ('netsh', 'service'):
+            return (self.kind, self.target.lower())
+        return (self.kind, self.id)
+    
+    def registry_change(self):
+        hive, rest = self.target.split('\\', 1)
+        key, name = rest.rsplit('\\', 1)
+        return RegistryChange(hive, key, name, self.value, self.type)
+    
+    def shell_script(self):
+        if self.kind == 'powercfg':
+            return f"powercfg /set{self.scope}valueindex {self.target} {self.value}"
+        if self.kind == 'netsh':
+            return f"netsh int tcp set global {self.target}={self.value}"
+        if self.kind == 'service':
+            stop = f"Stop-Service -Name '{self.target}' -Force -ErrorAction SilentlyContinue; " if self.value == 'Disabled' else ""
+            return stop + f"Set-Service -Name '{self.target}' -StartupType {self.value} -ErrorAction Stop"
+        if self.kind == 'command':
+            return self.target
+        raise ValueError(f"Tweak {self.id} ({self.kind}) ist kein Shell-Tweak")
+    
+    def __repr__(self):
+        return f"Tweak({self.id})"
+
+
+class TweakCatalog:
+    def __init__(self, tweaks, profiles):
+        self.tweaks = tweaks
+        self.profiles = profiles
+        self._validate()
+    
+    @classmethod
+    def load(cls, path=None):
+        with open(path or CATALOG_PATH, encoding='utf-8') as fh:
+            data = json.load(fh)
+        tweaks = {tid: Tweak(tid, spec) for tid, spec in data.get('tweaks', {}).items()}
+        return cls(tweaks, data.get('profiles', {}))
+    
+    def _validate(self):
+        for tweak in self.tweaks.values():
+            for dep in tweak.depends:
+                if dep not in self.tweaks:
+                    raise ValueError(f"Tweak {tweak.id}: unbekannte Abhängigkeit '{dep}'")
+        for name in self.profiles:
+            self.expand_profile(name)
+    
+    def profile_label(self, name):
+        return self.profiles[name].get('label', name)
+    
+    def expand_profile(self, name, _stack=()):
+        # "@profil" bindet ein anderes Profil ein
+        if name not in self.profiles:
+            raise KeyError(f"Unbekanntes Profil: {name}")
+        if name in _stack:
+            raise ValueError(f"Profil-Zyklus: {' -> '.join(_stack + (name,))}")
+        result = []
+        for item in self.profiles[name].get('tweaks', []):
+            if item.startswith('@'):
+                result.extend(self.expand_profile(item[1:], _stack + (name,)))
+            elif item in self.tweaks:
+                result.append(item)
+            else:
+                raise ValueError(f"Profil {name}: unbekannter Tweak '{item}'")
+        return result
+
+
+class ExecutionPlan:
+    def __init__(self, profile, label, stages, skipped):
+        self.profile = profile
+        self.label = label
+        self.stages = stages
+        self.skipped = skipped
+    
+    @property
+    def steps(self):
+        return [tweak for stage in self.stages for tweak in stage]
+    
+    @property
+    def empty(self):
+        return not self.stages
+    
+    def describe(self):
+        lines = [f"Plan '{self.label}': {len(self.steps)} Schritte in {len(self.stages)} Stufen, "
+                 f"{len(self.skipped)} bereits angewendet"]
+        for i, stage in enumerate(self.stages, 1):
+            lines.append(f"  Stufe {i}: " + ", ".join(t.id for t in stage))
+        return "\n".join(lines)
+
+
+class TweakPlanner:
+    # Kompiliert ein Profil zu einem minimalen Ausführungsplan: Profile und Abhängigkeiten
+    # auflösen, doppelte Tweaks entfernen, bereits angewendete Tweaks weglassen und in
+    # Stufen gruppieren, deren Schritte unabhängig voneinander (parallel) laufen können.
+    def __init__(self, catalog, probe=None):
+        self.catalog = catalog
+        self.probe = probe
+    
+    def compile(self, profile):
+        tweaks = self.catalog.tweaks
+        selected = []
+        seen = set()
+        
+        def add(tid, stack=()):
+            if tid in stack:
+                raise ValueError(f"Abhängigkeits-Zyklus: {' -> '.join(stack + (tid,))}")
+            if tid in seen:
+                return
+            for dep in tweaks[tid].depends:
+                add(dep, stack + (tid,))
+            seen.add(tid)
+            selected.append(tid)
+        
+        for tid in self.catalog.expand_profile(profile):
+            add(tid)
+        
+        # Dieselbe Einstellung mit gleichem Wert unter anderer id nur einmal ausführen
+        # (Abhängigkeiten zeigen dann auf den behaltenen Tweak), unterschiedliche Werte sind ein Konflikt
+        by_state = {}
+        alias = {}
+        for tid in selected:
+            tweak = tweaks[tid]
+            other = by_state.setdefault(tweak.state_key, tweak)
+            if other is tweak:
+                continue
+            if other.value != tweak.value:
+                raise ValueError(f"Konflikt: {other.id} und {tid} setzen {tweak.target} unterschiedlich")
+            alias[tid] = other.id
+        selected = [tid for tid in selected if tid not in alias]
+        
+        applied = set(self.probe([tweaks[tid] for tid in selected])) if self.probe else set()
+        remaining = [tid for tid in selected if tid not in applied]
+        
+        # Stufen nach Abhängigkeitstiefe (nur Abhängigkeiten, die selbst noch laufen)
+        level = {}
+        for tid in remaining:
+            deps = [level[alias.get(d, d)] for d in tweaks[tid].depends if alias.get(d, d) in level]
+            level[tid] = (max(deps) + 1) if deps else 0
+        stages = [[] for _ in range(max(level.values()) + 1)] if level else []
+        for tid in remaining:
+            stages[level[tid]].append(tweaks[tid])
+        
+        skipped = [tweaks[tid] for tid in selected if tid in applied]
+        return ExecutionPlan(profile, self.catalog.profile_label(profile), stages, skipped)
+
+
+class PlanExecutor:
+    # Führt einen Plan stufenweise aus. Pro Stufe gehen alle Registry-Tweaks in einem
+    # Batch raus, Shell-Tweaks und Aktionen laufen parallel. before_stage(stage) läuft vor
+    # jeder Stufe (z.B. um die alten Werte ins Journal zu schreiben).
+    def __init__(self, apply_registry, run_shell, run_action, max_parallel=3, before_stage=None):
+        self.apply_registry = apply_registry
+        self.run_shell = run_shell
+        self.run_action = run_action
+        self.max_parallel = max_parallel
+        self.before_stage = before_stage
+    
+    def execute(self, plan, job=None, progress=None):
+        results = []
+        total = max(len(plan.steps), 1)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="uo-plan") as pool:
+            for stage in plan.stages:
+                if job is not None:
+                    job.check_cancelled()
+                if self.before_stage:
+                    self.before_stage(stage)
+                units = []
+                registry = [t for t in stage if t.kind == 'registry']
+                if registry:
+                    units.append(pool.submit(self._run_registry, registry))
+                for tweak in stage:
+                    if tweak.kind in SHELL_KINDS:
+                        units.append(pool.submit(self._run_shell, tweak, job))
+                    elif tweak.kind == 'action':
+                        units.append(pool.submit(self._run_action, tweak, job))
+                for unit in units:
+                    stage_results = unit.result()
+                    results.extend(stage_results)
+                    done += len(stage_results)
+                    if progress:
+                        progress(int(done * 100 / total), stage_results[-1][0].label)
+        return results
+    
+    def _run_registry(self, tweaks):
+        try:
+            diffs = self.apply_registry([t.registry_change() for t in tweaks])
+        except Exception as e:
+            return [(t, False, str(e)) for t in tweaks]
+        return [(t, d.status != RegistryDiff.FAILED, d.status if d.error is None else str(d.error))
+                for t, d in zip(tweaks, _diffs_in_order(tweaks, diffs))]
+    
+    def _run_shell(self, tweak, job):
+        try:
+            result = self.run_shell(tweak.shell_script(), job)
+        except Exception as e:
+            return [(tweak, False, str(e))]
+        detail = "Timeout" if result.timed_out else f"Exit-Code {result.exit_code}"
+        return [(tweak, result.ok, detail)]
+    
+    def _run_action(self, tweak, job):
+        # JobCancelled ist eine BaseException und bricht weiterhin den ganzen Plan ab
+        try:
+            self.run_action(tweak.target, job)
+        except Exception as e:
+            return [(tweak, False, str(e))]
+        return [(tweak, True, "ausgeführt")]
+
+
+def _diffs_in_order(tweaks, diffs):
+    # apply_batch gruppiert nach Schlüssel; Diffs wieder der Tweak-Reihenfolge zuordnen
+    by_path = {d.change.path.lower(): d for d in diffs}
+    return [by_path[t.registry_change().path.lower()] for t in tweaks]
+
+
+# ========== SYSTEM-ZUSTAND ==========
+
+_MISSING = object()
+
+
+class StateProber:
+    # Liest die aktuellen Werte hinter den Tweaks (Registry, Dienst-Starttyp, powercfg,
+    # TCP-Globals) gebündelt ein und cached sie mit Zeitstempel. Eigene Schreibzugriffe
+    # aktualisieren bzw. invalidieren den Cache, damit keine veralteten Werte geliefert werden.
+    def __init__(self, read_registry, run_shell, ttl=300):
+        self.read_registry = read_registry
+        self.run_shell = run_shell
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.probes = 0
+    
+    def snapshot(self, tweaks, force=False):
+        now = time.time()
+        with self._lock:
+            if force:
+                for tweak in tweaks:
+                    self._cache.pop(tweak.state_key, None)
+            missing = [t for t in tweaks if t.kind != 'command' and t.kind != 'action'
+                       and (t.state_key not in self._cache or now - self._cache[t.state_key][1] > self.ttl)]
+        
+        if missing:
+            found = {}
+            registry = [t for t in missing if t.kind == 'registry']
+            shell = [t for t in missing if t.kind in ('service', 'powercfg', 'netsh')]
+            if registry:
+                found.update(self._probe_registry(registry))
+            if shell:
+                found.update(self._probe_shell(shell))
+            with self._lock:
+                self.probes += 1
+                for key, value in found.items():
+                    self._cache[key] = (value, now)
+        
+        with self._lock:
+            return {t.state_key: self._cache[t.state_key][0] for t in tweaks if t.state_key in self._cache}
+    
+    def applied(self, tweaks):
+        current = self.snapshot(tweaks)
+        return {t.id for t in tweaks if t.state_key in current and self._matches(t, current[t.state_key])}
+    
+    def invalidate(self, keys=None):
+        with self._lock:
+            if keys is None:
+                self._cache.clear()
+            else:
+                for key in keys:
+                    self._cache.pop(key, None)
+    
+    def record_registry_writes(self, diffs):
+        # Listener für RegistryWriter: wir wissen genau, was geschrieben wurde
+        now = time.time()
+        with self._lock:
+            for diff in diffs:
+                if not diff.written:
+                    continue
+                key = ('registry', diff.change.path.lower())
+                if diff.status == RegistryDiff.DELETED:
+                    self._cache[key] = (_MISSING, now)
+                else:
+                    self._cache[key] = ((diff.change.value, diff.change.kind), now)
+    
+    @staticmethod
+    def _matches(tweak, current):
+        if current is _MISSING or current is None:
+            return False
+        if tweak.kind == 'registry':
+            return current == (tweak.value, tweak.type)
+        if tweak.kind == 'powercfg':
+            return current == tweak.value
+        return str(current).lower() == str(tweak.value).lower()
+    
+    def _probe_registry(self, tweaks):
+        try:
+            values = self.read_registry([t.registry_change() for t in tweaks])
+        except Exception:
+            return {}
+        result = {}
+        for tweak in tweaks:
+            value = values.get(tweak.registry_change().path, _MISSING)
+            result[tweak.state_key] = _MISSING if value is None else value
+        return result
+    
+    def _probe_shell(self, tweaks):
+        services = sorted({t.target for t in tweaks if t.kind == 'service'})
+        powercfg = sorted({t.target for t in tweaks if t.kind == 'powercfg'})
+        netsh = sorted({t.target.lower() for t in tweaks if t.kind == 'netsh'})
+        
+        def ps_list(items):
+            return "@(" + ", ".join("'" + i.replace("'", "''") + "'" for i in items) + ")"
+        
+        # Ein einziges Skript für alle Werte, Ausgabe als eine JSON-Zeile
+        script = "$r = @{ service = @{}; powercfg = @{}; netsh = @{} }\n"
+        if services:
+            script += (f"foreach ($n in {ps_list(services)}) {{ $s = Get-Service -Name $n -ErrorAction SilentlyContinue; "
+                       "if ($s) { $r.service[$n] = [string]$s.StartType } }\n")
+        if powercfg:
+            script += (f"foreach ($t in {ps_list(powercfg)}) {{ $o = (& powercfg /q $t.Split(' ')) -join \"`n\"; "
+                       "$h = [regex]::Matches($o, '0x[0-9a-fA-F]{8}'); "
+                       "if ($h.Count -ge 2) { $r.powercfg[$t] = @([Convert]::ToInt32($h[$h.Count-2].Value, 16), "
+                       "[Convert]::ToInt32($h[$h.Count-1].Value, 16)) } }\n")
+        if 'autotuninglevel' in netsh:
+            script += "try { $r.netsh['autotuninglevel'] = [string](Get-NetTCPSetting -SettingName Internet).AutoTuningLevelLocal } catch {}\n"
+        if 'chimney' in netsh:
+            script += "try { $r.netsh['chimney'] = [string](Get-NetOffloadGlobalSetting).Chimney } catch {}\n"
+        script += "Write-Output ($r | ConvertTo-Json -Compress -Depth 4)"
+        
+        try:
+            result = self.run_shell(script)
+            line = next((l for l in result.output.splitlines() if l.startswith('{')), None)
+            data = json.loads(line) if line else {}
+        except Exception:
+            return {}
+        
+        found = {}
+        for tweak in tweaks:
+            if tweak.kind == 'service':
+                found[tweak.state_key] = data.get('service', {}).get(tweak.target, _MISSING)
+            elif tweak.kind == 'powercfg':
+                values = data.get('powercfg', {}).get(tweak.target)
+                found[tweak.state_key] = values[0 if tweak.scope == 'ac' else 1] if values else _MISSING
+            elif tweak.kind == 'netsh':
+                found[tweak.state_key] = data.get('netsh', {}).get(tweak.target.lower(), _MISSING)
+        return found
+
+
+# ========== ÄNDERUNGS-JOURNAL ==========
+
+JOURNAL_REVERSIBLE = ('registry', 'service', 'powercfg', 'netsh', 'task')
+
+
+def _journal_encode(value):
+    # REG_BINARY-Werte als Hex, JSON kennt keine Bytes
+    return {'hex': value.hex()} if isinstance(value, (bytes, bytearray)) else value
+
+
+def _journal_decode(value):
+    return bytes.fromhex(value['hex']) if isinstance(value, dict) and 'hex' in value else value
+
+
+class FileJournalBackend:
+    # Append-only Datei mit einer JSON-Zeile pro Eintrag; sync() = flush + fsync
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, 'a', encoding='utf-8')
+    
+    def read(self):
+        with open(self.path, encoding='utf-8') as fh:
+            return fh.read().splitlines()
+    
+    def append(self, line):
+        self._fh.write(line + "\n")
+    
+    def sync(self):
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+    
+    def close(self):
+        self._fh.close()
+
+
+class MemoryJournalBackend:
+    # Fake ohne Dateisystem für Tests und Benchmarks
+    def __init__(self):
+        self.lines = []
+        self.syncs = 0
+    
+    def read(self):
+        return list(self.lines)
+    
+    def append(self, line):
+        self.lines.append(line)
+    
+    def sync(self):
+        self.syncs += 1
+    
+    def close(self):
+        pass
+
+
+class ChangeJournal:
+    # Protokolliert jede Änderung mit ihrem vorherigen Wert, bevor sie ausgeführt wird.
+    # record() puffert nur, commit() schreibt den ganzen Stapel mit einem einzigen fsync.
+    # Zurückgenommene Einträge werden nicht gelöscht, sondern per "undo"-Zeile quittiert.
+    def __init__(self, backend=None):
+        self.backend = backend or FileJournalBackend(os.path.join(get_data_dir(), 'changes.journal'))
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.commits = 0
+        self._entries = {}
+        self._seq = 0
+        for line in self.backend.read():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # abgeschnittene letzte Zeile nach einem Absturz
+            self._apply(entry)
+    
+    def _apply(self, entry):
+        self._seq = max(self._seq, entry['seq'])
+        if entry['kind'] == 'undo':
+            for seq in entry['seqs']:
+                self._entries.pop(seq, None)
+        else:
+            self._entries[entry['seq']] = entry
+    
+    def record(self, kind, target, old, new, **extra):
+        with self._lock:
+            self._seq += 1
+            entry = {'seq': self._seq, 'ts': round(time.time(), 3), 'kind': kind,
+                     'target': target, 'old': _journal_encode(old), 'new': _journal_encode(new), **extra}
+            self.backend.append(json.dumps(entry, ensure_ascii=False))
+            self._apply(entry)
+            self._dirty = True
+        return entry
+    
+    def commit(self):
+        with self._lock:
+            if not self._dirty:
+                return False
+            self.backend.sync()
+            self._dirty = False
+            self.commits += 1
+            return True
+    
+    def pending(self):
+        # Noch nicht zurückgenommene Einträge in Schreibreihenfolge
+        with self._lock:
+            return [self._entries[seq] for seq in sorted(self._entries)]
+    
+    def mark_undone(self, seqs):
+        seqs = sorted(seqs)
+        if seqs:
+            self.record('undo', None, None, None, seqs=seqs)
+            self.commit()
+    
+    def close(self):
+        self.commit()
+        self.backend.close()
+
+
+def _journal_key(entry):
+    if entry['kind'] == 'registry':
+        return ('registry', entry['target'].lower())
+    if entry['kind'] == 'powercfg':
+        return ('powercfg', entry.get('scope', 'ac'), entry['target'].upper())
+    return (entry['kind'], str(entry['target']).lower())
+
+
+class JournalReplayer:
+    # Nimmt die offenen Journal-Einträge zurück. Pro Einstellung zählt nur der älteste Eintrag
+    # (Rückwärts-Replay endet genau dort), damit sind alle Schritte unabhängig: Registry geht als
+    # ein Batch raus, Dienste/powercfg/netsh laufen parallel. Nicht umkehrbare Einträge
+    # (z.B. gelöschte Dateien) werden nur gemeldet und quittiert. handlers: eigene Rücknahme
+    # pro Art (z.B. 'task'), Aufruf handler(entry) -> (ok, detail).
+    def __init__(self, apply_registry, run_shell, max_parallel=4, handlers=None):
+        self.apply_registry = apply_registry
+        self.run_shell = run_shell
+        self.max_parallel = max_parallel
+        self.handlers = handlers or {}
+    
+    @staticmethod
+    def plan(entries):
+        restores = {}
+        irreversible = []
+        for entry in reversed(entries):
+            if entry['kind'] not in JOURNAL_REVERSIBLE or entry.get('irreversible'):
+                irreversible.append(entry)
+                continue
+            key = _journal_key(entry)
+            seqs = restores[key][1] if key in restores else []
+            restores[key] = (entry, seqs + [entry['seq']])
+        return list(restores.values()), irreversible
+    
+    def replay(self, journal, token=None, progress=None):
+        t0 = time.perf_counter()
+        restores, irreversible = self.plan(journal.pending())
+        registry = [(entry, seqs) for entry, seqs in restores if entry['kind'] == 'registry']
+        shell = [(entry, seqs) for entry, seqs in restores if entry['kind'] != 'registry']
+        result = {'restored': 0, 'failed': [], 'irreversible': irreversible}
+        done_seqs = [entry['seq'] for entry in irreversible]
+        total = max(len(restores), 1)
+        finished = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="uo-restore") as pool:
+            units = []
+            if registry:
+                units.append(pool.submit(self._restore_registry, registry))
+            for entry, seqs in shell:
+                units.append(pool.submit(self._restore_shell, entry, seqs, token))
+            for unit in units:
+                for entry, seqs, ok, detail in unit.result():
+                    finished += 1
+                    if ok:
+                        result['restored'] += 1
+                        done_seqs.extend(seqs)
+                    else:
+                        result['failed'].append((entry, detail))
+                    if progress:
+                        progress(int(finished * 100 / total), f"Wiederherstellung: {entry['target']}")
+        
+        journal.mark_undone(done_seqs)
+        result['elapsed'] = time.perf_counter() - t0
+        return result
+    
+    def _restore_registry(self, items):
+        changes = []
+        for entry, _ in items:
+            hive, rest = entry['target'].split('\\', 1)
+            key, name = rest.rsplit('\\', 1)
+            changes.append(RegistryChange(hive, key, name, _journal_decode(entry['old']), entry.get('old_type') or 'DWORD'))
+        try:
+            diffs = self.apply_registry(changes)
+        except Exception as e:
+            return [(entry, seqs, False, str(e)) for entry, seqs in items]
+        by_path = {d.change.path.lower(): d for d in diffs}
+        results = []
+        for (entry, seqs), change in zip(items, changes):
+            diff = by_path[change.path.lower()]
+            results.append((entry, seqs, diff.status != RegistryDiff.FAILED, str(diff.error or diff.status)))
+        return results
+    
+    def _restore_shell(self, entry, seqs, token):
+        if token is not None and token.cancelled:
+            return [(entry, seqs, False, "abgebrochen")]
+        if entry['kind'] in self.handlers:
+            try:
+                ok, detail = self.handlers[entry['kind']](entry)
+            except Exception as e:
+                ok, detail = False, str(e)
+            return [(entry, seqs, ok, detail)]
+        if entry['kind'] not in TWEAK_KINDS:
+            return [(entry, seqs, False, "keine Rücknahme für diese Art")]
+        tweak = Tweak('restore', {'kind': entry['kind'], 'target': entry['target'],
+                                  'scope': entry.get('scope', 'ac'), 'value': entry['old']})
+        try:
+            result = self.run_shell(tweak.shell_script())
+        except Exception as e:
+            return [(entry, seqs, False, str(e))]
+        detail = "Timeout" if result.timed_out else f"Exit-Code {result.exit_code}"
+        return [(entry, seqs, result.ok, detail)]
+
+
+def bench_journal(count=10_000, base_dir=None, shell_entries=8, shell_latency=0.05):
+    # Schreibdurchsatz des Journals (Speicher, Datei mit fsync pro Stapel, Datei mit fsync pro
+    # Eintrag) und Rollback-Zeit gegen das In-Memory-Registry-Backend, sequentiell vs. parallel
+    base_dir = base_dir or tempfile.gettempdir()
+    work = tempfile.mkdtemp(prefix='uo_bench_journal_', dir=base_dir)
+    results = {}
+    try:
+        for name, batch in (('memory', 100), ('file_batched', 100), ('file_every_entry', 1)):
+            backend = (MemoryJournalBackend() if name == 'memory'
+                       else FileJournalBackend(os.path.join(work, f"{name}.journal")))
+            journal = ChangeJournal(backend)
+            n = count if batch > 1 else min(count, 2000)
+            t0 = time.perf_counter()
+            for i in range(n):
+                journal.record('registry', f"HKLM\\SOFTWARE\\Bench\\K{i // 50}\\V{i}", i, i + 1, old_type='DWORD', type='DWORD')
+                if (i + 1) % batch == 0:
+                    journal.commit()
+            journal.commit()
+            elapsed = time.perf_counter() - t0
+            journal.close()
+            results[name] = {'entries': n, 'commits': journal.commits, 'elapsed': round(elapsed, 4),
+                             'entries_per_sec': round(n / elapsed)}
+            print(f"{name:>18}: {results[name]['entries_per_sec']} Einträge/s ({journal.commits} fsyncs)")
+        
+        original = {f"HKLM\\SOFTWARE\\Bench\\K{i // 50}\\V{i}": (i, 'DWORD') for i in range(0, count, 2)}
+        
+        def fake_shell(script):
+            time.sleep(shell_latency)
+            return ShellResult(0, "", shell_latency)
+        
+        for name, parallel in (('rollback_sequential', 1), ('rollback_parallel', 4)):
+            backend = MemoryRegistryBackend(original)
+            before = dict(backend.values)
+            journal = ChangeJournal(FileJournalBackend(os.path.join(work, f"{name}.journal")))
+            writer = RegistryWriter(backend, journal)
+            t0 = time.perf_counter()
+            writer.apply_batch([RegistryChange('HKLM', f"SOFTWARE\\Bench\\K{i // 50}", f"V{i}", -i)
+                                for i in range(count)])
+            for i in range(shell_entries):
+                journal.record('service', f"BenchSvc{i}", 'Manual', 'Disabled')
+            journal.commit()
+            applied = time.perf_counter() - t0
+            replayer = JournalReplayer(lambda changes: writer.apply_batch(changes, record=False), fake_shell, parallel)
+            restored = replayer.replay(journal)
+            results[name] = {
+                'entries': count + shell_entries,
+                'apply_with_journal': round(applied, 4),
+                'rollback': round(restored['elapsed'], 4),
+                'restored': restored['restored'],
+                'failed': len(restored['failed']),
+                'identical': backend.values == before and not journal.pending(),
+            }
+            print(f"{name:>18}: {restored['restored']} Einstellungen in {restored['elapsed']:.3f}s zurückgesetzt, "
+                  f"Zustand identisch: {results[name]['identical']}")
+            journal.close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+# ========== SYSTEM-MONITOR ==========
+
+def get_system_drive():
+    if os.name == 'nt':
+        return os.environ.get('SystemDrive', 'C:') + '\\'
+    return '/'
+
+
+class SampleRing:
+    # Ringpuffer fester Größe: ein array('d') pro Kanal, kein Wachstum zur Laufzeit
+    def __init__(self, channels, capacity=3600):
+        self.channels = list(channels)
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.data = {name: array('d', bytes(8 * capacity)) for name in self.channels}
+        self.count = 0
+        self._pos = 0
+        self._lock = threading.Lock()
+    
+    def append(self, timestamp, values):
+        with self._lock:
+            pos = self._pos
+            self.times[pos] = timestamp
+            for name in self.channels:
+                self.data[name][pos] = values.get(name, 0.0)
+            self._pos = (pos + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+    
+    def _indices(self):
+        start = (self._pos - self.count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self.count)]
+    
+    def latest(self):
+        with self._lock:
+            if not self.count:
+                return None
+            pos = (self._pos - 1) % self.capacity
+            return self.times[pos], {name: self.data[name][pos] for name in self.channels}
+    
+    def window(self, start, end=None):
+        # Alle Samples im Zeitfenster [start, end] als (zeiten, {kanal: werte})
+        end = end if end is not None else float('inf')
+        with self._lock:
+            idx = [i for i in self._indices() if start <= self.times[i] <= end]
+            return ([self.times[i] for i in idx],
+                    {name: [self.data[name][i] for i in idx] for name in self.channels})
+    
+    def mean(self, start, end=None):
+        times, values = self.window(start, end)
+        if not times:
+            return {}
+        return {name: sum(v) / len(v) for name, v in values.items()}
+
+
+# Ändern sich nie, solange der Prozess lebt -> nur beim ersten Sehen lesen
+PROCESS_STATIC_ATTRS = ('name', 'exe', 'username', 'cmdline', 'create_time')
+PROCESS_DYNAMIC_ATTRS = ('cpu_percent', 'memory_info', 'memory_full_info', 'nice', 'ionice',
+                         'cpu_affinity', 'num_threads', 'status')
+
+
+class ProcessRecord:
+    __slots__ = ('pid', 'proc') + PROCESS_STATIC_ATTRS + PROCESS_DYNAMIC_ATTRS
+    
+    def __init__(self, pid, proc):
+        self.pid = pid
+        self.proc = proc
+        for attr in PROCESS_STATIC_ATTRS + PROCESS_DYNAMIC_ATTRS:
+            setattr(self, attr, None)
+    
+    @property
+    def rss(self):
+        info = self.memory_full_info or self.memory_info
+        return info.rss if info else 0
+    
+    def __repr__(self):
+        return f"ProcessRecord({self.pid} {self.name})"
+
+
+class ProcessTable:
+    # Gemeinsame Prozesstabelle für alle Funktionen, die laufende Prozesse brauchen.
+    # Pro refresh(): PIDs mit dem letzten Stand vergleichen, neue Prozesse anlegen,
+    # verschwundene entfernen; gelesen werden nur die Attribute, die Verbraucher per
+    # register() angemeldet haben – statische einmal pro Prozess, dynamische pro Tick.
+    # listeners bekommen nach jedem refresh() den neuen Stand (Liste der Records).
+    def __init__(self):
+        self.listeners = []
+        self._records = {}
+        self._consumers = collections.Counter()
+        self._static_loaded = frozenset()
+        self._lock = threading.Lock()
+        self.updated = 0.0
+        self.refreshes = 0
+    
+    def register(self, *attrs):
+        unknown = set(attrs) - set(PROCESS_STATIC_ATTRS + PROCESS_DYNAMIC_ATTRS)
+        if unknown:
+            raise ValueError(f"Unbekannte Prozess-Attribute: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self._consumers.update(attrs)
+    
+    def unregister(self, *attrs):
+        with self._lock:
+            self._consumers.subtract(attrs)
+            self._consumers = +self._consumers
+    
+    @property
+    def active(self):
+        return bool(self._consumers)
+    
+    def refresh(self, max_age=None):
+        # max_age: Stand wiederverwenden, wenn er jünger ist (mehrere Verbraucher pro Tick)
+        with self._lock:
+            now = time.monotonic()
+            if max_age is not None and now - self.updated < max_age:
+                return None
+            static = [a for a in PROCESS_STATIC_ATTRS if self._consumers[a] > 0]
+            dynamic = [a for a in PROCESS_DYNAMIC_ATTRS if self._consumers[a] > 0]
+            late_static = [a for a in static if a not in self._static_loaded]
+            
+            records = self._records
+            pids = set(psutil.pids())
+            gone = [pid for pid in records if pid not in pids]
+            for pid in gone:
+                del records[pid]
+            new = set()
+            for pid in pids - records.keys():
+                try:
+                    records[pid] = ProcessRecord(pid, psutil.Process(pid))
+                    new.add(pid)
+                except psutil.Error:
+                    continue
+            
+            dead = []
+            for pid, record in records.items():
+                attrs = dynamic + (static if pid in new else late_static)
+                if not attrs:
+                    continue
+                try:
+                    # as_dict liest alles in einem oneshot()-Kontext, AccessDenied -> None
+                    for attr, value in record.proc.as_dict(attrs, ad_value=None).items():
+                        setattr(record, attr, value)
+                except psutil.NoSuchProcess:
+                    dead.append(pid)
+            for pid in dead:
+                del records[pid]
+            
+            self._static_loaded = frozenset(static)
+            self.updated = time.monotonic()
+            self.refreshes += 1
+            result = {'pids': len(records), 'new': len(new), 'gone': len(gone) + len(dead),
+                      'elapsed': self.updated - now}
+            snapshot = list(records.values()) if self.listeners else None
+        for listener in self.listeners:
+            listener(snapshot)
+        return result
+    
+    def snapshot(self):
+        with self._lock:
+            return list(self._records.values())
+    
+    def get(self, pid):
+        return self._records.get(pid)
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def top(self, n=5, key='cpu_percent'):
+        # key: 'cpu_percent', 'rss' oder eine Funktion ProcessRecord -> Zahl
+        if key == 'cpu_percent':
+            key = lambda r: r.cpu_percent or 0.0
+        elif key == 'rss':
+            key = lambda r: r.rss
+        return heapq.nlargest(n, self.snapshot(), key=key)
+
+
+class SystemSampler:
+    # Sammelt CPU (pro Kern), RAM, Disk- und Netzwerk-Raten in einem Hintergrund-Thread.
+    # Die GUI liest nur latest(); die Historie dient für Vorher/Nachher-Vergleiche.
+    # Die Prozesstabelle wird alle process_interval Sekunden mit aktualisiert, aber nur wenn
+    # jemand sie nutzt.
+    MIN_INTERVAL = 0.1
+    
+    def __init__(self, interval=1.0, capacity=3600, disk_path=None, process_interval=5.0, log=None):
+        self.interval = max(self.MIN_INTERVAL, interval)
+        self.process_interval = process_interval
+        self.log = log or (lambda message, level="INFO": None)
+        self.disk_path = disk_path or get_system_drive()
+        self.cores = psutil.cpu_count() or 1
+        channels = ['cpu', 'ram_percent', 'ram_used', 'disk_free',
+                    'disk_read_bps', 'disk_write_bps', 'net_sent_bps', 'net_recv_bps']
+        channels += [f'cpu{i}' for i in range(self.cores)]
+        self.ring = SampleRing(channels, capacity)
+        self.processes = ProcessTable()
+        self.cpu_time = 0.0
+        self.samples = 0
+        self._started = None
+        self._prev_io = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is None:
+            psutil.cpu_percent(percpu=True)  # Basiswert für die erste Messung
+            self._started = time.time()
+            self._thread = threading.Thread(target=self._run, name="SystemSampler", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def set_interval(self, interval):
+        self.interval = max(self.MIN_INTERVAL, interval)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+    
+    def sample(self):
+        cost = time.thread_time()
+        now = time.time()
+        values = {}
+        try:
+            per_core = psutil.cpu_percent(percpu=True)
+            values['cpu'] = sum(per_core) / len(per_core) if per_core else 0.0
+            for i, load in enumerate(per_core[:self.cores]):
+                values[f'cpu{i}'] = load
+            
+            ram = psutil.virtual_memory()
+            values['ram_percent'] = ram.percent
+            values['ram_used'] = ram.used
+            
+            try:
+                values['disk_free'] = psutil.disk_usage(self.disk_path).free
+            except OSError:
+                pass
+            
+            # nowrap=False: Überlauf fangen wir über max(0, ...) selbst ab, spart die Buchführung in psutil
+            disk = psutil.disk_io_counters(nowrap=False)
+            net = psutil.net_io_counters(nowrap=False)
+            io = (now,
+                  disk.read_bytes if disk else 0, disk.write_bytes if disk else 0,
+                  net.bytes_sent if net else 0, net.bytes_recv if net else 0)
+            if self._prev_io is not None:
+                dt = max(io[0] - self._prev_io[0], 1e-6)
+                for name, cur, prev in zip(('disk_read_bps', 'disk_write_bps', 'net_sent_bps', 'net_recv_bps'),
+                                           io[1:], self._prev_io[1:]):
+                    values[name] = max(0, cur - prev) / dt
+            self._prev_io = io
+            
+            self.ring.append(now, values)
+            self.samples += 1
+            
+            if self.processes.active:
+                self.processes.refresh(max_age=max(self.process_interval, self.interval) - self.interval / 2)
+        except Exception as e:
+            self.log(f"❌ Monitor Fehler: {e}", "ERROR")
+        self.cpu_time += time.thread_time() - cost
+    
+    def latest(self):
+        return self.ring.latest()
+    
+    def mark(self):
+        return time.time()
+    
+    def compare(self, start, end, before=30.0):
+        # Mittelwerte vor dem Lauf (before Sekunden) und während des Laufs
+        return self.ring.mean(start - before, start), self.ring.mean(start, end)
+    
+    @property
+    def overhead(self):
+        # Anteil eines Kerns, der fürs Sampling draufgeht
+        if not self._started:
+            return 0.0
+        return self.cpu_time / max(time.time() - self._started, 1e-6)
+
+
+def bench_process_table(count=2000, ticks=10, churn=20):
+    # Startet Kindprozesse, bis mindestens count Prozesse laufen, und vergleicht pro Tick
+    # process_iter mit allen Attributen gegen die Tabelle (gleiche Attribute, gleiche Top-5);
+    # zwischen den Ticks werden churn Prozesse ersetzt
+    sleeper = shutil.which('sleep')
+    argv = [sleeper, '600'] if sleeper else [sys.executable, '-c', 'import time; time.sleep(600)']
+    spawn = lambda: subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    attrs = ['name', 'exe', 'username', 'cpu_percent', 'memory_info']
+    children = [spawn() for _ in range(max(0, count - len(psutil.pids())))]
+    results = {}
+    try:
+        def legacy_tick():
+            procs = list(psutil.process_iter(attrs))
+            return heapq.nlargest(5, procs, key=lambda p: p.info['cpu_percent'] or 0.0)
+        
+        table = ProcessTable()
+        table.register(*attrs)
+        
+        def table_tick():
+            table.refresh()
+            return table.top(5)
+        
+        for name, tick in (('process_iter', legacy_tick), ('process_table', table_tick)):
+            tick()  # erster Durchlauf: alle Prozesse neu
+            times = []
+            cpu = time.process_time()
+            for _ in range(ticks):
+                for _ in range(churn):
+                    children.pop(0).kill()
+                    children.append(spawn())
+                t0 = time.perf_counter()
+                tick()
+                times.append(time.perf_counter() - t0)
+            results[name] = {
+                'processes': len(psutil.pids()),
+                'ms_per_tick': round(statistics.mean(times) * 1000, 2),
+                'cpu_s': round(time.process_time() - cpu, 3),
+            }
+            print(f"{name:>14}: {results[name]['processes']} Prozesse, {results[name]['ms_per_tick']} ms pro Tick")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return results
+
+
+def bench_system_sampler(duration=10.0, interval=0.1):
+    sampler = SystemSampler(interval=interval, capacity=int(duration / interval) + 10).start()
+    time.sleep(duration)
+    sampler.stop()
+    return {
+        'interval_ms': interval * 1000,
+        'samples': sampler.samples,
+        'cpu_ms_per_sample': round(sampler.cpu_time / max(sampler.samples, 1) * 1000, 3),
+        'core_percent': round(sampler.overhead * 100, 3),
+        'channels': len(sampler.ring.channels),
+        'buffer_kb': round(8 * sampler.ring.capacity * (len(sampler.ring.channels) + 1) / 1024, 1),
+    }
+
+
+# ========== RESSOURCEN-GOVERNOR ==========
+
+GOVERNOR_PRIORITIES = ('below_normal', 'idle')
+GOVERNOR_IO = ('low', 'idle')
+# Vordergrundfenster, die kein Spiel sind (Desktop, Startmenü, ...)
+GOVERNOR_SHELL_NAMES = {'explorer', 'shellexperiencehost', 'startmenuexperiencehost', 'searchhost',
+                        'applicationframehost', 'lockapp'}
+
+
+def _process_key(name):
+    name = (name or "").lower()
+    return name[:-4] if name.endswith('.exe') else name
+
+
+class GovernorRule:
+    __slots__ = ('label', 'patterns', 'priority', 'io', 'cores')
+    
+    def __init__(self, spec):
+        self.label = spec.get('label', "Regel")
+        self.patterns = tuple(_process_key(p) for p in spec['match'])
+        self.priority = spec.get('priority')
+        self.io = spec.get('io')
+        self.cores = spec.get('cores')
+        if self.priority not in GOVERNOR_PRIORITIES + (None,):
+            raise ValueError(f"Regel {self.label}: unbekannte Priorität '{self.priority}'")
+        if self.io not in GOVERNOR_IO + (None,):
+            raise ValueError(f"Regel {self.label}: unbekannte I/O-Priorität '{self.io}'")
+        if self.cores is not None and (not isinstance(self.cores, int) or self.cores < 1):
+            raise ValueError(f"Regel {self.label}: cores muss eine positive Zahl sein")
+    
+    def __repr__(self):
+        return f"GovernorRule({self.label})"
+
+
+def load_governor_rules(path=None):
+    # Regeln stehen im Tweak-Katalog unter "governor"
+    with open(path or CATALOG_PATH, encoding='utf-8') as fh:
+        data = json.load(fh)
+    return [GovernorRule(spec) for spec in data.get('governor', {}).get('rules', [])]
+
+
+def _governor_levels():
+    # Windows: Prioritätsklassen und IOPRIO_*; sonst nice-Werte und ionice-Klassen (Linux)
+    if os.name == 'nt':
+        priority = {'below_normal': psutil.BELOW_NORMAL_PRIORITY_CLASS, 'idle': psutil.IDLE_PRIORITY_CLASS}
+        io = {'low': psutil.IOPRIO_LOW, 'idle': psutil.IOPRIO_VERYLOW}
+    else:
+        priority = {'below_normal': 10, 'idle': 19}
+        io = {'low': (getattr(psutil, 'IOPRIO_CLASS_BE', 2), 7), 'idle': (getattr(psutil, 'IOPRIO_CLASS_IDLE', 3), 0)}
+    return priority, io
+
+
+def _priority_rank(value):
+    # Größer = wichtiger; nur absenken, nie anheben
+    if os.name == 'nt':
+        order = [psutil.IDLE_PRIORITY_CLASS, psutil.BELOW_NORMAL_PRIORITY_CLASS, psutil.NORMAL_PRIORITY_CLASS,
+                 psutil.ABOVE_NORMAL_PRIORITY_CLASS, psutil.HIGH_PRIORITY_CLASS, psutil.REALTIME_PRIORITY_CLASS]
+        return order.index(value) if value in order else 2
+    return -value
+
+
+def _io_rank(value):
+    if isinstance(value, int):
+        return value  # Windows: VERYLOW < LOW < NORMAL < HIGH
+    ioclass, level = value
+    if ioclass == getattr(psutil, 'IOPRIO_CLASS_IDLE', 3):
+        return 0
+    if ioclass == getattr(psutil, 'IOPRIO_CLASS_RT', 1):
+        return 20
+    # BE 0..7, NONE entspricht BE 4
+    return 10 - (level if ioclass == getattr(psutil, 'IOPRIO_CLASS_BE', 2) else 4)
+
+
+def _set_ionice(proc, value):
+    if isinstance(value, int):
+        proc.ionice(value)
+        return
+    ioclass, level = value
+    if ioclass in (getattr(psutil, 'IOPRIO_CLASS_BE', 2), getattr(psutil, 'IOPRIO_CLASS_RT', 1)):
+        proc.ionice(ioclass, level)
+    else:
+        proc.ionice(ioclass)  # NONE/IDLE nehmen keinen Wert
+
+
+def foreground_pid():
+    # Prozess des Vordergrundfensters; nur unter Windows bekannt
+    if os.name != 'nt':
+        return None
+    import ctypes
+    from ctypes import wintypes
+    hwnd = ctypes.windll.user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = wintypes.DWORD()
+    ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+
+class _Throttled:
+    # Originalwerte eines gedrosselten Prozesses; None = nicht verändert
+    __slots__ = ('pid', 'ctime', 'name', 'nice', 'ionice', 'affinity')
+    
+    def __init__(self, pid, ctime, name):
+        self.pid = pid
+        self.ctime = ctime
+        self.name = name
+        self.nice = None
+        self.ionice = None
+        self.affinity = None
+
+
+class ResourceGovernor:
+    # Solange ein Zielprozess (Spiel) läuft, werden Hintergrundprozesse nach Regeln gedrosselt:
+    # Priorität, I/O-Priorität und CPU-Affinität. Ein Durchlauf über die (gemeinsame) Prozesstabelle
+    # pro Tick, nur neue Prozesse werden angefasst; die Originalwerte liegen in einer Tabelle und
+    # werden beim Ende des Ziels (oder stop()) ohne weiteren Durchlauf zurückgeschrieben.
+    def __init__(self, rules, interval=2.0, log=None, table=None):
+        self.rules = rules
+        self.interval = interval
+        self.table = table or ProcessTable()
+        self.log = log or (lambda message, level="INFO": None)
+        self.priority_levels, self.io_levels = _governor_levels()
+        self.cpus = list(range(psutil.cpu_count() or 1))
+        self.can_ionice = hasattr(psutil.Process, 'ionice')
+        self.can_affinity = hasattr(psutil.Process, 'cpu_affinity')
+        self.target = None
+        self._exact = {}
+        self._globs = []
+        for rule in rules:
+            for pattern in rule.patterns:
+                if any(c in pattern for c in '*?['):
+                    self._globs.append((pattern, rule))
+                else:
+                    self._exact.setdefault(pattern, rule)
+        self._throttled = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def throttled_count(self):
+        return len(self._throttled)
+    
+    def match(self, name):
+        key = _process_key(name)
+        rule = self._exact.get(key)
+        if rule is None:
+            rule = next((r for pattern, r in self._globs if fnmatch.fnmatchcase(key, pattern)), None)
+        return rule
+    
+    def find_target(self, target=None):
+        # target: PID, Prozessname oder None (Vordergrundfenster, nicht wir selbst)
+        own = {os.getpid(), os.getppid()}
+        try:
+            if isinstance(target, int):
+                return psutil.Process(target)
+            if target is None:
+                pid = foreground_pid()
+                if pid is None or pid in own:
+                    return None
+                proc = psutil.Process(pid)
+                key = _process_key(proc.name())
+                return None if key in GOVERNOR_SHELL_NAMES or self.match(key) else proc
+            key = _process_key(target)
+            self.table.refresh(max_age=self.interval / 2)
+            for record in self.table.snapshot():
+                if record.pid not in own and _process_key(record.name) == key:
+                    return record.proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        return None
+    
+    def apply(self, target_pid):
+        # Ein Durchlauf: neue passende Prozesse drosseln, verschwundene aus der Tabelle nehmen
+        counts = {'seen': 0, 'matched': 0, 'throttled': 0, 'denied': 0}
+        skip = {target_pid, os.getpid()}
+        alive = set()
+        self.table.refresh(max_age=self.interval / 2)
+        with self._lock:
+            for entry in self.table.snapshot():
+                counts['seen'] += 1
+                pid = entry.pid
+                alive.add(pid)
+                if pid in skip or pid in self._throttled:
+                    continue
+                rule = self.match(entry.name)
+                if rule is None:
+                    continue
+                counts['matched'] += 1
+                record = self._throttle(entry.proc, entry.name, rule)
+                if record is None:
+                    counts['denied'] += 1
+                elif record is not False:
+                    self._throttled[pid] = record
+                    counts['throttled'] += 1
+            for pid in [pid for pid in self._throttled if pid not in alive]:
+                del self._throttled[pid]
+        return counts
+    
+    def _throttle(self, proc, name, rule):
+        # Liefert den Datensatz, False (nichts zu tun) oder None (kein Zugriff)
+        record, denied = None, False
+        try:
+            with proc.oneshot():
+                record = _Throttled(proc.pid, proc.create_time(), name)
+                if rule.priority:
+                    current, wanted = proc.nice(), self.priority_levels[rule.priority]
+                    if _priority_rank(current) > _priority_rank(wanted):
+                        proc.nice(wanted)
+                        record.nice = current
+                if rule.io and self.can_ionice:
+                    current, wanted = proc.ionice(), self.io_levels[rule.io]
+                    if _io_rank(current) > _io_rank(wanted):
+                        _set_ionice(proc, wanted)
+                        record.ionice = tuple(current) if not isinstance(current, int) else current
+                if rule.cores and self.can_affinity and rule.cores < len(self.cpus):
+                    current, wanted = proc.cpu_affinity(), self.cpus[-rule.cores:]
+                    if len(current) > len(wanted):
+                        proc.cpu_affinity(wanted)
+                        record.affinity = current
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            denied = True
+        # Auch teilweise gedrosselte Prozesse merken, damit sie zurückgesetzt werden
+        if record is not None and (record.nice, record.ionice, record.affinity) != (None, None, None):
+            return record
+        return None if denied else False
+    
+    def restore(self):
+        counts = {'restored': 0, 'gone': 0, 'failed': 0}
+        with self._lock:
+            records, self._throttled = list(self._throttled.values()), {}
+        for record in records:
+            try:
+                proc = psutil.Process(record.pid)
+                if proc.create_time() != record.ctime:
+                    counts['gone'] += 1  # PID wurde neu vergeben
+                    continue
+                if record.affinity is not None:
+                    proc.cpu_affinity(record.affinity)
+                if record.ionice is not None:
+                    _set_ionice(proc, record.ionice)
+                if record.nice is not None:
+                    proc.nice(record.nice)
+                counts['restored'] += 1
+            except psutil.NoSuchProcess:
+                counts['gone'] += 1
+            except (psutil.AccessDenied, OSError):
+                # Linux: nice wieder senken braucht Root/CAP_SYS_NICE
+                counts['failed'] += 1
+        return counts
+    
+    def start(self, target=None):
+        if self.running:
+            return False
+        if target is None and os.name != 'nt':
+            self.log("⚠️ Vordergrundfenster nur unter Windows erkennbar – Zielprozess angeben", "WARNING")
+            return False
+        self._stop.clear()
+        self.table.register('name')
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True, name="uo-governor")
+        self._thread.start()
+        return True
+    
+    def stop(self, wait=True):
+        self._stop.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+    
+    def _run(self, target):
+        try:
+            self._govern(target)
+        finally:
+            self.table.unregister('name')
+    
+    def _govern(self, target):
+        self.log(f"🎯 Governor wartet auf {target if target is not None else 'das nächste Vordergrundfenster'}...", "INFO")
+        proc = None
+        while proc is None:
+            proc = self.find_target(target)
+            if proc is None and self._stop.wait(self.interval):
+                return
+        self.target = proc
+        try:
+            name = proc.name()
+            counts = self.apply(proc.pid)
+            self.log(f"🎮 {name} (PID {proc.pid}): {counts['throttled']} Hintergrundprozesse gedrosselt"
+                     + (f", {counts['denied']} ohne Zugriff" if counts['denied'] else ""), "SUCCESS")
+            # is_running prüft auch die Startzeit -> wiederverwendete PID zählt als beendet
+            while not self._stop.wait(self.interval) and proc.is_running():
+                counts = self.apply(proc.pid)
+                if counts['throttled']:
+                    self.log(f"🎯 {counts['throttled']} weitere Prozesse gedrosselt", "DEBUG")
+            if not self._stop.is_set():
+                self.log(f"🏁 {name} beendet", "INFO")
+        except Exception as e:
+            self.log(f"❌ Governor Fehler: {e}", "ERROR")
+        finally:
+            counts = self.restore()
+            self.target = None
+            self.log(f"↩️ {counts['restored']} Prozesse wiederhergestellt"
+                     + (f", {counts['failed']} fehlgeschlagen" if counts['failed'] else ""), "INFO")
+
+
+def bench_governor(count=200):
+    # count Kindprozesse als "Hintergrund": ein Durchlauf zum Drosseln, ein Tick ohne neue
+    # Prozesse und das Zurücksetzen; danach müssen alle Werte wieder stimmen
+    sleeper = shutil.which('sleep')
+    argv = [sleeper, '600'] if sleeper else [sys.executable, '-c', 'import time; time.sleep(600)']
+    children = [subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(count)]
+    results = {}
+    try:
+        name = psutil.Process(children[0].pid).name()
+        rule = GovernorRule({'label': 'Bench', 'match': [name], 'priority': 'idle', 'io': 'idle', 'cores': 1})
+        governor = ResourceGovernor([rule], interval=0)
+        governor.table.register('name')
+        
+        def state(pid):
+            proc = psutil.Process(pid)
+            io = proc.ionice() if governor.can_ionice else None
+            return proc.nice(), tuple(io) if io is not None and not isinstance(io, int) else io, \
+                proc.cpu_affinity() if governor.can_affinity else None
+        
+        before = {c.pid: state(c.pid) for c in children}
+        for step in ('apply', 'tick', 'restore'):
+            t0 = time.perf_counter()
+            counts = governor.restore() if step == 'restore' else governor.apply(os.getpid())
+            elapsed = time.perf_counter() - t0
+            results[step] = dict(counts, elapsed=round(elapsed, 4))
+            print(f"{step:>8}: {elapsed * 1000:.1f} ms {counts}")
+        results['system_processes'] = results['apply']['seen']
+        results['restored_identical'] = all(state(c.pid) == before[c.pid] for c in children)
+        print(f"Zustand nach Wiederherstellung identisch: {results['restored_identical']}")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return results
+
+
+# ========== ARBEITSSPEICHER ==========
+
+class LeakDetector:
+    # RSS-Verlauf pro Prozess, höchstens alle interval Sekunden ein Punkt (Listener der
+    # Prozesstabelle). Verdächtig ist, wer über min_samples Punkte fast nur wächst und dabei
+    # mindestens min_growth Bytes zugelegt hat.
+    def __init__(self, interval=30.0, window=3600.0, min_samples=6, min_growth=100 * 1024**2, monotony=0.8):
+        self.interval = interval
+        self.min_samples = min_samples
+        self.min_growth = min_growth
+        self.monotony = monotony
+        self.maxlen = max(min_samples, int(window / max(interval, 1e-3)) + 1)
+        self.history = {}
+        self._last = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, records, now=None):
+        now = time.time() if now is None else now
+        if now - self._last < self.interval:
+            return False
+        self._last = now
+        with self._lock:
+            alive = set()
+            for record in records:
+                if record.memory_info is None:
+                    continue
+                key = (record.pid, record.proc.create_time())
+                alive.add(key)
+                entry = self.history.get(key)
+                if entry is None:
+                    entry = self.history[key] = [record.name, collections.deque(maxlen=self.maxlen)]
+                entry[1].append((now, record.rss))
+            for key in [key for key in self.history if key not in alive]:
+                del self.history[key]
+        return True
+    
+    @property
+    def span(self):
+        # Wie weit der Verlauf zurückreicht (Sekunden)
+        with self._lock:
+            points = [entry[1] for entry in self.history.values() if entry[1]]
+            return max((p[-1][0] - p[0][0] for p in points), default=0.0)
+    
+    def suspects(self, limit=10):
+        result = []
+        with self._lock:
+            for (pid, _), (name, points) in self.history.items():
+                if len(points) < self.min_samples:
+                    continue
+                growth = points[-1][1] - points[0][1]
+                if growth < self.min_growth:
+                    continue
+                steps = sum(1 for a, b in zip(points, itertools.islice(points, 1, None)) if b[1] >= a[1])
+                if steps < self.monotony * (len(points) - 1):
+                    continue
+                # Steigung per Kleinste-Quadrate, robuster als erster/letzter Punkt
+                t0 = points[0][0]
+                xs = [t - t0 for t, _ in points]
+                ys = [rss for _, rss in points]
+                mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+                var = sum((x - mx) ** 2 for x in xs) or 1e-9
+                slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var
+                result.append({'pid': pid, 'name': name, 'rss': ys[-1], 'growth': growth,
+                               'duration': xs[-1], 'bytes_per_min': slope * 60})
+        result.sort(key=lambda r: r['bytes_per_min'], reverse=True)
+        return result[:limit]
+
+
+class MemoryTrimBackend:
+    # Schnittstelle: trim(pids) -> (erfolgreich, fehlgeschlagen); cache_bytes() und
+    # page_faults() (kumuliert) dürfen None liefern, wenn das System sie nicht kennt.
+    name = "none"
+    
+    def trim(self, pids):
+        raise NotImplementedError
+    
+    def cache_bytes(self):
+        return None
+    
+    def page_faults(self):
+        return None
+
+
+class WorkingSetTrimBackend(MemoryTrimBackend):
+    # Windows: EmptyWorkingSet pro Prozess; Seiten wandern in die Standby-Liste
+    name = "EmptyWorkingSet"
+    PROCESS_SET_QUOTA = 0x0100
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    
+    def __init__(self):
+        if os.name != 'nt':
+            raise OSError("EmptyWorkingSet ist nur unter Windows verfügbar")
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self.psapi = ctypes.WinDLL('psapi', use_last_error=True)
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+        self.kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        self.psapi.EmptyWorkingSet.argtypes = (wintypes.HANDLE,)
+        
+        class PerformanceInformation(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD)] + [(name, ctypes.c_size_t) for name in (
+                'CommitTotal', 'CommitLimit', 'CommitPeak', 'PhysicalTotal', 'PhysicalAvailable',
+                'SystemCache', 'KernelTotal', 'KernelPaged', 'KernelNonpaged', 'PageSize')] + \
+                [(name, wintypes.DWORD) for name in ('HandleCount', 'ProcessCount', 'ThreadCount')]
+        self.PerformanceInformation = PerformanceInformation
+    
+    def trim(self, pids):
+        ok = failed = 0
+        access = self.PROCESS_SET_QUOTA | self.PROCESS_QUERY_LIMITED_INFORMATION
+        for pid in pids:
+            handle = self.kernel32.OpenProcess(access, False, pid)
+            if not handle:
+                failed += 1
+                continue
+            try:
+                if self.psapi.EmptyWorkingSet(handle):
+                    ok += 1
+                else:
+                    failed += 1
+            finally:
+                self.kernel32.CloseHandle(handle)
+        return ok, failed
+    
+    def cache_bytes(self):
+        info = self.PerformanceInformation()
+        info.cb = self.ctypes.sizeof(info)
+        if not self.psapi.GetPerformanceInfo(self.ctypes.byref(info), info.cb):
+            return None
+        return info.SystemCache * info.PageSize
+    
+    def page_faults(self):
+        # Kein systemweiter Zähler in psapi -> Summe über alle Prozesse
+        total = 0
+        for proc in psutil.process_iter(['memory_info']):
+            info = proc.info['memory_info']
+            total += getattr(info, 'num_page_faults', 0) if info else 0
+        return total
+
+
+class DropCachesBackend(MemoryTrimBackend):
+    # Linux-Gegenstück: Prozesse haben kein Working-Set-Trim, stattdessen wird der
+    # Page-Cache verworfen (braucht Root). Die pids werden ignoriert.
+    name = "drop_caches"
+    
+    def __init__(self, path='/proc/sys/vm/drop_caches', level=1):
+        self.path = path
+        self.level = level
+    
+    def trim(self, pids):
+        try:
+            os.sync()
+            with open(self.path, 'w') as fh:
+                fh.write(str(self.level))
+        except OSError:
+            return 0, 1
+        return 1, 0
+    
+    def cache_bytes(self):
+        vm = psutil.virtual_memory()
+        return getattr(vm, 'cached', 0) + getattr(vm, 'buffers', 0) or None
+    
+    def page_faults(self):
+        try:
+            with open('/proc/vmstat') as fh:
+                for line in fh:
+                    if line.startswith('pgfault '):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
+
+class FakeTrimBackend(DropCachesBackend):
+    # Für Tests und Benchmarks: merkt sich nur, welche Prozesse getrimmt worden wären
+    name = "fake"
+    
+    def __init__(self):
+        super().__init__()
+        self.trimmed = []
+    
+    def trim(self, pids):
+        pids = list(pids)
+        self.trimmed.extend(pids)
+        return len(pids), 0
+
+
+def default_trim_backend():
+    return WorkingSetTrimBackend() if os.name == 'nt' else DropCachesBackend()
+
+
+class MemoryTrimmer:
+    # Misst freien RAM und Page-Fault-Rate über window Sekunden vor und nach dem Trim;
+    # sleep ist austauschbar (z.B. job.sleep, damit die Messung abbrechbar bleibt)
+    def __init__(self, backend, window=5.0, sleep=time.sleep):
+        self.backend = backend
+        self.window = window
+        self.sleep = sleep
+    
+    def measure(self):
+        faults = self.backend.page_faults()
+        t0 = time.perf_counter()
+        self.sleep(self.window)
+        elapsed = max(time.perf_counter() - t0, 1e-6)
+        after = self.backend.page_faults()
+        rate = (after - faults) / elapsed if faults is not None and after is not None else None
+        return {'available': psutil.virtual_memory().available, 'cache': self.backend.cache_bytes(),
+                'faults_per_sec': rate}
+    
+    def run(self, pids):
+        before = self.measure()
+        t0 = time.perf_counter()
+        trimmed, failed = self.backend.trim(pids)
+        trim_time = time.perf_counter() - t0
+        after = self.measure()
+        return {'backend': self.backend.name, 'trimmed': trimmed, 'failed': failed,
+                'trim_time': trim_time, 'before': before, 'after': after,
+                'freed': after['available'] - before['available']}
+
+
+def memory_report(table, top=15):
+    # RSS für alle Prozesse aus der Tabelle, USS (teuer: Seitentabellen lesen) nur für die Top-N
+    table.register('name', 'memory_info')
+    try:
+        table.refresh(max_age=1.0)
+        records = table.top(top, 'rss')
+    finally:
+        table.unregister('name', 'memory_info')
+    rows = []
+    for record in records:
+        if not record.rss:
+            continue  # Kernel-Threads
+        try:
+            uss = record.proc.memory_full_info().uss
+        except (psutil.Error, AttributeError):
+            uss = None
+        rows.append({'pid': record.pid, 'name': record.name, 'rss': record.rss, 'uss': uss})
+    return rows
+
+
+def bench_memory(count=200, top=15, leak_seconds=4.0):
+    # USS für alle Prozesse gegen nur für die Top-N, dann ein wachsender Kindprozess,
+    # der als Leck erkannt werden muss, und ein Trim-Durchlauf mit dem Fake-Backend
+    sleeper = shutil.which('sleep')
+    argv = [sleeper, '600'] if sleeper else [sys.executable, '-c', 'import time; time.sleep(600)']
+    children = [subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(count)]
+    grower = subprocess.Popen([sys.executable, '-c',
+                               "import time\nblocks = []\nwhile True:\n"
+                               "    blocks.append(bytearray(8 * 1024 * 1024))\n    time.sleep(0.2)"])
+    children.append(grower)
+    results = {}
+    try:
+        table = ProcessTable()
+        t0 = time.perf_counter()
+        uss_all = 0
+        for proc in psutil.process_iter():
+            try:
+                proc.memory_full_info()
+                uss_all += 1
+            except psutil.Error:
+                pass
+        results['uss_all'] = {'processes': uss_all, 'elapsed': round(time.perf_counter() - t0, 4)}
+        t0 = time.perf_counter()
+        rows = memory_report(table, top)
+        results['uss_top_n'] = {'processes': len(rows), 'elapsed': round(time.perf_counter() - t0, 4)}
+        print(f"USS alle: {results['uss_all']['elapsed']:.3f}s, Top-{top}: {results['uss_top_n']['elapsed']:.3f}s")
+        
+        detector = LeakDetector(interval=0.25, min_samples=8, min_growth=32 * 1024**2)
+        table.register('name', 'memory_info')
+        costs = []
+        end = time.time() + leak_seconds
+        while time.time() < end:
+            t0 = time.perf_counter()
+            table.refresh()
+            detector.observe(table.snapshot())
+            costs.append(time.perf_counter() - t0)
+            time.sleep(0.25)
+        suspects = detector.suspects()
+        results['leak'] = {
+            'samples': len(costs), 'ms_per_sample': round(statistics.mean(costs) * 1000, 2),
+            'detected': any(s['pid'] == grower.pid for s in suspects),
+            'false_positives': sum(1 for s in suspects if s['pid'] != grower.pid),
+        }
+        print(f"Leck erkannt: {results['leak']['detected']}, Fehlalarme: {results['leak']['false_positives']}, "
+              f"{results['leak']['ms_per_sample']} ms pro Messung")
+        
+        backend = FakeTrimBackend()
+        trim = MemoryTrimmer(backend, window=1.0).run([c.pid for c in children])
+        results['trim'] = {'trimmed': trim['trimmed'], 'trim_time': round(trim['trim_time'], 4),
+                           'faults_before': trim['before']['faults_per_sec'],
+                           'faults_after': trim['after']['faults_per_sec']}
+        print(f"Trim ({backend.name}): {trim['trimmed']} Prozesse, Page-Faults/s "
+              f"{trim['before']['faults_per_sec']} -> {trim['after']['faults_per_sec']}")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return results
+
+
+# ========== AUTOSTART ==========
+
+STARTUP_APPROVED = 'Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\StartupApproved'
+# Schwellen wie im Task-Manager: hoch ab 1 s CPU oder 3 MB Disk-I/O, mittel ab 300 ms oder 300 KB
+STARTUP_IMPACT = (('hoch', 1.0, 3 * 1024**2), ('mittel', 0.3, 300 * 1024))
+BOOT_WINDOW = 120.0  # so viele Sekunden nach dem Booten zählen als Startkosten
+BOOT_DISK_BPS = 100 * 1024**2  # angenommene Lesegeschwindigkeit für die Ladezeit
+
+
+def _command_image(command):
+    # Programmpfad aus einer Befehlszeile: "C:\Pfad mit Leerzeichen\app.exe" /arg oder C:\app.exe -x
+    command = os.path.expandvars((command or "").strip())
+    if command.startswith('"'):
+        return command[1:].split('"', 1)[0]
+    match = re.match(r'(.+?\.(?:exe|com|bat|cmd|lnk))(?:\s|$)', command, re.IGNORECASE)
+    if match:
+        return match.group(1)
+    return command.split(' ', 1)[0] or None
+
+
+def _approved_enabled(value):
+    # StartupApproved: erstes Byte gerade (02/06) = aktiv, ungerade (03/07) = deaktiviert
+    if not value:
+        return True
+    return value[0] % 2 == 0
+
+
+def _approved_value(enabled):
+    if enabled:
+        return b'\x02' + b'\x00' * 11
+    filetime = int((time.time() + 11644473600) * 10**7)
+    return b'\x03\x00\x00\x00' + filetime.to_bytes(8, 'little')
+
+
+class StartupItem:
+    __slots__ = ('source', 'location', 'name', 'command', 'image', 'enabled', 'approval',
+                 'image_size', 'boot_cpu', 'boot_io', 'cost', 'impact')
+    
+    def __init__(self, source, location, name, command, enabled=True, approval=None):
+        self.source = source
+        self.location = location
+        self.name = name
+        self.command = command
+        self.image = _command_image(command)
+        self.enabled = enabled
+        # (hive, Unterschlüssel von StartupApproved) für Run-Einträge und Startordner
+        self.approval = approval
+        self.image_size = 0
+        self.boot_cpu = None
+        self.boot_io = None
+        self.cost = 0.0
+        self.impact = 'niedrig'
+    
+    @property
+    def path(self):
+        return f"{self.location}\\{self.name}"
+    
+    @property
+    def measured(self):
+        return self.boot_cpu is not None
+    
+    def __repr__(self):
+        return f"StartupItem({self.source}: {self.name}, {self.impact})"
+
+
+class StartupBackend:
+    # Schnittstelle für die Autostart-Quellen. Run-Schlüssel und der Freigabe-Status
+    # (StartupApproved, wie im Task-Manager) kommen aus einem RegistryBackend; Startordner,
+    # Verknüpfungsziele und geplante Aufgaben liefern die Unterklassen.
+    RUN_KEYS = (
+        ('HKCU', 'Software\\Microsoft\\Windows\\CurrentVersion\\Run', 'Run'),
+        ('HKLM', 'Software\\Microsoft\\Windows\\CurrentVersion\\Run', 'Run'),
+        ('HKLM', 'Software\\WOW6432Node\\Microsoft\\Windows\\CurrentVersion\\Run', 'Run32'),
+    )
+    
+    def __init__(self, registry):
+        self.registry = registry
+    
+    def folders(self):
+        return []  # [(hive, ordner)]
+    
+    def resolve_links(self, paths):
+        return {}  # {verknüpfung: ziel}
+    
+    def tasks(self):
+        return []  # [(aufgabenpfad, befehl, aktiv)]
+    
+    def set_task_enabled(self, path, enabled):
+        raise NotImplementedError
+    
+    def restore_task(self, entry):
+        # Für JournalReplayer: alten Zustand einer Aufgabe wiederherstellen
+        ok = self.set_task_enabled(entry['target'], entry['old'])
+        return ok, "wiederhergestellt" if ok else "fehlgeschlagen"
+    
+    def _values(self, hive, key):
+        handle = self.registry.open_key(hive, key)
+        try:
+            return handle.values()
+        finally:
+            handle.close()
+    
+    def items(self):
+        items = []
+        flags = {}
+        
+        def approved(hive, kind):
+            if (hive, kind) not in flags:
+                flags[hive, kind] = {name.lower(): value for name, value, _ in
+                                     self._values(hive, f"{STARTUP_APPROVED}\\{kind}")}
+            return flags[hive, kind]
+        
+        for hive, key, kind in self.RUN_KEYS:
+            for name, command, _ in self._values(hive, key):
+                enabled = _approved_enabled(approved(hive, kind).get(name.lower()))
+                items.append(StartupItem('run', f"{hive}\\{key}", name, str(command), enabled, (hive, kind)))
+        
+        for hive, folder in self.folders():
+            try:
+                entries = [e for e in os.scandir(folder) if e.is_file() and e.name.lower() != 'desktop.ini']
+            except OSError:
+                continue
+            for entry in entries:
+                enabled = _approved_enabled(approved(hive, 'StartupFolder').get(entry.name.lower()))
+                items.append(StartupItem('folder', folder, entry.name, f'"{entry.path}"', enabled, (hive, 'StartupFolder')))
+        links = self.resolve_links([i.image for i in items if i.source == 'folder' and i.image.lower().endswith('.lnk')])
+        for item in items:
+            if item.image in links:
+                item.image = links[item.image]
+        
+        for path, command, enabled in self.tasks():
+            location, name = path.rsplit('\\', 1)
+            items.append(StartupItem('task', location, name, command, enabled))
+        return items
+
+
+class WindowsStartupBackend(StartupBackend):
+    def __init__(self, registry, run_shell):
+        super().__init__(registry)
+        self.run_shell = run_shell
+    
+    def folders(self):
+        start_menu = 'Microsoft\\Windows\\Start Menu\\Programs'
+        return [('HKCU', os.path.join(os.environ.get('APPDATA', ''), start_menu, 'Startup')),
+                ('HKLM', os.path.join(os.environ.get('PROGRAMDATA', 'C:\\ProgramData'), start_menu, 'StartUp'))]
+    
+    def _query(self, script):
+        result = self.run_shell(script + "\nWrite-Output ($r | ConvertTo-Json -Compress -Depth 4)")
+        line = next((l for l in result.output.splitlines() if l.startswith(('{', '['))), None)
+        return json.loads(line) if line else None
+    
+    def resolve_links(self, paths):
+        if not paths:
+            return {}
+        quoted = ", ".join("'" + p.replace("'", "''") + "'" for p in paths)
+        data = self._query("$s = New-Object -ComObject WScript.Shell; $r = @{}\n"
+                           f"foreach ($p in @({quoted})) {{ $r[$p] = $s.CreateShortcut($p).TargetPath }}")
+        return {k: v for k, v in (data or {}).items() if v}
+    
+    def tasks(self):
+        # Nur Aufgaben mit Anmelde-/Start-Trigger, ohne die von Windows selbst
+        data = self._query(
+            "$r = @(Get-ScheduledTask | Where-Object { $_.TaskPath -notlike '\\Microsoft\\Windows\\*' -and "
+            "($_.Triggers | Where-Object { $_.CimClass.CimClassName -in @('MSFT_TaskLogonTrigger', 'MSFT_TaskBootTrigger') }) } | "
+            "ForEach-Object { $a = $_.Actions | Select-Object -First 1; "
+            "@{ path = $_.TaskPath + $_.TaskName; command = ([string]$a.Execute + ' ' + [string]$a.Arguments).Trim(); "
+            "enabled = ($_.State -ne 'Disabled') } })")
+        if isinstance(data, dict):
+            data = [data]  # ConvertTo-Json packt ein einzelnes Element aus
+        return [(t['path'], t['command'], t['enabled']) for t in data or []]
+    
+    def set_task_enabled(self, path, enabled):
+        location, name = path.rsplit('\\', 1)
+        verb = 'Enable' if enabled else 'Disable'
+        result = self.run_shell(f"{verb}-ScheduledTask -TaskPath '{location}\\' -TaskName '{name}' -ErrorAction Stop | Out-Null")
+        return result.ok
+
+
+class FakeStartupBackend(StartupBackend):
+    # Für Linux, Tests und Benchmarks: Registry im Speicher, echte (temporäre) Startordner,
+    # .lnk-Dateien enthalten einfach den Zielpfad, Aufgaben liegen in einem dict
+    def __init__(self, registry=None, folders=(), tasks=None):
+        super().__init__(registry or MemoryRegistryBackend())
+        self._folders = list(folders)
+        self.task_table = dict(tasks or {})
+    
+    def folders(self):
+        return self._folders
+    
+    def resolve_links(self, paths):
+        links = {}
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    links[path] = fh.read().strip()
+            except OSError:
+                pass
+        return links
+    
+    def tasks(self):
+        return [(path, command, enabled) for path, (command, enabled) in self.task_table.items()]
+    
+    def set_task_enabled(self, path, enabled):
+        if path not in self.task_table:
+            return False
+        self.task_table[path] = (self.task_table[path][0], bool(enabled))
+        return True
 
-# 1. ZUERST: Versuche einfache Paketprüfung
-print("🔍 Starte Ultimate Optimizer...")
 
-try:
-    # Teste ob PySide6 verfügbar ist
-    from PySide6.QtWidgets import *
-    from PySide6.QtCore import *
-    from PySide6.QtGui import *
-    print("✅ PySide6 geladen")
-except ImportError as e:
-    print(f"❌ PySide6 Fehler: {e}")
-    print("\n👉 INSTALLIERE PySide6 mit:")
-    print("pip install PySide6")
-    input("\nDrücke Enter zum Beenden...")
-    sys.exit(1)
+class BootImpactStore:
+    # Gemessene Startkosten pro Programm und Boot, die letzten keep Boots werden gemittelt
+    def __init__(self, db_path=None, keep=5):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'boot_impact.sqlite3')
+        self.keep = keep
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS samples (
+                image TEXT NOT NULL, boot INTEGER NOT NULL, cpu REAL NOT NULL, io INTEGER NOT NULL,
+                PRIMARY KEY (image, boot)
+            ) WITHOUT ROWID
+        """)
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+    
+    def record(self, boot, samples):
+        with self._lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO samples (image, boot, cpu, io) VALUES (?, ?, ?, ?)",
+                                  [(image, boot, cpu, io) for image, (cpu, io) in samples.items()])
+            self.conn.execute("DELETE FROM samples WHERE boot NOT IN "
+                              "(SELECT DISTINCT boot FROM samples ORDER BY boot DESC LIMIT ?)", (self.keep,))
+            self.conn.execute("COMMIT")
+    
+    def averages(self):
+        with self._lock:
+            rows = self.conn.execute("SELECT image, AVG(cpu), AVG(io) FROM samples GROUP BY image").fetchall()
+        return {image: (cpu, io) for image, cpu, io in rows}
 
-try:
-    import psutil
-    print("✅ psutil geladen")
-except ImportError as e:
-    print(f"❌ psutil Fehler: {e}")
-    print("\n👉 INSTALLIERE psutil mit:")
-    print("pip install psutil")
-    input("\nDrücke Enter zum Beenden...")
-    sys.exit(1)
 
-warnings.filterwarnings("ignore")
+def observe_boot(table, images):
+    # CPU-Zeit und gelesene Bytes der Autostart-Programme in diesem Boot. Wer erst nach dem
+    # Startfenster beobachtet wird, wird anteilig auf BOOT_WINDOW heruntergerechnet (Schätzung).
+    boot = psutil.boot_time()
+    wanted = {os.path.normcase(os.path.realpath(i)): i for i in images if i}
+    table.register('exe', 'create_time')
+    try:
+        table.refresh(max_age=1.0)
+        records = table.snapshot()
+    finally:
+        table.unregister('exe', 'create_time')
+    now = time.time()
+    samples = {}
+    for record in records:
+        image = wanted.get(os.path.normcase(record.exe or ''))
+        if image is None or record.create_time is None or record.create_time - boot > BOOT_WINDOW:
+            continue
+        try:
+            with record.proc.oneshot():
+                times = record.proc.cpu_times()
+                io = record.proc.io_counters().read_bytes if hasattr(record.proc, 'io_counters') else 0
+        except psutil.Error:
+            continue
+        scale = min(1.0, BOOT_WINDOW / max(now - record.create_time, 1e-3))
+        cpu, total_io = samples.get(image, (0.0, 0))
+        samples[image] = (cpu + (times.user + times.system) * scale, total_io + int(io * scale))
+    return int(boot), samples
+
 
-class UltimateOptimizer(QMainWindow):
-    def __init__(self):
-        super().__init__()
+class StartupAnalyzer:
+    # Schätzt die Startkosten jedes Autostart-Eintrags aus Programmgröße, gemessener CPU-Zeit
+    # und I/O beim Booten, sortiert absteigend und deaktiviert auf Wunsch nur die teuren –
+    # über StartupApproved bzw. Disable-ScheduledTask, beides mit altem Wert im Journal.
+    def __init__(self, backend, store=None, table=None):
+        self.backend = backend
+        self.store = store
+        self.table = table
+    
+    def analyze(self):
+        items = self.backend.items()
+        if self.store is not None and self.table is not None:
+            boot, samples = observe_boot(self.table, [i.image for i in items])
+            if samples:
+                self.store.record(boot, samples)
+        history = self.store.averages() if self.store is not None else {}
+        for item in items:
+            self.score(item, history.get(item.image))
+        items.sort(key=lambda i: i.cost, reverse=True)
+        return items
+    
+    @staticmethod
+    def score(item, measured=None):
         try:
-            self.is_running = False
-            self.optimization_stats = {
-                'files_deleted': 0, 'registry_changes': 0, 
-                'services_optimized': 0, 'performance_tweaks': 0,
-                'total_optimizations': 0
-            }
-            
-            self.initUI()
-            print("✅ GUI erfolgreich initialisiert")
-        except Exception as e:
-            print(f"❌ Fehler bei GUI-Initialisierung: {e}")
-            QMessageBox.critical(None, "Fehler", f"GUI konnte nicht geladen werden:\n{e}")
-    
-    def initUI(self):
-        # Fenster-Einstellungen
-        self.setWindowTitle("⚡ PC OPTIMIZER v6.0")
-        self.setGeometry(100, 100, 1000, 700)
-        self.setMinimumSize(900, 600)
-        
-        # Einfaches Dark Theme
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0a0a0a;
-            }
-            QWidget {
-                color: #ffffff;
-                font-family: 'Segoe UI';
-                font-size: 12px;
-            }
-        """)
+            item.image_size = os.path.getsize(item.image) if item.image else 0
+        except OSError:
+            item.image_size = 0
+        if measured is not None:
+            item.boot_cpu, item.boot_io = measured
+        # Ohne Messung: das Programm wird mindestens einmal gelesen
+        cpu = item.boot_cpu or 0.0
+        disk = item.boot_io if item.measured else item.image_size
+        item.cost = cpu + disk / BOOT_DISK_BPS
+        item.impact = next((name for name, cpu_min, io_min in STARTUP_IMPACT if cpu >= cpu_min or disk >= io_min),
+                           'niedrig')
+        return item
+    
+    @staticmethod
+    def expensive(items, impact='hoch', protected=()):
+        # Nur aktive, gemessene Einträge; Programme unter den geschützten Pfaden nie
+        levels = [name for name, _, _ in STARTUP_IMPACT] + ['niedrig']
+        limit = levels.index(impact)
+        protected = [os.path.normcase(p) for p in protected if p]
+        return [i for i in items if i.enabled and i.measured and levels.index(i.impact) <= limit
+                and not any(os.path.normcase(i.image or '').startswith(p) for p in protected)]
+    
+    def disable(self, items, apply_registry, journal):
+        # Run/Startordner in einem Registry-Batch (das Journal schreibt der RegistryWriter),
+        # Aufgaben einzeln mit Journal-Eintrag vorab. Ergebnisse über den vollen Pfad zuordnen:
+        # gleichnamige Einträge in HKCU und HKLM sind verschiedene Einträge.
+        # Liefert (anzahl deaktiviert, [(item, fehler), ...]).
+        pending = {}
+        for item in items:
+            if item.approval is not None:
+                hive, kind = item.approval
+                change = RegistryChange(hive, f"{STARTUP_APPROVED}\\{kind}", item.name, _approved_value(False), 'BINARY')
+                pending[change.path.lower()] = (item, change)
+        disabled, failed = 0, []
+        if pending:
+            for diff in apply_registry([change for _, change in pending.values()]):
+                item, _ = pending[diff.change.path.lower()]
+                if diff.status == RegistryDiff.FAILED:
+                    failed.append((item, str(diff.error)))
+                else:
+                    item.enabled = False
+                    disabled += 1
+        tasks = [i for i in items if i.source == 'task']
+        for item in tasks:
+            journal.record('task', item.path, True, False)
+        journal.commit()
+        for item in tasks:
+            if self.backend.set_task_enabled(item.path, False):
+                item.enabled = False
+                disabled += 1
+            else:
+                failed.append((item, "Aufgabe nicht deaktiviert"))
+        return disabled, failed
+
+
+def bench_autostart(count=300, base_dir=None):
+    # Synthetisches Inventar (Run-Schlüssel, Startordner, Aufgaben, Programme als Sparse-Dateien,
+    # Verlauf für zwei Drittel): Ranking prüfen, teure deaktivieren, per Journal zurückrollen
+    # und vergleichen, ob Registry und Aufgaben wieder exakt dem Ausgangszustand entsprechen
+    import random
+    rng = random.Random(42)
+    base_dir = base_dir or tempfile.gettempdir()
+    work = tempfile.mkdtemp(prefix='uo_bench_autostart_', dir=base_dir)
+    results = {}
+    try:
+        images = []
+        for i in range(count):
+            path = os.path.join(work, f"app{i}.exe")
+            with open(path, 'wb') as fh:
+                fh.truncate(int(rng.lognormvariate(13, 1.5)))
+            images.append(path)
+        registry, tasks, folder = {}, {}, os.path.join(work, 'Startup')
+        os.makedirs(folder)
+        for i, image in enumerate(images):
+            kind = i % 6
+            if kind < 3:
+                hive, key, _ = StartupBackend.RUN_KEYS[kind]
+                registry[f"{hive}\\{key}\\App{i}"] = (f'"{image}" --minimized', 'SZ')
+            elif kind == 3:
+                with open(os.path.join(folder, f"App{i}.lnk"), 'w', encoding='utf-8') as fh:
+                    fh.write(image)
+            else:
+                tasks[f"\\Vendor\\App{i}"] = (f"{image} /background", True)
+        # Einige Einträge sind schon deaktiviert
+        for i in range(0, count, 25):
+            if i % 6 < 3:
+                registry[f"HKCU\\{STARTUP_APPROVED}\\Run\\App{i}"] = (_approved_value(False), 'BINARY')
         
-        # Haupt-Widget
-        main_widget = QWidget()
-        self.setCentralWidget(main_widget)
-        main_layout = QHBoxLayout(main_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
-        
-        # ========== LINKER SIDEBAR ==========
-        sidebar = QFrame()
-        sidebar.setFixedWidth(200)
-        sidebar.setStyleSheet("""
-            QFrame {
-                background-color: #111111;
-                border-right: 1px solid #333333;
-            }
-        """)
-        sidebar_layout = QVBoxLayout(sidebar)
-        sidebar_layout.setContentsMargins(10, 20, 10, 20)
-        sidebar_layout.setSpacing(10)
-        
-        # Logo
-        logo_label = QLabel("⚡ OPTIMIZER")
-        logo_label.setStyleSheet("""
-            QLabel {
-                color: #00ffff;
-                font-size: 20px;
-                font-weight: bold;
-                padding: 10px;
-                text-align: center;
-            }
-        """)
-        sidebar_layout.addWidget(logo_label)
-        
-        # Navigation Buttons
-        nav_buttons = [
-            ("🧹 Reinigung", self.show_cleanup_tab),
-            ("🎮 Gaming", self.show_gaming_tab),
-            ("⚡ Leistung", self.show_performance_tab),
-            ("🤖 Automatik", self.show_auto_tab),
-            ("⚙️ Einstellungen", self.show_settings_tab),
-            ("📊 Statistiken", self.show_stats_tab)
-        ]
-        
-        for text, func in nav_buttons:
-            btn = QPushButton(text)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a1a1a;
-                    color: #cccccc;
-                    border: 1px solid #333333;
-                    border-radius: 5px;
-                    padding: 10px;
-                    font-size: 12px;
-                    text-align: left;
-                    padding-left: 15px;
-                }
-                QPushButton:hover {
-                    background-color: #222222;
-                    border-color: #00ffff;
-                }
-                QPushButton:pressed {
-                    background-color: #333333;
-                }
-            """)
-            btn.clicked.connect(func)
-            sidebar_layout.addWidget(btn)
-        
-        sidebar_layout.addStretch()
-        
-        # System Status
-        status_frame = QFrame()
-        status_frame.setStyleSheet("""
-            QFrame {
-                background-color: #151515;
-                border: 1px solid #333333;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
-        status_layout = QVBoxLayout(status_frame)
-        
-        self.cpu_label = QLabel("⚡ CPU: --%")
-        self.cpu_label.setStyleSheet("color: #00ff00; font-size: 11px; font-weight: bold;")
-        status_layout.addWidget(self.cpu_label)
-        
-        self.ram_label = QLabel("💾 RAM: --%")
-        self.ram_label.setStyleSheet("color: #00aaff; font-size: 11px; font-weight: bold;")
-        status_layout.addWidget(self.ram_label)
-        
-        self.disk_label = QLabel("💿 C: -- GB frei")
-        self.disk_label.setStyleSheet("color: #ff9900; font-size: 11px; font-weight: bold;")
-        status_layout.addWidget(self.disk_label)
-        
-        sidebar_layout.addWidget(status_frame)
-        
-        # Quick Actions
-        quick_frame = QFrame()
-        quick_frame.setStyleSheet("margin-top: 10px;")
-        quick_layout = QVBoxLayout(quick_frame)
-        
-        optimize_btn = QPushButton("🚀 One-Click Optimieren")
-        optimize_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #00aa00;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 12px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #00cc00;
-            }
-        """)
-        optimize_btn.clicked.connect(self.ultimate_one_click_optimization)
-        quick_layout.addWidget(optimize_btn)
-        
-        emergency_btn = QPushButton("🛑 Notstopp")
-        emergency_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #aa0000;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 10px;
-                font-size: 11px;
-                margin-top: 5px;
-            }
-            QPushButton:hover {
-                background-color: #cc0000;
-            }
-        """)
-        emergency_btn.clicked.connect(self.emergency_restore)
-        quick_layout.addWidget(emergency_btn)
-        
-        sidebar_layout.addWidget(quick_frame)
-        
-        # ========== HAUPTBEREICH ==========
-        main_content = QWidget()
-        main_content.setStyleSheet("background-color: #0f0f0f;")
-        content_layout = QVBoxLayout(main_content)
-        content_layout.setContentsMargins(15, 15, 15, 15)
-        content_layout.setSpacing(10)
-        
-        # Header
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background-color: #111111;
-                border: 1px solid #333333;
-                border-radius: 5px;
-                padding: 15px;
-            }
-        """)
-        header_layout = QHBoxLayout(header)
-        
-        self.header_title = QLabel("ULTIMATE PC OPTIMIZER")
-        self.header_title.setStyleSheet("""
-            QLabel {
-                font-size: 20px;
-                font-weight: bold;
-                color: #ffffff;
-            }
-        """)
-        header_layout.addWidget(self.header_title)
-        
-        header_layout.addStretch()
-        
-        self.status_indicator = QLabel("● Bereit")
-        self.status_indicator.setStyleSheet("""
-            QLabel {
-                color: #00ff00;
-                font-size: 12px;
-                font-weight: bold;
-                padding: 5px 15px;
-                background-color: #1a1a1a;
-                border-radius: 15px;
-                border: 1px solid #333333;
-            }
-        """)
-        header_layout.addWidget(self.status_indicator)
+        backend = FakeStartupBackend(MemoryRegistryBackend(registry), [('HKCU', folder)], tasks)
+        store = BootImpactStore(os.path.join(work, 'boot.sqlite3'))
+        for boot in range(3):
+            store.record(1_700_000_000 + boot * 86400,
+                         {image: (rng.expovariate(2.0), int(rng.expovariate(1 / (2 * 1024**2))))
+                          for image in images if rng.random() < 0.66})
         
-        content_layout.addWidget(header)
+        t0 = time.perf_counter()
+        items = StartupAnalyzer(backend, store).analyze()
+        results['analyze'] = {'items': len(items), 'elapsed': round(time.perf_counter() - t0, 4),
+                              'sorted': all(a.cost >= b.cost for a, b in zip(items, items[1:])),
+                              'impact': dict(collections.Counter(i.impact for i in items)),
+                              'measured': sum(1 for i in items if i.measured)}
+        print(f"Analyse: {len(items)} Einträge in {results['analyze']['elapsed']:.3f}s, {results['analyze']['impact']}")
         
-        # Tab Widget
-        self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #222222;
-                background-color: #111111;
-                border-radius: 5px;
-            }
-            QTabBar::tab {
-                background-color: #1a1a1a;
-                color: #cccccc;
-                padding: 10px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 5px;
-                border-top-right-radius: 5px;
-                font-size: 12px;
-            }
-            QTabBar::tab:selected {
-                background-color: #00aaaa;
-                color: #000000;
-                font-weight: bold;
-            }
-            QTabBar::tab:hover {
-                background-color: #333333;
-            }
-        """)
+        before_registry, before_tasks = dict(backend.registry.values), dict(backend.task_table)
+        journal = ChangeJournal(MemoryJournalBackend())
+        writer = RegistryWriter(backend.registry, journal)
+        expensive = StartupAnalyzer.expensive(items)
+        disabled, failed = StartupAnalyzer(backend).disable(expensive, writer.apply_batch, journal)
+        after = {i.path: i.enabled for i in StartupAnalyzer(backend).analyze()}
+        results['disable'] = {'expensive': len(expensive), 'disabled': disabled, 'failed': len(failed),
+                              'all_off': not any(after[i.path] for i in expensive)}
         
-        # Tabs erstellen
-        self.tab_widget.addTab(self.create_cleanup_tab(), "🧹 Reinigung")
-        self.tab_widget.addTab(self.create_gaming_tab(), "🎮 Gaming")
-        self.tab_widget.addTab(self.create_performance_tab(), "⚡ Leistung")
-        self.tab_widget.addTab(self.create_auto_tab(), "🤖 Automatik")
-        self.tab_widget.addTab(self.create_settings_tab(), "⚙️ Einstellungen")
-        self.tab_widget.addTab(self.create_stats_tab(), "📊 Statistiken")
-        
-        content_layout.addWidget(self.tab_widget)
-        
-        # Footer
-        footer = QFrame()
-        footer.setStyleSheet("""
-            QFrame {
-                background-color: #111111;
-                border: 1px solid #222222;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
-        footer_layout = QVBoxLayout(footer)
-        
-        # Fortschritt
-        self.progress_frame = QFrame()
-        self.progress_frame.setVisible(False)
-        progress_layout = QVBoxLayout(self.progress_frame)
-        
-        self.progress_label = QLabel("Optimierung läuft...")
-        self.progress_label.setStyleSheet("color: #00ffff; font-size: 12px;")
-        progress_layout.addWidget(self.progress_label)
-        
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #333333;
-                border-radius: 3px;
-                text-align: center;
-                height: 20px;
-                color: white;
-            }
-            QProgressBar::chunk {
-                background-color: #00aa00;
-                border-radius: 3px;
-            }
-        """)
-        progress_layout.addWidget(self.progress_bar)
-        
-        footer_layout.addWidget(self.progress_frame)
-        
-        # Log
-        self.log_text = QTextEdit()
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #0a0a0a;
-                color: #cccccc;
-                border: 1px solid #222222;
-                border-radius: 3px;
-                padding: 8px;
-                font-family: 'Consolas';
-                font-size: 10px;
-            }
-        """)
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(100)
-        footer_layout.addWidget(self.log_text)
+        t0 = time.perf_counter()
+        replayer = JournalReplayer(lambda changes: writer.apply_batch(changes, record=False), None,
+                                   handlers={'task': backend.restore_task})
+        restored = replayer.replay(journal)
+        results['rollback'] = {'restored': restored['restored'], 'elapsed': round(time.perf_counter() - t0, 4),
+                               'identical': backend.registry.values == before_registry and backend.task_table == before_tasks}
+        print(f"{disabled} teure Einträge deaktiviert, Rücknahme in {results['rollback']['elapsed']:.3f}s, "
+              f"Zustand identisch: {results['rollback']['identical']}")
+        store.close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+# ========== DIENSTE ==========
+
+SERVICE_START_TYPES = ('Automatic', 'AutomaticDelayedStart', 'Manual', 'Disabled', 'Boot', 'System')
+# Starttyp -> "sc.exe config <name> start= <wert>"
+_SC_START = {'Automatic': 'auto', 'AutomaticDelayedStart': 'delayed-auto', 'Manual': 'demand',
+             'Disabled': 'disabled', 'Boot': 'boot', 'System': 'system'}
+
+
+class ServiceInfo:
+    __slots__ = ('name', 'display', 'start', 'running', 'pid')
+    
+    def __init__(self, name, start, running=False, pid=None, display=None):
+        self.name = name
+        self.display = display or name
+        self.start = start
+        self.running = running
+        self.pid = pid or None
+    
+    def __repr__(self):
+        return f"ServiceInfo({self.name}, {self.start})"
+
+
+class ServiceBackend:
+    # Schnittstelle zum Dienst-Manager: services() listet alle Dienste mit Starttyp und PID,
+    # apply() setzt die Starttypen eines ganzen Stapels in einem Aufruf
+    def services(self):
+        raise NotImplementedError
+    
+    def apply(self, changes):
+        raise NotImplementedError  # [(name, starttyp)] -> {name: (ok, detail)}
+    
+    def restore_entry(self, entry):
+        # Für JournalReplayer: alten Starttyp eines Dienstes wiederherstellen
+        return self.apply([(entry['target'], entry['old'])]).get(entry['target'], (False, "keine Antwort"))
+
+
+class ScmServiceBackend(ServiceBackend):
+    # Windows: Dienstliste über Win32_Service (inkl. verzögertem Start), Änderungen per sc.exe,
+    # alles in je einem PowerShell-Skript
+    def __init__(self, run_shell):
+        self.run_shell = run_shell
+    
+    def _query(self, script):
+        result = self.run_shell(script + "\nWrite-Output ($r | ConvertTo-Json -Compress -Depth 3)")
+        line = next((l for l in result.output.splitlines() if l.startswith(('{', '['))), None)
+        return json.loads(line) if line else None
+    
+    def services(self):
+        data = self._query(
+            "$r = @(Get-CimInstance Win32_Service | ForEach-Object { $s = [string]$_.StartMode; "
+            "if ($s -eq 'Auto') { $s = if ($_.DelayedAutoStart) { 'AutomaticDelayedStart' } else { 'Automatic' } }; "
+            "@{ name = $_.Name; display = $_.DisplayName; start = $s; running = ($_.State -eq 'Running'); pid = [int]$_.ProcessId } })")
+        if isinstance(data, dict):
+            data = [data]
+        return [ServiceInfo(s['name'], s['start'], s['running'], s['pid'], s['display']) for s in data or []]
+    
+    def apply(self, changes):
+        if not changes:
+            return {}
+        script = ("$r = @{}\n"
+                  "function Set-Start($n, $s, $stop) { if ($stop) { Stop-Service -Name $n -Force -ErrorAction SilentlyContinue }; "
+                  "$o = & sc.exe config $n start= $s 2>&1; $r[$n] = @($LASTEXITCODE, ([string]$o).Trim()) }\n")
+        for name, start in changes:
+            stop = '$true' if start == 'Disabled' else '$false'
+            script += f"Set-Start '{name.replace(chr(39), chr(39) * 2)}' '{_SC_START[start]}' {stop}\n"
+        data = self._query(script) or {}
+        results = {}
+        for name, _ in changes:
+            code, output = data.get(name, (None, "keine Antwort"))
+            results[name] = (code == 0, output or "OK")
+        return results
+
+
+class SystemdFakeServiceBackend(ServiceBackend):
+    # Für Linux, Tests und Benchmarks: Unit-Tabelle im Speicher wie systemctl list-units sie
+    # liefern würde, mit Windows-Starttypen; PIDs dürfen echte Prozesse sein
+    def __init__(self, units=None):
+        self.units = {name: dict(unit) for name, unit in (units or {}).items()}
+        self.apply_calls = 0
+    
+    def services(self):
+        return [ServiceInfo(name, u['start'], u.get('running', False), u.get('pid'))
+                for name, u in self.units.items()]
+    
+    def apply(self, changes):
+        self.apply_calls += 1
+        results = {}
+        for name, start in changes:
+            unit = self.units.get(name)
+            if unit is None or start not in SERVICE_START_TYPES:
+                results[name] = (False, "unbekannte Unit" if unit is None else f"unbekannter Starttyp '{start}'")
+                continue
+            unit['start'] = start
+            if start == 'Disabled':
+                unit['running'], unit['pid'] = False, None
+            results[name] = (True, "OK")
+        return results
+
+
+class ServiceUsage:
+    __slots__ = ('cpu_percent', 'rss', 'wakeups', 'observed')
+    
+    def __init__(self, cpu_percent=0.0, rss=0, wakeups=0.0, observed=0.0):
+        self.cpu_percent = cpu_percent  # Prozent eines Kerns
+        self.rss = rss
+        self.wakeups = wakeups  # freiwillige Kontextwechsel pro Sekunde
+        self.observed = observed
+
+
+class ServiceSampler:
+    # Misst CPU, RSS und Aufwachvorgänge (freiwillige Kontextwechsel) aller laufenden Dienste
+    # in einem eigenen Hintergrund-Thread über ein gleitendes Fenster. Die Dienstliste wird
+    # nur alle list_interval Sekunden neu gelesen; teilen sich Dienste einen Host-Prozess
+    # (svchost), wird dessen Verbrauch gleichmäßig aufgeteilt.
+    def __init__(self, backend, interval=5.0, list_interval=60.0, window=900.0, log=None):
+        self.backend = backend
+        self.interval = interval
+        self.log = log or (lambda message, level="INFO": None)
+        self.list_interval = list_interval
+        self.window = window
+        self.cpu_time = 0.0
+        self.samples = 0
+        self._services = None
+        self._listed = 0.0
+        self._procs = {}
+        self._last = {}
+        self._history = collections.defaultdict(collections.deque)
+        self._first = None
+        self._now = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ServiceSampler", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    @property
+    def running(self):
+        return self._thread is not None
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.log(f"❌ Dienst-Monitor Fehler: {e}", "ERROR")
+            self._stop.wait(self.interval)
+    
+    def invalidate(self):
+        # Nach Änderungen die Dienstliste beim nächsten Tick neu lesen
+        self._services = None
+    
+    def services(self):
+        if self._services is None:
+            self._services = self.backend.services()
+            self._listed = time.time()
+        return self._services
+    
+    def sample(self, now=None):
+        cost = time.thread_time()
+        now = time.time() if now is None else now
+        if self._services is not None and now - self._listed >= self.list_interval:
+            self._services = None
+        by_pid = collections.defaultdict(list)
+        for service in self.services():
+            if service.running and service.pid:
+                by_pid[service.pid].append(service.name)
+        
+        rows = []
+        for pid, names in by_pid.items():
+            try:
+                proc = self._procs.get(pid)
+                if proc is None:
+                    proc = self._procs[pid] = psutil.Process(pid)
+                elif not proc.is_running():  # PID wiederverwendet
+                    raise psutil.NoSuchProcess(pid)
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    rss = proc.memory_info().rss
+                    ctx = proc.num_ctx_switches().voluntary
+            except psutil.Error:
+                self._procs.pop(pid, None)
+                self._last.pop(pid, None)
+                continue
+            cpu = times.user + times.system
+            last = self._last.get(pid)
+            self._last[pid] = (now, cpu, ctx)
+            if last is not None and now > last[0]:
+                share = len(names)
+                for name in names:
+                    rows.append((name, (now, now - last[0], max(0.0, cpu - last[1]) / share,
+                                        rss // share, max(0, ctx - last[2]) / share)))
+        for pid in set(self._procs) - set(by_pid):
+            self._procs.pop(pid, None)
+            self._last.pop(pid, None)
+        
+        cutoff = now - self.window
+        with self._lock:
+            if self._first is None:
+                self._first = now
+            for name, row in rows:
+                self._history[name].append(row)
+            for name in list(self._history):
+                history = self._history[name]
+                while history and history[0][0] < cutoff:
+                    history.popleft()
+                if not history:
+                    del self._history[name]
+            self._now = now
+        self.samples += 1
+        self.cpu_time += time.thread_time() - cost
+    
+    @property
+    def observed(self):
+        # Wie viele Sekunden Verlauf im Fenster liegen
+        with self._lock:
+            if self._first is None:
+                return 0.0
+            return min(self.window, self._now - self._first)
+    
+    def usage(self):
+        result = {}
+        with self._lock:
+            for name, history in self._history.items():
+                seconds = sum(row[1] for row in history)
+                if seconds <= 0:
+                    continue
+                result[name] = ServiceUsage(100.0 * sum(row[2] for row in history) / seconds,
+                                            sum(row[3] for row in history) // len(history),
+                                            sum(row[4] for row in history) / seconds, seconds)
+        return result
+
+
+class ServiceDecision:
+    __slots__ = ('name', 'old', 'new', 'score', 'usage')
+    
+    def __init__(self, name, old, new, score, usage):
+        self.name = name
+        self.old = old
+        self.new = new
+        self.score = score
+        self.usage = usage
+    
+    def __repr__(self):
+        return f"ServiceDecision({self.name}: {self.old} -> {self.new})"
+
+
+class ServicePolicy:
+    # Geschützte Dienste werden nie angefasst. Dienste der Abschaltliste werden deaktiviert,
+    # sobald sie die (niedrigen) disable-Schwellen reißen; alle übrigen automatisch startenden
+    # Dienste bekommen über den delay-Schwellen nur verzögerten Start. Schwellen: cpu_percent
+    # (Prozent eines Kerns), rss_mb, wakeups pro Sekunde.
+    METRICS = ('cpu_percent', 'rss_mb', 'wakeups')
+    
+    def __init__(self, spec):
+        self.protect = tuple(p.lower() for p in spec.get('protect', ()))
+        self.disable = tuple(p.lower() for p in spec.get('disable', ()))
+        self.thresholds = {}
+        for action in ('disable', 'delay'):
+            limits = spec.get('thresholds', {}).get(action, {})
+            unknown = set(limits) - set(self.METRICS)
+            if unknown:
+                raise ValueError(f"Dienst-Schwellen '{action}': unbekannt {', '.join(sorted(unknown))}")
+            self.thresholds[action] = {k: float(v) for k, v in limits.items() if v}
+        self.min_observed = float(spec.get('min_observed', 30))
+    
+    @classmethod
+    def load(cls, path=None):
+        # Richtlinie steht im Tweak-Katalog unter "services"
+        with open(path or CATALOG_PATH, encoding='utf-8') as fh:
+            data = json.load(fh)
+        return cls(data.get('services', {}))
+    
+    @staticmethod
+    def _matches(patterns, name):
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, p) for p in patterns)
+    
+    def score(self, usage, action):
+        # >= 1: mindestens eine Schwelle überschritten
+        values = {'cpu_percent': usage.cpu_percent, 'rss_mb': usage.rss / 1024**2, 'wakeups': usage.wakeups}
+        return max((values[k] / limit for k, limit in self.thresholds[action].items()), default=0.0)
+    
+    def decide(self, services, usage):
+        decisions = []
+        for service in services:
+            measured = usage.get(service.name)
+            if measured is None or measured.observed < self.min_observed or self._matches(self.protect, service.name):
+                continue
+            if self._matches(self.disable, service.name):
+                action, new = 'disable', 'Disabled'
+                if service.start == 'Disabled':
+                    continue
+            elif service.start == 'Automatic':
+                action, new = 'delay', 'AutomaticDelayedStart'
+            else:
+                continue
+            score = self.score(measured, action)
+            if score >= 1.0:
+                decisions.append(ServiceDecision(service.name, service.start, new, score, measured))
+        decisions.sort(key=lambda d: d.score, reverse=True)
+        return decisions
+
+
+def apply_service_plan(backend, decisions, journal):
+    # Alte Starttypen zuerst ins Journal, dann alle Änderungen in einem Aufruf
+    for decision in decisions:
+        journal.record('service', decision.name, decision.old, decision.new)
+    journal.commit()
+    return backend.apply([(d.name, d.new) for d in decisions])
+
+
+def bench_services(count=40, duration=6.0, interval=0.5):
+    # Echte Kindprozesse als Dienst-PIDs: je ein CPU-, Speicher- und Aufwach-Fresser, der Rest
+    # schläft. Prüft, dass genau die erwarteten Dienste betroffen sind (geschützte und manuelle
+    # nie), dass alles in einem apply-Aufruf landet und das Journal den Ausgangszustand herstellt.
+    loads = {
+        'cpu': "while True: pass",
+        'memory': "import time; b = bytearray(200 * 1024**2); b[::4096] = b'x' * len(b[::4096]); time.sleep(600)",
+        'wakeups': "import time\nwhile True: time.sleep(0.001)",
+    }
+    sleeper = shutil.which('sleep')
+    idle = [sleeper, '600'] if sleeper else [sys.executable, '-c', 'import time; time.sleep(600)']
+    spawn = lambda argv: subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    # name: (starttyp, last) – erwartet: Updater/Cache verzögert, DiagTrack aus
+    layout = {
+        'vendor-updater': ('Automatic', 'cpu'),
+        'vendor-cache': ('Automatic', 'memory'),
+        'DiagTrack': ('Automatic', 'wakeups'),
+        'sshd': ('Automatic', 'cpu'),           # geschützt
+        'vendor-helper': ('Manual', 'memory'),   # manuell -> bleibt
+        'MapsBroker': ('Automatic', None),       # Abschaltliste, aber ruhig
+    }
+    expected = {'vendor-updater': 'AutomaticDelayedStart', 'vendor-cache': 'AutomaticDelayedStart',
+                'DiagTrack': 'Disabled'}
+    children = []
+    results = {}
+    try:
+        units = {}
+        for name, (start, load) in layout.items():
+            child = spawn([sys.executable, '-c', loads[load]] if load else idle)
+            children.append(child)
+            units[name] = {'start': start, 'running': True, 'pid': child.pid}
+        for i in range(max(0, count - len(units))):
+            child = spawn(idle)
+            children.append(child)
+            units[f"idle-{i}.service"] = {'start': 'Automatic', 'running': True, 'pid': child.pid}
         
-        content_layout.addWidget(footer)
+        backend = SystemdFakeServiceBackend(units)
+        policy = ServicePolicy.load()
+        policy.min_observed = duration / 2
+        sampler = ServiceSampler(backend, interval=interval)
+        sampler.start()
+        time.sleep(duration)
+        sampler.stop()
+        results['sampler'] = {'services': len(units), 'ticks': sampler.samples,
+                              'ms_per_tick': round(1000 * sampler.cpu_time / max(sampler.samples, 1), 2),
+                              'observed': round(sampler.observed, 2)}
+        print(f"Sampler: {len(units)} Dienste, {sampler.samples} Ticks, "
+              f"{results['sampler']['ms_per_tick']:.2f} ms CPU pro Tick")
         
-        # Alles zusammenfügen
-        main_layout.addWidget(sidebar)
-        main_layout.addWidget(main_content)
+        usage = sampler.usage()
+        decisions = policy.decide(sampler.services(), usage)
+        for d in decisions:
+            print(f"  {d.name}: {d.old} -> {d.new} (Score {d.score:.1f}, CPU {d.usage.cpu_percent:.1f}%, "
+                  f"RSS {format_bytes(d.usage.rss)}, {d.usage.wakeups:.0f} Wakeups/s)")
+        results['decisions'] = {d.name: d.new for d in decisions}
+        results['expected'] = results['decisions'] == expected
         
-        # System Monitor starten
-        self.update_system_monitor()
-        self.monitor_timer = QTimer()
-        self.monitor_timer.timeout.connect(self.update_system_monitor)
-        self.monitor_timer.start(2000)
+        before = {name: unit['start'] for name, unit in backend.units.items()}
+        journal = ChangeJournal(MemoryJournalBackend())
+        applied = apply_service_plan(backend, decisions, journal)
+        results['apply'] = {'changed': sum(1 for ok, _ in applied.values() if ok), 'calls': backend.apply_calls}
         
-        self.log_message("🔥 Ultimate Optimizer gestartet", "SUCCESS")
+        replayer = JournalReplayer(None, None, handlers={'service': backend.restore_entry})
+        restored = replayer.replay(journal)
+        results['rollback'] = {'restored': restored['restored'],
+                               'identical': {name: u['start'] for name, u in backend.units.items()} == before}
+        print(f"Entscheidungen wie erwartet: {results['expected']}, {results['apply']['changed']} Änderungen in "
+              f"{results['apply']['calls']} Aufruf, Rücknahme identisch: {results['rollback']['identical']}")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+    return results
+
+
+# ========== BENCHMARK-SUITE ==========
+
+# t-Verteilung (zweiseitig, 95%) für kleine Stichproben, danach Normalverteilung
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def t_critical(df):
+    if df <= 0:
+        return float('inf')
+    for limit in sorted(_T95):
+        if df <= limit:
+            return _T95[limit]
+    return 1.96
+
+
+class Measurement:
+    __slots__ = ('name', 'unit', 'higher_is_better', 'samples')
     
-    def update_system_monitor(self):
-        try:
-            cpu = psutil.cpu_percent()
-            self.cpu_label.setText(f"⚡ CPU: {cpu:.0f}%")
-            
-            ram = psutil.virtual_memory()
-            self.ram_label.setText(f"💾 RAM: {ram.percent:.0f}%")
-            
-            disk = psutil.disk_usage('C:\\')
-            free_gb = disk.free / (1024**3)
-            self.disk_label.setText(f"💿 C: {free_gb:.1f} GB frei")
-        except Exception as e:
-            print(f"Monitor Fehler: {e}")
+    def __init__(self, name, unit, higher_is_better, samples):
+        self.name = name
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.samples = list(samples)
     
-    def log_message(self, message, level="INFO"):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        color = "#888888"
-        if level == "SUCCESS": color = "#00ff00"
-        elif level == "ERROR": color = "#ff5555"
-        elif level == "WARNING": color = "#ffff00"
-        
-        self.log_text.append(f"[{timestamp}] <span style='color: {color}'>{message}</span>")
-        print(f"[{timestamp}] {message}")
+    @property
+    def mean(self):
+        return statistics.fmean(self.samples) if self.samples else 0.0
     
-    def show_progress(self, show=True):
-        self.progress_frame.setVisible(show)
+    @property
+    def ci95(self):
+        # Halbe Breite des 95%-Konfidenzintervalls
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        return t_critical(n - 1) * statistics.stdev(self.samples) / n ** 0.5
     
-    def update_progress(self, value, text=""):
-        self.progress_bar.setValue(value)
-        if text:
-            self.progress_label.setText(text)
-    
-    # ========== TAB ERSTELLUNG ==========
-    
-    def create_cleanup_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        # Scroll Area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        
-        # Reinigungsoptionen
-        cleanup_options = [
-            ("🗑️ Temp Dateien löschen", self.deep_temp_clean, "#00ffff"),
-            ("💾 Festplatte optimieren", self.disk_optimization, "#00aaff"),
-            ("📦 System Müll entfernen", self.system_junk_clean, "#ff9900"),
-            ("🔍 Registry bereinigen", self.registry_cleanup, "#aa00ff"),
-        ]
-        
-        for title, func, color in cleanup_options:
-            frame = QFrame()
-            frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #1a1a1a;
-                    border: 1px solid {color};
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 5px;
-                }}
-            """)
-            frame_layout = QVBoxLayout(frame)
-            
-            label = QLabel(title)
-            label.setStyleSheet(f"color: {color}; font-size: 14px; font-weight: bold;")
-            frame_layout.addWidget(label)
-            
-            btn = QPushButton("Starten")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #222222;
-                    color: {color};
-                    border: 1px solid {color};
-                    border-radius: 3px;
-                    padding: 8px;
-                    font-size: 12px;
-                    margin-top: 10px;
-                }}
-                QPushButton:hover {{
-                    background-color: #333333;
-                }}
-            """)
-            btn.clicked.connect(func)
-            frame_layout.addWidget(btn)
-            
-            scroll_layout.addWidget(frame)
-        
-        scroll_layout.addStretch()
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
-        return tab
-    
-    def create_gaming_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        
-        gaming_options = [
-            ("🔄 Gaming Modus aktivieren", self.ultimate_gaming_mode, "#ff00ff"),
-            ("🎯 GPU optimieren", self.gpu_ultimate_tweaks, "#00ffff"),
-            ("⚡ CPU Gaming", self.cpu_gaming_optimization, "#00ff00"),
-            ("🌐 Netzwerk Gaming", self.network_gaming_tweaks, "#0088ff"),
-        ]
-        
-        for title, func, color in gaming_options:
-            frame = QFrame()
-            frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #1a1a1a;
-                    border: 1px solid {color};
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 5px;
-                }}
-            """)
-            frame_layout = QVBoxLayout(frame)
-            
-            label = QLabel(title)
-            label.setStyleSheet(f"color: {color}; font-size: 14px; font-weight: bold;")
-            frame_layout.addWidget(label)
-            
-            btn = QPushButton("Anwenden")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #222222;
-                    color: {color};
-                    border: 1px solid {color};
-                    border-radius: 3px;
-                    padding: 8px;
-                    font-size: 12px;
-                    margin-top: 10px;
-                }}
-                QPushButton:hover {{
-                    background-color: #333333;
-                }}
-            """)
-            btn.clicked.connect(func)
-            frame_layout.addWidget(btn)
-            
-            scroll_layout.addWidget(frame)
-        
-        scroll_layout.addStretch()
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
-        return tab
-    
-    def create_performance_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        
-        perf_options = [
-            ("🚀 Windows Dienste optimieren", self.optimize_windows_services_ultimate, "#00ff00"),
-            ("💾 Festplatten-Tweaks", self.disk_performance_tweaks, "#00aaff"),
-            ("🎯 System Responsiveness", self.system_responsiveness, "#ffff00"),
-            ("🔧 Visuelle Effekte", self.visual_performance_tweaks, "#ff9900"),
-        ]
-        
-        for title, func, color in perf_options:
-            frame = QFrame()
-            frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #1a1a1a;
-                    border: 1px solid {color};
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 5px;
-                }}
-            """)
-            frame_layout = QVBoxLayout(frame)
-            
-            label = QLabel(title)
-            label.setStyleSheet(f"color: {color}; font-size: 14px; font-weight: bold;")
-            frame_layout.addWidget(label)
-            
-            btn = QPushButton("Optimieren")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #222222;
-                    color: {color};
-                    border: 1px solid {color};
-                    border-radius: 3px;
-                    padding: 8px;
-                    font-size: 12px;
-                    margin-top: 10px;
-                }}
-                QPushButton:hover {{
-                    background-color: #333333;
-                }}
-            """)
-            btn.clicked.connect(func)
-            frame_layout.addWidget(btn)
-            
-            scroll_layout.addWidget(frame)
-        
-        scroll_layout.addStretch()
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
-        return tab
-    
-    def create_auto_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        
-        auto_options = [
-            ("🏎️ Extreme Gaming", self.extreme_gaming_mode, "#ff00ff"),
-            ("⚡ Ultimate Performance", self.ultimate_performance_mode, "#00ff00"),
-            ("🔧 Balanced", self.balanced_optimization, "#00aaff"),
-            ("🧹 Clean Install", self.complete_clean_install, "#ff9900"),
-        ]
-        
-        for title, func, color in auto_options:
-            frame = QFrame()
-            frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #1a1a1a;
-                    border: 1px solid {color};
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 5px;
-                }}
-            """)
-            frame_layout = QVBoxLayout(frame)
-            
-            label = QLabel(title)
-            label.setStyleSheet(f"color: {color}; font-size: 14px; font-weight: bold;")
-            frame_layout.addWidget(label)
-            
-            btn = QPushButton("Aktivieren")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #222222;
-                    color: {color};
-                    border: 1px solid {color};
-                    border-radius: 3px;
-                    padding: 8px;
-                    font-size: 12px;
-                    margin-top: 10px;
-                }}
-                QPushButton:hover {{
-                    background-color: #333333;
-                }}
-            """)
-            btn.clicked.connect(func)
-            frame_layout.addWidget(btn)
-            
-            scroll_layout.addWidget(frame)
-        
-        # Smart Scan
-        scan_frame = QFrame()
-        scan_frame.setStyleSheet("""
-            QFrame {
-                background-color: #1a1a1a;
-                border: 1px solid #00ffff;
-                border-radius: 5px;
-                padding: 15px;
-                margin: 5px;
-            }
-        """)
-        scan_layout = QVBoxLayout(scan_frame)
-        
-        scan_label = QLabel("🔍 Smart System Scan")
-        scan_label.setStyleSheet("color: #00ffff; font-size: 14px; font-weight: bold;")
-        scan_layout.addWidget(scan_label)
-        
-        scan_btn = QPushButton("System analysieren")
-        scan_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #222222;
-                color: #00ffff;
-                border: 1px solid #00ffff;
-                border-radius: 3px;
-                padding: 8px;
-                font-size: 12px;
-                margin-top: 10px;
-            }
-            QPushButton:hover {
-                background-color: #333333;
-            }
-        """)
-        scan_btn.clicked.connect(self.smart_system_scan)
-        scan_layout.addWidget(scan_btn)
-        
-        scroll_layout.addWidget(scan_frame)
-        scroll_layout.addStretch()
-        
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
-        return tab
-    
-    def create_settings_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        
-        # Einstellungen
-        settings = [
-            ("🔒 Im sicheren Modus optimieren", True),
-            ("💾 Automatische Backups", True),
-            ("🗑️ Auto Temp-Bereinigung", True),
-            ("🗜️ Backups komprimieren", True),
-        ]
-        
-        self.settings_checkboxes = []
-        
-        for text, default in settings:
-            cb = QCheckBox(text)
-            cb.setStyleSheet("color: #cccccc; font-size: 13px;")
-            cb.setChecked(default)
-            self.settings_checkboxes.append(cb)
-            scroll_layout.addWidget(cb)
-        
-        scroll_layout.addStretch()
-        
-        # Save Button
-        save_btn = QPushButton("💾 Einstellungen speichern")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #00aa00;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 12px;
-                font-size: 13px;
-                font-weight: bold;
-                margin-top: 20px;
-            }
-            QPushButton:hover {
-                background-color: #00cc00;
-            }
-        """)
-        save_btn.clicked.connect(self.save_settings)
-        scroll_layout.addWidget(save_btn)
-        
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
-        
-        return tab
-    
-    def create_stats_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        
-        # Stats Grid
-        grid = QGridLayout()
-        
-        stats = [
-            ("Dateien gelöscht", "files_deleted", "#00ff00"),
-            ("Registry-Änderungen", "registry_changes", "#ff00ff"),
-            ("Dienste optimiert", "services_optimized", "#00ffff"),
-            ("Performance-Tweaks", "performance_tweaks", "#ffff00"),
-        ]
-        
-        row, col = 0, 0
-        for name, key, color in stats:
-            frame = QFrame()
-            frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #1a1a1a;
-                    border: 1px solid {color};
-                    border-radius: 5px;
-                    padding: 15px;
-                }}
-            """)
-            frame_layout = QVBoxLayout(frame)
-            
-            value = self.optimization_stats.get(key, 0)
-            value_label = QLabel(str(value))
-            value_label.setStyleSheet(f"color: {color}; font-size: 24px; font-weight: bold;")
-            value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            frame_layout.addWidget(value_label)
-            
-            name_label = QLabel(name)
-            name_label.setStyleSheet("color: #888888; font-size: 12px;")
-            name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            frame_layout.addWidget(name_label)
-            
-            grid.addWidget(frame, row, col)
-            col += 1
-            if col > 1:
-                col = 0
-                row += 1
-        
-        layout.addLayout(grid)
-        
-        # Export Buttons
-        btn_frame = QFrame()
-        btn_layout = QHBoxLayout(btn_frame)
-        
-        export_csv = QPushButton("📄 CSV Export")
-        export_csv.setStyleSheet("""
-            QPushButton {
-                background-color: #333333;
-                color: #00ff00;
-                border: 1px solid #00aa00;
-                border-radius: 3px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #444444;
-            }
-        """)
-        export_csv.clicked.connect(self.export_stats_csv)
-        btn_layout.addWidget(export_csv)
-        
-        export_report = QPushButton("📊 Report erstellen")
-        export_report.setStyleSheet("""
-            QPushButton {
-                background-color: #333333;
-                color: #ff5555;
-                border: 1px solid #aa0000;
-                border-radius: 3px;
-                padding: 8px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #444444;
-            }
+    def as_dict(self):
+        return {'name': self.name, 'unit': self.unit, 'mean': self.mean, 'ci95': self.ci95,
+                'n': len(self.samples), 'higher_is_better': self.higher_is_better}
+
+
+class BenchmarkDelta:
+    __slots__ = ('name', 'unit', 'before', 'after', 'change', 'significant', 'improved')
+    
+    def __init__(self, before, after):
+        self.name = before.name
+        self.unit = before.unit
+        self.before = before
+        self.after = after
+        self.change = (after.mean - before.mean) / before.mean * 100 if before.mean else 0.0
+        # Signifikant, wenn sich die Konfidenzintervalle nicht überlappen
+        self.significant = abs(after.mean - before.mean) > before.ci95 + after.ci95
+        self.improved = (after.mean > before.mean) == before.higher_is_better
+    
+    def as_dict(self):
+        return {'name': self.name, 'unit': self.unit, 'before': self.before.as_dict(),
+                'after': self.after.as_dict(), 'change_percent': self.change,
+                'significant': self.significant, 'improved': self.improved}
+
+
+def _wl_file_churn(work_dir, count=200):
+    # Dateien/s für Anlegen + Löschen kleiner Dateien
+    payload = b"x" * 512
+    paths = [os.path.join(work_dir, f"churn_{i:04d}.tmp") for i in range(count)]
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'wb') as fh:
+            fh.write(payload)
+    for path in paths:
+        os.remove(path)
+    return count / (time.perf_counter() - start)
+
+
+def _wl_small_read(work_dir, count=200):
+    # Mittlere Latenz (µs) beim Lesen kleiner Dateien
+    read_dir = os.path.join(work_dir, "read")
+    if not os.path.isdir(read_dir):
+        os.makedirs(read_dir)
+        for i in range(count):
+            with open(os.path.join(read_dir, f"r_{i:04d}.dat"), 'wb') as fh:
+                fh.write(os.urandom(4096))
+    paths = [os.path.join(read_dir, f"r_{i:04d}.dat") for i in range(count)]
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'rb') as fh:
+            fh.read()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def _wl_process_spawn(work_dir, count=5):
+    # Mittlere Zeit (ms) zum Starten und Beenden eines minimalen Prozesses
+    argv = ['cmd.exe', '/c', 'exit 0'] if os.name == 'nt' else [shutil.which('true') or '/bin/true']
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / count * 1000
+
+
+def _wl_cpu_loop(work_dir, iterations=300_000):
+    # Millionen Schleifendurchläufe pro Sekunde (Single-Thread)
+    start = time.perf_counter()
+    acc = 0
+    for i in range(iterations):
+        acc = (acc + i * i) & 0xFFFFFFFF
+    return iterations / (time.perf_counter() - start) / 1e6
+
+
+def _wl_memory_bandwidth(work_dir, size=32 * 1024 * 1024):
+    # GB/s für eine große Speicherkopie
+    src = bytearray(size)
+    dst = bytearray(size)
+    view = memoryview(dst)
+    start = time.perf_counter()
+    view[:] = src
+    return size / (time.perf_counter() - start) / 1e9
+
+
+def _wl_tcp_rtt(work_dir, count=200):
+    # Mittlere Round-Trip-Zeit (µs) über Loopback-TCP
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    
+    def echo():
+        conn, _ = server.accept()
+        with conn:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            while True:
+                data = conn.recv(64)
+                if not data:
+                    break
+                conn.sendall(data)
+    
+    thread = threading.Thread(target=echo, daemon=True)
+    thread.start()
+    client = socket.create_connection(server.getsockname())
+    try:
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        start = time.perf_counter()
+        for _ in range(count):
+            client.sendall(b"p")
+            client.recv(64)
+        return (time.perf_counter() - start) / count * 1e6
+    finally:
+        client.close()
+        thread.join(timeout=2)
+        server.close()
+
+
+# name: (label, einheit, höher ist besser, funktion)
+WORKLOADS = {
+    'file_churn': ("Dateien anlegen/löschen", "Dateien/s", True, _wl_file_churn),
+    'small_read': ("Kleine Dateien lesen", "µs", False, _wl_small_read),
+    'process_spawn': ("Prozessstart", "ms", False, _wl_process_spawn),
+    'cpu_loop': ("CPU-Schleife", "Mio/s", True, _wl_cpu_loop),
+    'memory_bandwidth': ("Speicherbandbreite", "GB/s", True, _wl_memory_bandwidth),
+    'tcp_rtt': ("Loopback TCP RTT", "µs", False, _wl_tcp_rtt),
+}
+
+
+class BenchmarkSuite:
+    # Reproduzierbare Mikro-Workloads, je Workload ein Aufwärmlauf und mehrere Messungen
+    def __init__(self, workloads=None, trials=7, warmup=1, work_dir=None):
+        self.workloads = list(workloads or WORKLOADS)
+        self.trials = trials
+        self.warmup = warmup
+        self.work_dir = work_dir
+    
+    def run(self, progress=None, token=None):
+        results = {}
+        total = len(self.workloads) * (self.trials + self.warmup)
+        done = 0
+        with tempfile.TemporaryDirectory(prefix="uo_bench_", dir=self.work_dir) as work_dir:
+            for name in self.workloads:
+                label, unit, higher, func = WORKLOADS[name]
+                samples = []
+                for trial in range(self.warmup + self.trials):
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    value = func(work_dir)
+                    if trial >= self.warmup:
+                        samples.append(value)
+                    done += 1
+                    if progress:
+                        progress(int(done * 100 / total), f"Benchmark: {label}")
+                results[name] = Measurement(name, unit, higher, samples)
+        return results
+    
+    @staticmethod
+    def compare(before, after):
+        return [BenchmarkDelta(before[name], after[name]) for name in before if name in after]
+
+
+def bench_suite(trials=7, workloads=None):
+    results = BenchmarkSuite(workloads, trials=trials).run()
+    return {name: m.as_dict() for name, m in results.items()}
+
+
+# ========== STATISTIK ==========
+
+STAT_KEYS = ('files_deleted', 'bytes_freed', 'registry_changes', 'services_optimized',
+             'performance_tweaks', 'total_optimizations')
+
+
+class StatsStore:
+    # Append-only Verlauf aller Läufe in SQLite (WAL). Es wird nur eingefügt, nie geändert;
+    # Summen und Exporte laufen per SQL bzw. seitenweise, damit der Speicher flach bleibt.
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(get_data_dir(), 'stats.sqlite3')
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        counters = ", ".join(f"{key} INTEGER NOT NULL DEFAULT 0" for key in STAT_KEYS)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY, name TEXT NOT NULL, status TEXT NOT NULL,
+                started REAL NOT NULL, duration REAL NOT NULL, {counters}
+            );
+            CREATE TABLE IF NOT EXISTS bench (
+                run_id INTEGER NOT NULL, workload TEXT NOT NULL, unit TEXT NOT NULL,
+                before_mean REAL, before_ci REAL, after_mean REAL, after_ci REAL,
+                change REAL, significant INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bench_run ON bench(run_id);
         """)
-        export_report.clicked.connect(self.generate_report)
-        btn_layout.addWidget(export_report)
-        
-        layout.addWidget(btn_frame)
-        layout.addStretch()
-        
-        return tab
     
-    # ========== TAB NAVIGATION ==========
+    def close(self):
+        with self._lock:
+            self.conn.close()
     
-    def show_cleanup_tab(self):
-        self.tab_widget.setCurrentIndex(0)
-        self.header_title.setText("🧹 System-Reinigung")
+    def record_run(self, name, status, started, duration, counts=None, deltas=None):
+        counts = counts or {}
+        columns = ", ".join(STAT_KEYS)
+        marks = ", ".join("?" for _ in STAT_KEYS)
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                cursor = self.conn.execute(
+                    f"INSERT INTO runs (name, status, started, duration, {columns}) VALUES (?, ?, ?, ?, {marks})",
+                    (name, status, started, duration, *(int(counts.get(key, 0)) for key in STAT_KEYS)))
+                run_id = cursor.lastrowid
+                if deltas:
+                    self.conn.executemany(
+                        "INSERT INTO bench VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(run_id, d.name, d.unit, d.before.mean, d.before.ci95, d.after.mean, d.after.ci95,
+                          d.change, int(d.significant)) for d in deltas])
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return run_id
     
-    def show_gaming_tab(self):
-        self.tab_widget.setCurrentIndex(1)
-        self.header_title.setText("🎮 Gaming-Optimierung")
+    def totals(self):
+        sums = ", ".join(f"COALESCE(SUM({key}), 0)" for key in STAT_KEYS)
+        with self._lock:
+            row = self.conn.execute(f"SELECT {sums} FROM runs").fetchone()
+        return dict(zip(STAT_KEYS, row))
     
-    def show_performance_tab(self):
-        self.tab_widget.setCurrentIndex(2)
-        self.header_title.setText("⚡ System-Leistung")
+    def run_count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
     
-    def show_auto_tab(self):
-        self.tab_widget.setCurrentIndex(3)
-        self.header_title.setText("🤖 Automatische Optimierung")
+    def per_name(self):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT name, COUNT(*), SUM(status = 'done'), AVG(duration), SUM(files_deleted), SUM(bytes_freed) "
+                "FROM runs GROUP BY name ORDER BY COUNT(*) DESC").fetchall()
     
-    def show_settings_tab(self):
-        self.tab_widget.setCurrentIndex(4)
-        self.header_title.setText("⚙️ Einstellungen")
+    def iter_runs(self, page_size=1000):
+        # Keyset-Paginierung wie beim ScanIndex: nie mehr als eine Seite im Speicher.
+        # Die Startzeit formatiert SQLite gleich mit (lokale Zeit, ISO).
+        last = 0
+        columns = ", ".join(STAT_KEYS)
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT id, name, status, datetime(started, 'unixepoch', 'localtime'), duration, {columns} FROM runs "
+                    "WHERE id > ? ORDER BY id LIMIT ?", (last, page_size)).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield from rows
     
-    def show_stats_tab(self):
-        self.tab_widget.setCurrentIndex(5)
-        self.header_title.setText("📊 Statistiken")
+    def benchmarks(self, run_id):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT workload, unit, before_mean, before_ci, after_mean, after_ci, change, significant "
+                "FROM bench WHERE run_id = ?", (run_id,)).fetchall()
     
-    # ========== OPTIMIERUNGS-FUNKTIONEN ==========
+    def last_benchmark_run(self):
+        with self._lock:
+            row = self.conn.execute("SELECT MAX(run_id) FROM bench").fetchone()
+        return row[0]
     
-    def deep_temp_clean(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
-        
-        self.is_running = True
-        self.show_progress(True)
-        
-        thread = threading.Thread(target=self._deep_temp_clean_thread)
-        thread.daemon = True
-        thread.start()
+    def export_csv(self, path):
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh, delimiter=';')
+            writer.writerow(['id', 'name', 'status', 'started', 'duration_s', *STAT_KEYS])
+            for row in self.iter_runs():
+                writer.writerow([row[0], row[1], row[2], row[3], f"{row[4]:.2f}", *row[5:]])
+                count += 1
+        return count
     
-    def _deep_temp_clean_thread(self):
-        try:
-            self.log_message("🧹 Starte Temp-Bereinigung...", "INFO")
+    def write_report(self, path):
+        totals = self.totals()
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write("ULTIMATE PC OPTIMIZER - REPORT\n")
+            fh.write(f"Erstellt: {datetime.now().strftime('%d.%m.%Y %H:%M')}\n")
+            fh.write("=" * 60 + "\n\n")
             
-            temp_paths = [
-                os.environ.get('TEMP', ''),
-                os.path.join(os.environ['USERPROFILE'], 'AppData', 'Local', 'Temp'),
-            ]
-            
-            deleted = 0
-            for i, path in enumerate(temp_paths):
-                if path and os.path.exists(path):
-                    self.update_progress((i+1)*50, f"Bereinige: {path}")
-                    
-                    try:
-                        for root, dirs, files in os.walk(path):
-                            for file in files:
-                                try:
-                                    filepath = os.path.join(root, file)
-                                    os.remove(filepath)
-                                    deleted += 1
-                                except:
-                                    continue
-                    except:
-                        continue
+            fh.write(f"Läufe gesamt:        {self.run_count()}\n")
+            fh.write(f"Dateien gelöscht:    {totals['files_deleted']}\n")
+            fh.write(f"Speicher freigegeben: {format_bytes(totals['bytes_freed'])}\n")
+            fh.write(f"Registry-Änderungen: {totals['registry_changes']}\n")
+            fh.write(f"Dienste optimiert:   {totals['services_optimized']}\n")
+            fh.write(f"Performance-Tweaks:  {totals['performance_tweaks']}\n\n")
             
-            self.optimization_stats['files_deleted'] += deleted
-            self.optimization_stats['total_optimizations'] += 1
+            fh.write("AKTIONEN\n" + "-" * 60 + "\n")
+            for name, runs, ok, avg, files, size in self.per_name():
+                fh.write(f"{name:<32} {runs:>5}x  {ok or 0:>5} ok  Ø {avg or 0:6.1f}s  "
+                         f"{files or 0} Dateien, {format_bytes(size or 0)}\n")
             
-            self.log_message(f"✅ {deleted} Dateien gelöscht", "SUCCESS")
+            run_id = self.last_benchmark_run()
+            if run_id is not None:
+                fh.write("\nLETZTER BENCHMARK\n" + "-" * 60 + "\n")
+                for workload, unit, before, _, after, _, change, significant in self.benchmarks(run_id):
+                    label = WORKLOADS[workload][0] if workload in WORKLOADS else workload
+                    fh.write(f"{label:<28} {before:10.4g} -> {after:10.4g} {unit:<10} "
+                             f"{change:+6.1f}%{'' if significant else ' (n.s.)'}\n")
             
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+            fh.write("\nVERLAUF\n" + "-" * 60 + "\n")
+            for row in self.iter_runs():
+                fh.write(f"{row[3]}  {row[1]:<32} "
+                         f"{row[2]:<10} {row[4]:7.1f}s\n")
+
+
+def bench_stats_store(count=100_000, base_dir=None):
+    # Ein Jahr mit ~270 Läufen/Tag in eine frische Datenbank, dann beide Exporte messen
+    import tracemalloc
+    results = {'runs': count}
+    with tempfile.TemporaryDirectory(prefix="uo_stats_", dir=base_dir) as work_dir:
+        store = StatsStore(os.path.join(work_dir, 'stats.sqlite3'))
+        t0 = time.perf_counter()
+        start = time.time() - 365 * 86400
+        with store._lock:
+            store.conn.execute("BEGIN")
+            store.conn.executemany(
+                "INSERT INTO runs (name, status, started, duration, files_deleted, bytes_freed, total_optimizations) "
+                "VALUES (?, 'done', ?, ?, ?, ?, 1)",
+                ((f"Aktion {i % 20}", start + i * 300, 1.5, i % 500, (i % 500) * 4096) for i in range(count)))
+            store.conn.execute("COMMIT")
+        results['insert_s'] = round(time.perf_counter() - t0, 3)
+        
+        for name, export in (('csv', store.export_csv), ('report', store.write_report)):
+            t0 = time.perf_counter()
+            export(os.path.join(work_dir, f"export.{name}"))
+            results[f'{name}_s'] = round(time.perf_counter() - t0, 3)
+            # Zweiter Durchlauf nur für den Speicher-Peak, tracemalloc verfälscht die Zeit
+            tracemalloc.start()
+            export(os.path.join(work_dir, f"export.{name}"))
+            results[f'{name}_peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            tracemalloc.stop()
+        store.close()
+    return results
+
+
+# ========== LOGGING ==========
+
+LOG_LEVELS = {'DEBUG': 0, 'INFO': 1, 'SUCCESS': 2, 'WARNING': 3, 'ERROR': 4, 'CRITICAL': 5}
+
+
+class StdoutMirror:
+    # Optionales Spiegeln der Log-Zeilen nach stdout in einem eigenen Thread,
+    # damit langsame Konsolen (z.B. cmd.exe) weder Worker noch GUI bremsen.
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
     
-    def disk_optimization(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def write(self, line):
+        self._queue.put(line)
+    
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+    
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                break
+            lines = [line]
+            # Alles, was inzwischen anliegt, in einem write() ausgeben
+            while True:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    self._write(lines)
+                    return
+                lines.append(line)
+            self._write(lines)
+    
+    def _write(self, lines):
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+# ========== OPTIMIZER-KERN ==========
+
+class OptimizerCore:
+    # Alle Aktionen und Zustände ohne Qt. Die GUI (optimizer_gui.UltimateOptimizer) erbt davon
+    # und überschreibt nur die Hooks log_message, stats_changed, benchmark_finished und
+    # _on_job_progress/_on_job_state; CLI und Daemon nutzen HeadlessOptimizer.
+    
+    # name: (bezeichnung, methode, verändernd)
+    ACTIONS = {
+        'deep_temp_clean': ("Temp-Bereinigung", '_deep_temp_clean_thread', True),
+        'system_junk_clean': ("System-Müll", '_system_junk_clean_thread', True),
+        'registry_cleanup': ("Autostart-Optimierung", '_registry_cleanup_thread', True),
+        'startup_report': ("Autostart-Analyse", '_startup_report_thread', False),
+        'service_optimization': ("Dienste-Optimierung", '_service_optimization_thread', True),
+        'disk_optimization': ("Festplatten-Optimierung", '_disk_optimization_thread', True),
+        'smart_scan': ("Smart System Scan", '_smart_system_scan_thread', False),
+        'duplicate_scan': ("Duplikate & große Dateien", '_duplicate_scan_thread', False),
+        'disk_usage': ("Speicherbelegung", '_disk_usage_thread', False),
+        'memory_report': ("Speicher-Report", '_memory_report_thread', False),
+        'memory_trim': ("Arbeitsspeicher entlasten", '_memory_trim_thread', True),
+        'emergency_restore': ("Notfall-Wiederherstellung", '_emergency_restore_thread', True),
+    }
+    
+    def setup_core(self, stdout_mirror=None, log_level="INFO"):
+        self.scheduler = JobScheduler(on_progress=self._on_job_progress, on_state=self._on_job_state,
+                                      log=self.log_message)
+        self.stdout_mirror = stdout_mirror
+        self.log_level = log_level
+        self.scan_index = None
+        self.dir_size_index = None
+        self.shell_pool = None
+        self.registry_writer = None
+        self.tweak_catalog = None
+        self.state_prober = None
+        self.journal = None
+        self.governor = None
+        self.trim_backend = None
+        self.startup_backend = None
+        self.boot_impact = None
+        self.service_backend = None
+        self.service_sampler = None
+        self.sampler = SystemSampler(interval=1.0, log=self.log_message)
+        self.leak_detector = LeakDetector()
         
-        self.is_running = True
-        self.show_progress(True)
+        # Temp-Bereinigung: Byte-Budget (None = alles) und Mindestalter in Sekunden
+        self.temp_budget = None
+        self.temp_min_age = 3600
+        # Duplikat-Suche: Startordner (None = Benutzerprofil)
+        self.duplicate_roots = None
+        # Speicherbelegung: Startordner (None = Systemlaufwerk)
+        self.disk_usage_root = None
+        # Arbeitsspeicher: nur Prozesse ab dieser Größe trimmen, Messfenster vorher/nachher
+        self.trim_min_rss = 64 * 1024**2
+        self.trim_window = 5.0
         
-        thread = threading.Thread(target=self._disk_optimization_thread)
-        thread.daemon = True
-        thread.start()
+        # Zähler überleben Neustarts: Startwerte sind die Summen aus dem Verlauf
+        self.stats_store = StatsStore()
+        self.optimization_stats = self.stats_store.totals()
+        self.checkpoints = CheckpointStore()
+        self._stats_lock = threading.Lock()
+        self._job_baselines = {}
+        self._job_benchmarks = {}
+    
+    def shutdown(self, cancel=False):
+        # Gemeinsames Aufräumen für HeadlessOptimizer.close und das Schließen der GUI;
+        # cancel=True bricht laufende Jobs ab statt auf sie zu warten
+        self.scheduler.shutdown(wait=True, cancel=cancel)
+        self.stop_governor()
+        self.stop_services_watch()
+        self.sampler.stop()
+        if self.shell_pool is not None:
+            self.shell_pool.close()
+        self.stats_store.close()
+        self.checkpoints.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.boot_impact is not None:
+            self.boot_impact.close()
+        if self.stdout_mirror:
+            self.stdout_mirror.close()
+    
+    def log_message(self, message, level="INFO"):
+        if LOG_LEVELS.get(level, 1) < LOG_LEVELS.get(self.log_level, 1):
+            return
+        if self.stdout_mirror:
+            self.stdout_mirror.write(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+    
+    def add_stats(self, **counts):
+        with self._stats_lock:
+            for key, value in counts.items():
+                self.optimization_stats[key] += value
+        self.stats_changed()
+    
+    def stats_changed(self):
+        pass
+    
+    def benchmark_finished(self, deltas):
+        pass
+    
+    def disk_usage_finished(self, root):
+        pass
+    
+    def _on_job_progress(self, job, value, text):
+        pass
+    
+    def _on_job_state(self, job):
+        if job.status == Job.RUNNING:
+            if job.mutating:
+                # Verändernde Jobs laufen exklusiv -> Differenz der Zähler gehört genau diesem Lauf
+                with self._stats_lock:
+                    self._job_baselines[job.id] = dict(self.optimization_stats)
+        elif job.is_finished:
+            if job.mutating and job.started is not None:
+                self._record_job(job)
+            if job.status == Job.CANCELLED:
+                self.log_message(f"⏹️ {job.name} abgebrochen", "WARNING")
+            elif job.status == Job.FAILED:
+                self.log_message(f"❌ {job.name} fehlgeschlagen: {job.error}", "ERROR")
     
-    def _disk_optimization_thread(self):
+    def _record_job(self, job):
+        baseline = self._job_baselines.pop(job.id, None)
+        counts = {}
+        if baseline is not None:
+            with self._stats_lock:
+                counts = {key: self.optimization_stats[key] - baseline.get(key, 0) for key in STAT_KEYS}
         try:
-            self.log_message("💾 Starte Festplatten-Optimierung...", "INFO")
-            
-            steps = [
-                ("SSD TRIM...", 25),
-                ("Defragmentierung...", 50),
-                ("Pagefile optimieren...", 75),
-                ("Abschließen...", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            # Einfache Optimierung
-            try:
-                subprocess.run(['defrag', 'C:', '/O'], capture_output=True, shell=True, timeout=30)
-            except:
-                pass
-            
-            self.optimization_stats['performance_tweaks'] += 1
-            self.optimization_stats['total_optimizations'] += 1
-            
-            self.log_message("✅ Festplatte optimiert", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+            self.stats_store.record_run(job.name, job.status, job.started, job.duration, counts,
+                                        self._job_benchmarks.pop(job.id, None))
+        except sqlite3.Error as e:
+            self.log_message(f"❌ Statistik Fehler: {e}", "ERROR")
+    
+    # ========== JOBS ==========
+    
+    def report_checkpoints(self):
+        # Unterbrochene Jobs beim Start melden; fortgesetzt wird beim nächsten Aufruf der Aktion
+        for name, (state, updated) in self.checkpoints.pending().items():
+            when = datetime.fromtimestamp(updated).strftime('%d.%m. %H:%M')
+            self.log_message(f"⏸️ {state.get('label', name)} vom {when} unterbrochen "
+                             f"({state.get('files_deleted', 0)} Dateien) – erneut starten zum Fortsetzen", "WARNING")
+    
+    def start_job(self, name, func, mutating=True):
+        # Alle Aktionen laufen über den Scheduler, nie direkt im GUI- bzw. Aufrufer-Thread
+        job = self.scheduler.submit(name, func, mutating=mutating)
+        if job is None:
+            self.log_message(f"⚠️ {name} läuft bereits", "WARNING")
+        elif job.status == Job.QUEUED and self.scheduler.active_jobs()[0] is not job:
+            self.log_message(f"⏳ {name} wartet in der Warteschlange", "INFO")
+        return job
+    
+    def get_shell_pool(self):
+        if self.shell_pool is None:
+            self.shell_pool = ShellSessionPool(PowerShellDialect(), size=2)
+        return self.shell_pool
+    
+    def run_powershell(self, script, timeout=30, job=None):
+        # Läuft in einer warmen PowerShell-Session statt "powershell -Command" pro Aufruf
+        result = self.get_shell_pool().run(script, timeout=timeout, token=job.token if job else None)
+        if result.timed_out:
+            self.log_message(f"⚠️ PowerShell Timeout nach {timeout}s", "WARNING")
+        elif not result.ok:
+            self.log_message(f"⚠️ PowerShell Exit-Code {result.exit_code}", "WARNING")
+        return result
+    
+    def get_journal(self):
+        if self.journal is None:
+            self.journal = ChangeJournal()
+        return self.journal
+    
+    def get_registry_writer(self):
+        if self.registry_writer is None:
+            self.registry_writer = RegistryWriter(journal=self.get_journal())
+            self.registry_writer.listeners.append(self.get_state_prober().record_registry_writes)
+        return self.registry_writer
+    
+    def get_state_prober(self):
+        if self.state_prober is None:
+            self.state_prober = StateProber(
+                lambda changes: self.get_registry_writer().read_many(changes),
+                lambda script: self.get_shell_pool().run(script, timeout=30))
+        return self.state_prober
+    
+    def apply_registry(self, changes):
+        # Ein Batch in-process über winreg; schon gesetzte Werte werden übersprungen
+        diffs = self.get_registry_writer().apply_batch(changes)
+        for diff in diffs:
+            if diff.written:
+                self.log_message(f"🔧 {diff.change.path}: {diff.old_value} → {diff.change.value}", "INFO")
+            elif diff.status == RegistryDiff.FAILED:
+                self.log_message(f"⚠️ {diff.change.path}: {diff.error}", "WARNING")
+        written = sum(1 for d in diffs if d.written)
+        unchanged = sum(1 for d in diffs if d.status == RegistryDiff.UNCHANGED)
+        if unchanged:
+            self.log_message(f"✓ {unchanged} Registry-Werte waren bereits gesetzt", "INFO")
+        self.add_stats(registry_changes=written)
+        return diffs
+    
+    def journal_shell_tweaks(self, tweaks):
+        # Alte Werte von Diensten/powercfg/netsh frisch lesen und vor dem Ausführen sichern
+        tweaks = [t for t in tweaks if t.kind in ('service', 'powercfg', 'netsh')]
+        if not tweaks:
+            return
+        journal = self.get_journal()
+        current = self.get_state_prober().snapshot(tweaks, force=True)
+        for tweak in tweaks:
+            old = current.get(tweak.state_key, _MISSING)
+            if old is _MISSING:
+                self.log_message(f"⚠️ {tweak.label}: alter Wert unbekannt, nicht umkehrbar", "WARNING")
+                journal.record(tweak.kind, tweak.target, None, tweak.value, scope=tweak.scope, irreversible=True)
+            else:
+                journal.record(tweak.kind, tweak.target, old, tweak.value, scope=tweak.scope)
+        journal.commit()
+    
+    def start_governor(self, target=None):
+        # Läuft neben den Jobs (kein Scheduler-Slot), bis das Ziel endet oder stop_governor()
+        if self.governor is not None and self.governor.running:
+            self.log_message("⚠️ Governor läuft bereits", "WARNING")
+            return self.governor
+        self.governor = ResourceGovernor(load_governor_rules(), log=self.log_message, table=self.sampler.processes)
+        self.governor.start(target)
+        return self.governor
+    
+    def stop_governor(self):
+        if self.governor is not None:
+            self.governor.stop()
+    
+    def get_catalog(self):
+        if self.tweak_catalog is None:
+            self.tweak_catalog = TweakCatalog.load()
+        return self.tweak_catalog
     
-    def system_junk_clean(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _run_action(self, name, job):
+        getattr(self, self.ACTIONS[name][1])(job)
+    
+    def submit_profile(self, profile):
+        label = self.get_catalog().profile_label(profile)
+        return self.start_job(label, lambda job: self.run_profile(job, profile))
+    
+    def submit_action(self, name):
+        label, method, mutating = self.ACTIONS[name]
+        return self.start_job(label, getattr(self, method), mutating=mutating)
+    
+    def run_profile(self, job, profile):
+        catalog = self.get_catalog()
+        label = catalog.profile_label(profile)
+        self.log_message(f"▶️ Starte {label}...", "INFO")
         
-        self.is_running = True
-        self.show_progress(True)
+        plan = TweakPlanner(catalog, probe=self.get_state_prober().applied).compile(profile)
+        self.log_message(f"📋 {len(plan.steps)} Schritte in {len(plan.stages)} Stufen, "
+                         f"{len(plan.skipped)} bereits angewendet", "INFO")
+        if plan.empty:
+            self.log_message(f"✅ {label}: alles bereits aktiv", "SUCCESS")
+            return []
         
-        thread = threading.Thread(target=self._system_junk_clean_thread)
-        thread.daemon = True
-        thread.start()
+        started = self.sampler.mark()
+        executor = PlanExecutor(self.apply_registry,
+                                lambda script, job: self.get_shell_pool().run(script, timeout=60, token=job.token),
+                                self._run_action, before_stage=self.journal_shell_tweaks)
+        results = executor.execute(plan, job, job.set_progress)
+        # Shell-Tweaks können wir nicht exakt nachverfolgen -> beim nächsten Mal neu lesen
+        self.get_state_prober().invalidate([t.state_key for t, _, _ in results if t.kind in SHELL_KINDS])
+        
+        failed = [(tweak, detail) for tweak, ok, detail in results if not ok]
+        for tweak, detail in failed:
+            self.log_message(f"⚠️ {tweak.label}: {detail}", "WARNING")
+        ok_shell = [tweak for tweak, ok, _ in results if ok and tweak.kind in SHELL_KINDS]
+        self.add_stats(services_optimized=sum(1 for t in ok_shell if t.kind == 'service'),
+                       performance_tweaks=sum(1 for t in ok_shell if t.kind != 'service'),
+                       total_optimizations=1)
+        
+        before, during = self.sampler.compare(started, self.sampler.mark())
+        if before and during:
+            self.log_message(f"📈 Ø CPU vorher {before['cpu']:.0f}% / währenddessen {during['cpu']:.0f}%, "
+                             f"Ø RAM {before['ram_percent']:.0f}% / {during['ram_percent']:.0f}%", "DEBUG")
+        
+        if failed:
+            self.log_message(f"⚠️ {label}: {len(results) - len(failed)}/{len(results)} Schritte erfolgreich", "WARNING")
+        else:
+            self.log_message(f"✅ {label} abgeschlossen ({len(results)} Schritte)", "SUCCESS")
+        return results
     
-    def _system_junk_clean_thread(self):
-        try:
-            self.log_message("📦 Entferne System-Müll...", "INFO")
-            
-            steps = [
-                ("Windows.old...", 33),
-                ("Bloatware...", 66),
-                ("Abschließen...", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            # Windows.old entfernen
-            windows_old = os.path.join(os.environ.get('WINDIR', ''), '..', 'Windows.old')
-            if os.path.exists(windows_old):
-                try:
-                    subprocess.run(['rd', '/s', '/q', windows_old], shell=True, timeout=30)
-                except:
-                    pass
-            
-            self.optimization_stats['files_deleted'] += 1
-            self.optimization_stats['total_optimizations'] += 1
-            
-            self.log_message("✅ System-Müll entfernt", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+    # ========== BENCHMARK ==========
     
-    def registry_cleanup(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _benchmark_profile_thread(self, job, profile):
+        suite = BenchmarkSuite()
+        self.log_message("🧪 Messe Ausgangszustand...", "INFO")
+        before = suite.run(lambda v, text: job.set_progress(v // 2, text), job.token)
         
-        self.is_running = True
-        self.show_progress(True)
+        if not self.run_profile(job, profile):
+            self.log_message("ℹ️ Keine Änderungen angewendet, Vergleich entspricht Messrauschen", "INFO")
         
-        thread = threading.Thread(target=self._registry_cleanup_thread)
-        thread.daemon = True
-        thread.start()
+        self.log_message("🧪 Messe nach der Optimierung...", "INFO")
+        after = suite.run(lambda v, text: job.set_progress(50 + v // 2, text), job.token)
+        
+        deltas = BenchmarkSuite.compare(before, after)
+        self._job_benchmarks[job.id] = deltas
+        for d in deltas:
+            if d.significant:
+                level = "SUCCESS" if d.improved else "WARNING"
+                self.log_message(f"{'📈' if d.improved else '📉'} {WORKLOADS[d.name][0]}: {d.change:+.1f}%", level)
+        significant = sum(1 for d in deltas if d.significant)
+        self.log_message(f"✅ Benchmark abgeschlossen: {significant}/{len(deltas)} signifikante Änderungen", "SUCCESS")
+        self.benchmark_finished(deltas)
     
-    def _registry_cleanup_thread(self):
-        try:
-            self.log_message("🔍 Starte Registry-Bereinigung...", "INFO")
-            
-            for i in range(1, 101):
-                self.update_progress(i, f"Registry optimieren... {i}%")
-                time.sleep(0.05)
-            
-            # Einfache Registry-Bereinigung
-            ps_script = """
-            $paths = @(
-                "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run",
-                "HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run"
-            )
-            
-            foreach ($path in $paths) {
-                if (Test-Path $path) {
-                    Get-ChildItem -Path $path | ForEach-Object {
-                        try {
-                            Remove-Item -Path $_.PSPath -Force -ErrorAction SilentlyContinue
-                        } catch {}
-                    }
-                }
-            }
-            Write-Host "Registry bereinigt"
-            """
-            
-            try:
-                subprocess.run(['powershell', '-Command', ps_script], 
-                              capture_output=True, shell=True, timeout=30)
-            except:
-                pass
-            
-            self.optimization_stats['registry_changes'] += 1
-            self.optimization_stats['total_optimizations'] += 1
-            
-            self.log_message("✅ Registry bereinigt", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+    # ========== REINIGUNG ==========
     
-    def ultimate_gaming_mode(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def get_scan_index(self):
+        if self.scan_index is None:
+            self.scan_index = ScanIndex()
+        return self.scan_index
+    
+    def get_dir_size_index(self):
+        if self.dir_size_index is None:
+            self.dir_size_index = DirSizeIndex()
+        return self.dir_size_index
+    
+    def _scan_roots(self, categories=('temp', 'junk')):
+        roots = []
+        if 'temp' in categories:
+            roots += [(path, 'temp') for path in get_temp_roots()]
+        if 'junk' in categories:
+            roots += [(path, 'junk') for path in get_junk_roots()]
+        return roots
+    
+    def _clean_indexed(self, job, category, label, budget=None):
+        # Inkrementeller Scan (unveränderte Ordner werden nur ge-stat-et), dann Löschen aus dem Index
+        # über den Verdrängungsplan: gesperrte Dateien pausieren, mit Budget endet der Lauf früh.
+        # Ein abgebrochener Lauf hinterlässt einen Checkpoint und wird ohne neuen Scan fortgesetzt.
+        index = self.get_scan_index()
+        checkpoint = Checkpointer(self.checkpoints, f"clean:{category}")
+        stats = CleanupStats()
+        if checkpoint.resumed:
+            state = checkpoint.state
+            # Zähler des unterbrochenen Laufs wurden noch nicht verbucht -> hier übernehmen
+            stats.add_batch(state['files_deleted'], state['bytes_freed'], state['errors'])
+            self.log_message(f"⏯️ Setze {label} fort: {state['files_deleted']} Dateien, "
+                             f"{format_bytes(state['bytes_freed'])} bereits erledigt", "INFO")
+        else:
+            job.set_progress(5, f"Scanne {label}...")
+            scan = index.scan(self._scan_roots((category,)),
+                              lambda r: job.set_progress(10, f"Scanne {label}... {r['files_indexed']} Dateien"),
+                              job.token)
+            self.log_message(f"🔍 {scan['dirs']} Ordner geprüft, {scan['dirs_listed']} neu eingelesen ({scan['elapsed']:.2f}s)", "INFO")
         
-        self.is_running = True
+        def save(s, force):
+            checkpoint.update({'label': label, 'files_deleted': s.files_deleted,
+                               'bytes_freed': s.bytes_freed, 'errors': s.errors}, force)
         
-        try:
-            self.log_message("🎮 Aktiviere Gaming-Modus...", "INFO")
-            
-            ps_script = """
-            Set-ItemProperty -Path "HKCU:\\Software\\Microsoft\\GameBar" -Name "AllowAutoGameMode" -Value 1 -Type DWord
-            Set-ItemProperty -Path "HKCU:\\System\\GameConfigStore" -Name "GameDVR_Enabled" -Value 0 -Type DWord
-            Write-Host "Gaming Mode aktiviert"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.optimization_stats['total_optimizations'] += 1
-            
-            self.log_message("✅ Gaming-Modus aktiviert", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
-    
-    def gpu_ultimate_tweaks(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+        save(stats, True)
+        total = index.summary().get(category, (0, 0))[0] + stats.files_deleted
         
-        self.is_running = True
+        def report(s):
+            done = (s.files_deleted + s.errors) / max(total, 1)
+            if budget:
+                done = max(done, s.bytes_freed / budget)
+            job.set_progress(10 + int(90 * min(done, 1)),
+                             f"Bereinige {label}: {s.files_deleted}/{total} Dateien ({format_bytes(s.bytes_freed)})")
         
+        planner = EvictionPlanner(index, min_age=self.temp_min_age)
+        resumed_files, resumed_bytes = stats.files_deleted, stats.bytes_freed
         try:
-            ps_script = """
-            Set-ItemProperty -Path "HKLM:\\SYSTEM\\CurrentControlSet\\Control\\GraphicsDrivers" -Name "HwSchMode" -Value 2 -Type DWord
-            Write-Host "GPU Tweaks angewendet"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ GPU-Tweaks angewendet", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
+            stats = planner.evict(category, budget, TempCleanupEngine(progress_callback=report), stats, job.token, save)
+        except JobCancelled:
+            self.log_message(f"⏸️ {label} angehalten bei {stats.files_deleted} Dateien – wird beim nächsten Start fortgesetzt", "WARNING")
+            raise
         finally:
-            self.is_running = False
+            # Gelöschte Dateien sind nicht umkehrbar, das Journal hält nur fest, was passiert ist
+            if stats.files_deleted > resumed_files:
+                journal = self.get_journal()
+                journal.record('file', category, None, {'files': stats.files_deleted - resumed_files,
+                                                        'bytes': stats.bytes_freed - resumed_bytes},
+                               label=label, irreversible=True)
+                journal.commit()
+        checkpoint.finish()
+        locked = planner.locked_count()
+        if locked:
+            self.log_message(f"🔒 {locked} gesperrte Dateien pausieren bis zum Ablauf ihrer Abklingzeit", "INFO")
+        return stats
     
-    def cpu_gaming_optimization(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _deep_temp_clean_thread(self, job):
+        self.log_message("🧹 Starte Temp-Bereinigung...", "INFO")
         
-        self.is_running = True
+        if self.temp_budget:
+            self.log_message(f"🎯 Ziel: {format_bytes(self.temp_budget)} freigeben", "INFO")
+        stats = self._clean_indexed(job, 'temp', "Temp-Dateien", self.temp_budget)
+        job.set_progress(100, "Abschließen...")
         
-        try:
-            ps_script = """
-            try {
-                powercfg /setacvalueindex SCHEME_MIN SUB_PROCESSOR PROCTHROTTLEMIN 100
-                powercfg /setdcvalueindex SCHEME_MIN SUB_PROCESSOR PROCTHROTTLEMIN 100
-            } catch {}
-            Write-Host "CPU für Gaming optimiert"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ CPU für Gaming optimiert", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
+        self.add_stats(files_deleted=stats.files_deleted, bytes_freed=stats.bytes_freed, total_optimizations=1)
+        
+        self.log_message(f"✅ {stats.files_deleted} Dateien gelöscht, {format_bytes(stats.bytes_freed)} freigegeben "
+                         f"({stats.files_per_sec:.0f} Dateien/s, {stats.errors} gesperrt)", "SUCCESS")
     
-    def network_gaming_tweaks(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
+    def _disk_optimization_thread(self, job):
+        self.log_message("💾 Starte Festplatten-Optimierung...", "INFO")
+        
+        if os.name != 'nt':
+            self.log_message("ℹ️ Laufwerksoptimierung (defrag) gibt es nur unter Windows", "INFO")
             return
         
-        self.is_running = True
+        # defrag /O wählt selbst: TRIM bei SSDs, Defragmentierung bei Festplatten
+        drive = get_system_drive().rstrip('\\')
+        job.set_progress(10, f"{drive} optimieren (TRIM/Defrag)...")
+        job.check_cancelled()
+        result = self.run_powershell("defrag $env:SystemDrive /O", timeout=900, job=job)
+        job.check_cancelled()
+        job.set_progress(100, "Abschließen...")
         
-        try:
-            ps_script = """
-            try {
-                netsh int tcp set global autotuninglevel=normal
-                netsh int tcp set global chimney=enabled
-            } catch {}
-            ipconfig /flushdns
-            Write-Host "Netzwerk für Gaming optimiert"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ Netzwerk optimiert", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
+        if not result.ok:
+            raise RuntimeError(f"{drive} nicht optimiert: {result.output.strip()[-200:]}")
+        
+        self.add_stats(performance_tweaks=1, total_optimizations=1)
+        
+        self.log_message(f"✅ Festplatte {drive} optimiert", "SUCCESS")
     
-    def optimize_windows_services_ultimate(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _system_junk_clean_thread(self, job):
+        self.log_message("📦 Entferne System-Müll...", "INFO")
+        
+        stats = self._clean_indexed(job, 'junk', "System-Müll")
+        
+        # Windows.old entfernen
+        job.set_progress(100, "Windows.old...")
+        windows_old = os.path.join(os.environ.get('WINDIR', ''), '..', 'Windows.old')
+        if os.path.exists(windows_old):
+            try:
+                subprocess.run(['rd', '/s', '/q', windows_old], shell=True, timeout=30)
+            except (OSError, subprocess.SubprocessError) as e:
+                self.log_message(f"⚠️ Windows.old nicht entfernt: {e}", "WARNING")
         
-        self.is_running = True
+        self.add_stats(files_deleted=stats.files_deleted, bytes_freed=stats.bytes_freed, total_optimizations=1)
         
+        self.log_message(f"✅ System-Müll entfernt: {stats.files_deleted} Dateien, {format_bytes(stats.bytes_freed)}", "SUCCESS")
+    
+    def _duplicate_scan_thread(self, job):
+        finder = None
         try:
-            self.log_message("🚀 Optimiere Windows Dienste...", "INFO")
-            
-            ps_script = """
-            $services = @("DiagTrack", "dmwappushservice", "MapsBroker", "lfsvc")
-            foreach ($service in $services) {
-                try {
-                    Stop-Service -Name $service -Force -ErrorAction SilentlyContinue
-                    Set-Service -Name $service -StartupType Disabled -ErrorAction SilentlyContinue
-                } catch {}
-            }
-            Write-Host "Dienste optimiert"
-            """
+            roots = self.duplicate_roots or [os.environ.get('USERPROFILE') or os.path.expanduser('~')]
+            self.log_message(f"🔁 Suche Duplikate in {', '.join(roots)}...", "INFO")
             
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=60)
+            finder = DuplicateFinder()
+            job.set_progress(2, "Indexiere Dateien...")
+            count = finder.index(roots, job.token, lambda n: job.set_progress(5, f"Indexiere... {n} Dateien"))
+            self.log_message(f"📋 {count} Dateien indexiert, {finder.stats['candidates']} mit gleicher Größe", "INFO")
             
-            self.optimization_stats['services_optimized'] += 1
-            self.optimization_stats['total_optimizations'] += 1
+            for size, path in finder.largest(10):
+                self.log_message(f"📦 {format_bytes(size):>10}  {path}", "INFO")
             
-            self.log_message("✅ Dienste optimiert", "SUCCESS")
+            # Gruppen landen sofort im Log und in der CSV, nicht erst am Ende
+            file_path = self._export_path("duplicates", "csv")
+            shown = 0
+            with open(file_path, 'w', newline='', encoding='utf-8-sig') as fh:
+                writer = csv.writer(fh, delimiter=';')
+                writer.writerow(["Gruppe", "Größe", "Hash", "Pfad"])
+                for size, digest, paths in finder.duplicates(job.token):
+                    group = finder.stats['groups']
+                    writer.writerows((group, size, digest, path) for path in paths)
+                    if shown < 20:
+                        shown += 1
+                        self.log_message(f"🔁 {len(paths)}× {format_bytes(size)}: {paths[0]}", "INFO")
+                    done = finder.stats['done'] / max(finder.stats['candidates'], 1)
+                    job.set_progress(10 + int(90 * done), f"{group} Gruppen, {format_bytes(finder.stats['wasted_bytes'])} doppelt")
             
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
+            job.set_progress(100, "Abgeschlossen")
+            self.log_message(f"✅ {finder.stats['groups']} Duplikat-Gruppen, {format_bytes(finder.stats['wasted_bytes'])} "
+                             f"belegt doppelt ({format_bytes(finder.stats['bytes_read'])} gelesen): {file_path}", "SUCCESS")
         finally:
-            self.is_running = False
+            if finder is not None:
+                finder.close()
     
-    def disk_performance_tweaks(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _disk_usage_thread(self, job):
+        root = os.path.abspath(self.disk_usage_root or get_system_drive())
+        self.log_message(f"💽 Analysiere Speicherbelegung von {root}...", "INFO")
         
-        self.is_running = True
+        index = self.get_dir_size_index()
+        job.set_progress(5, "Scanne Ordner...")
+        result = index.scan(root, job.token, lambda n: job.set_progress(50, f"Scanne... {n} Ordner"))
+        job.set_progress(100, "Abgeschlossen")
         
-        try:
-            ps_script = """
-            fsutil behavior set disabledeletenotify 0
-            Set-ItemProperty -Path "HKLM:\\SYSTEM\\CurrentControlSet\\Control\\FileSystem" -Name "NtfsDisableLastAccessUpdate" -Value 1 -Type DWord
-            Write-Host "Festplatten-Tweaks angewendet"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ Festplatten-Tweaks angewendet", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
+        self.log_message(f"✅ {format_bytes(result['total_size'])} in {result['dirs']} Ordnern "
+                         f"({result['dirs_listed']} neu gelistet, {result['elapsed']:.2f}s)", "SUCCESS")
+        for path, size, files in index.children(root, limit=10):
+            self.log_message(f"📁 {format_bytes(size):>10}  {path or '(Dateien)'}", "INFO")
+        self.disk_usage_finished(root)
     
-    def system_responsiveness(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    # ========== AUTOSTART ==========
+    
+    def get_startup_backend(self):
+        if self.startup_backend is None:
+            # Unter Linux gibt es keine Autostart-Registry: leeres Fake-Inventar
+            if os.name == 'nt':
+                self.startup_backend = WindowsStartupBackend(self.get_registry_writer().backend,
+                                                             lambda script: self.get_shell_pool().run(script, timeout=60))
+            else:
+                self.startup_backend = FakeStartupBackend()
+        return self.startup_backend
+    
+    def analyze_startup(self):
+        if self.boot_impact is None:
+            self.boot_impact = BootImpactStore()
+        analyzer = StartupAnalyzer(self.get_startup_backend(), self.boot_impact, self.sampler.processes)
+        return analyzer, analyzer.analyze()
+    
+    def _log_startup_items(self, items, limit=15):
+        for item in items[:limit]:
+            cost = (f"CPU {item.boot_cpu:.2f}s, I/O {format_bytes(item.boot_io)}" if item.measured
+                    else f"{format_bytes(item.image_size)}, nicht gemessen")
+            state = "" if item.enabled else " [deaktiviert]"
+            self.log_message(f"   {item.impact:<7} {item.name} ({item.source}): {cost}{state}", "INFO")
+    
+    def _startup_report_thread(self, job):
+        self.log_message("🚀 Analysiere Autostart...", "INFO")
         
-        self.is_running = True
+        job.set_progress(20, "Autostart-Einträge lesen...")
+        _, items = self.analyze_startup()
+        counts = collections.Counter(i.impact for i in items if i.enabled)
+        self.log_message(f"📋 {len(items)} Autostart-Einträge: {counts['hoch']} hoch, {counts['mittel']} mittel, "
+                         f"{counts['niedrig']} niedrig", "INFO")
+        self._log_startup_items(items)
         
-        try:
-            ps_script = """
-            Set-ItemProperty -Path "HKLM:\\SYSTEM\\CurrentControlSet\\Control\\PriorityControl" -Name "Win32PrioritySeparation" -Value 38 -Type DWord
-            Write-Host "System-Responsiveness optimiert"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ Responsiveness optimiert", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
+        self.log_message("✅ Autostart-Analyse abgeschlossen", "SUCCESS")
     
-    def visual_performance_tweaks(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
+    def _registry_cleanup_thread(self, job):
+        self.log_message("🚀 Starte Autostart-Optimierung...", "INFO")
+        
+        job.set_progress(20, "Autostart-Einträge bewerten...")
+        analyzer, items = self.analyze_startup()
+        self._log_startup_items(items)
+        
+        # Nur gemessene Einträge mit hohem Einfluss, nie Programme aus dem Windows-Ordner
+        expensive = StartupAnalyzer.expensive(items, protected=[os.environ.get('WINDIR')])
+        if not expensive:
+            self.log_message("✅ Keine Autostart-Einträge mit hohem Einfluss", "SUCCESS")
             return
         
-        self.is_running = True
+        job.set_progress(60, f"{len(expensive)} Einträge deaktivieren...")
+        disabled, failed = analyzer.disable(expensive, self.get_registry_writer().apply_batch, self.get_journal())
+        for item, detail in failed:
+            self.log_message(f"⚠️ {item.path}: {detail}", "WARNING")
         
-        try:
-            ps_script = """
-            Set-ItemProperty -Path "HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\VisualEffects" -Name "VisualFXSetting" -Value 2 -Type DWord
-            Write-Host "Visuelle Tweaks angewendet"
-            """
-            
-            subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=30)
-            
-            self.log_message("✅ Visuelle Tweaks angewendet", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.is_running = False
+        self.add_stats(registry_changes=disabled, total_optimizations=1)
+        
+        self.log_message(f"✅ {disabled} Autostart-Einträge deaktiviert (Notfall-Wiederherstellung nimmt das zurück)", "SUCCESS")
+    
+    # ========== DIENSTE ==========
     
-    # ========== AUTOMATIK FUNKTIONEN ==========
+    def get_service_backend(self):
+        if self.service_backend is None:
+            # Unter Linux: leere systemd-Attrappe, echte Dienste werden nicht angefasst
+            if os.name == 'nt':
+                self.service_backend = ScmServiceBackend(lambda script: self.get_shell_pool().run(script, timeout=120))
+            else:
+                self.service_backend = SystemdFakeServiceBackend()
+        return self.service_backend
     
-    def extreme_gaming_mode(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
+    def watch_services(self):
+        # Verbrauch der Dienste laufend im eigenen Thread mitschreiben
+        if self.service_sampler is None:
+            self.service_sampler = ServiceSampler(self.get_service_backend(), log=self.log_message)
+        return self.service_sampler.start()
+    
+    def stop_services_watch(self):
+        if self.service_sampler is not None:
+            self.service_sampler.stop()
+    
+    def _service_optimization_thread(self, job):
+        self.log_message("🔧 Starte Dienste-Optimierung...", "INFO")
+        
+        policy = ServicePolicy.load()
+        sampler = self.watch_services()
+        # Ohne genug Verlauf erst messen (abbrechbar)
+        while sampler.observed < policy.min_observed:
+            job.set_progress(int(50 * sampler.observed / policy.min_observed),
+                             f"Dienste messen ({sampler.observed:.0f}/{policy.min_observed:.0f}s)...")
+            job.sleep(1.0)
+        
+        job.set_progress(60, "Dienste bewerten...")
+        decisions = policy.decide(sampler.services(), sampler.usage())
+        if not decisions:
+            self.log_message(f"✅ Kein Dienst über den Schwellen ({sampler.observed:.0f}s gemessen)", "SUCCESS")
             return
+        for d in decisions:
+            self.log_message(f"   {d.name}: CPU {d.usage.cpu_percent:.1f}%, RSS {format_bytes(d.usage.rss)}, "
+                             f"{d.usage.wakeups:.0f} Wakeups/s -> {d.new}", "INFO")
         
-        self.is_running = True
-        self.show_progress(True)
+        job.set_progress(80, f"{len(decisions)} Dienste umstellen...")
+        results = apply_service_plan(self.get_service_backend(), decisions, self.get_journal())
+        sampler.invalidate()
+        changed = 0
+        for name, (ok, detail) in results.items():
+            if ok:
+                changed += 1
+            else:
+                self.log_message(f"⚠️ {name}: {detail}", "WARNING")
         
-        thread = threading.Thread(target=self._extreme_gaming_thread)
-        thread.daemon = True
-        thread.start()
+        self.add_stats(services_optimized=changed, total_optimizations=1)
+        
+        self.log_message(f"✅ {changed} Dienste umgestellt (Notfall-Wiederherstellung nimmt das zurück)", "SUCCESS")
     
-    def _extreme_gaming_thread(self):
-        try:
-            self.log_message("🏎️ Starte Extreme Gaming Mode...", "INFO")
-            
-            steps = [
-                ("Gaming-Modus", 25),
-                ("GPU optimieren", 50),
-                ("CPU optimieren", 75),
-                ("Netzwerk optimieren", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            self.log_message("✅ Extreme Gaming Mode aktiviert!", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+    # ========== ARBEITSSPEICHER ==========
     
-    def ultimate_performance_mode(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def watch_memory(self):
+        # RSS-Verlauf für die Leck-Erkennung im Takt des System-Monitors mitschreiben
+        table = self.sampler.processes
+        if self.leak_detector.observe not in table.listeners:
+            table.register('name', 'memory_info')
+            table.listeners.append(self.leak_detector.observe)
+    
+    def get_trim_backend(self):
+        if self.trim_backend is None:
+            self.trim_backend = default_trim_backend()
+        return self.trim_backend
+    
+    def _memory_report_thread(self, job):
+        self.log_message("🧠 Erstelle Speicher-Report...", "INFO")
+        
+        vm = psutil.virtual_memory()
+        try:
+            cache = self.get_trim_backend().cache_bytes()
+        except OSError:
+            cache = None
+        self.log_message(f"🧠 RAM: {format_bytes(vm.used)} von {format_bytes(vm.total)} belegt ({vm.percent:.0f}%), "
+                         f"{format_bytes(vm.available)} verfügbar"
+                         + (f", Cache/Standby {format_bytes(cache)}" if cache else ""), "INFO")
+        
+        job.set_progress(30, "Prozesse lesen...")
+        for row in memory_report(self.sampler.processes):
+            uss = f", USS {format_bytes(row['uss'])}" if row['uss'] is not None else ""
+            self.log_message(f"   {row['name']} ({row['pid']}): RSS {format_bytes(row['rss'])}{uss}", "INFO")
         
-        self.is_running = True
-        self.show_progress(True)
+        job.set_progress(80, "Leck-Erkennung...")
+        suspects = self.leak_detector.suspects()
+        for s in suspects:
+            self.log_message(f"📈 Mögliches Leck: {s['name']} ({s['pid']}) +{format_bytes(s['growth'])} in "
+                             f"{s['duration'] / 60:.0f} min ({format_bytes(s['bytes_per_min'])}/min)", "WARNING")
+        if not suspects:
+            span = self.leak_detector.span
+            if span < self.leak_detector.interval * (self.leak_detector.min_samples - 1):
+                self.log_message(f"ℹ️ Leck-Erkennung: erst {span / 60:.0f} min Verlauf", "INFO")
+            else:
+                self.log_message(f"✓ Keine wachsenden Prozesse in den letzten {span / 60:.0f} min", "INFO")
         
-        thread = threading.Thread(target=self._ultimate_performance_thread)
-        thread.daemon = True
-        thread.start()
+        self.log_message("✅ Speicher-Report erstellt", "SUCCESS")
     
-    def _ultimate_performance_thread(self):
+    def _memory_trim_thread(self, job):
+        backend = self.get_trim_backend()
+        self.log_message(f"🧠 Entlaste Arbeitsspeicher ({backend.name})...", "INFO")
+        
+        # Nicht uns selbst, das Vordergrundfenster und das Spiel des Governors
+        table = self.sampler.processes
+        table.register('name', 'memory_info')
         try:
-            self.log_message("⚡ Starte Ultimate Performance...", "INFO")
-            
-            steps = [
-                ("Temp-Bereinigung", 25),
-                ("Festplatte", 50),
-                ("Dienste", 75),
-                ("System", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            self.log_message("✅ Ultimate Performance aktiviert!", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
+            table.refresh(max_age=1.0)
+            records = table.snapshot()
         finally:
-            self.show_progress(False)
-            self.is_running = False
-    
-    def balanced_optimization(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+            table.unregister('name', 'memory_info')
+        skip = {os.getpid(), foreground_pid()}
+        if self.governor is not None and self.governor.target is not None:
+            skip.add(self.governor.target.pid)
+        pids = [r.pid for r in records if r.pid not in skip and r.rss >= self.trim_min_rss]
         
-        self.is_running = True
-        self.show_progress(True)
+        job.set_progress(10, f"Trimme {len(pids)} Prozesse (Messung {self.trim_window:.0f}s vorher/danach)...")
+        result = MemoryTrimmer(backend, self.trim_window, job.sleep).run(pids)
+        before, after = result['before'], result['after']
         
-        thread = threading.Thread(target=self._balanced_optimization_thread)
-        thread.daemon = True
-        thread.start()
+        self.log_message(f"🧠 {result['trimmed']} getrimmt" + (f", {result['failed']} ohne Zugriff" if result['failed'] else "")
+                         + f" – verfügbar {format_bytes(before['available'])} → {format_bytes(after['available'])}", "INFO")
+        if before['faults_per_sec'] is not None and after['faults_per_sec'] is not None:
+            self.log_message(f"📉 Page-Faults/s vorher {before['faults_per_sec']:.0f}, danach {after['faults_per_sec']:.0f}", "INFO")
+        self.add_stats(performance_tweaks=1, total_optimizations=1)
+        
+        if result['freed'] > 0:
+            self.log_message(f"✅ {format_bytes(result['freed'])} RAM freigegeben", "SUCCESS")
+        else:
+            self.log_message("✅ Trim ausgeführt, kein messbarer RAM-Gewinn", "SUCCESS")
     
-    def _balanced_optimization_thread(self):
-        try:
-            self.log_message("🔧 Starte Balanced Optimierung...", "INFO")
-            
-            steps = [
-                ("System reinigen", 33),
-                ("Festplatte optimieren", 66),
-                ("Gaming aktivieren", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            self.log_message("✅ Balanced Optimierung abgeschlossen!", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+    # ========== SCAN & NOTFALL ==========
     
-    def complete_clean_install(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
-            return
+    def _smart_system_scan_thread(self, job):
+        self.log_message("🔍 Starte System-Scan...", "INFO")
         
-        self.is_running = True
-        self.show_progress(True)
+        index = self.get_scan_index()
+        scan = index.scan(self._scan_roots(),
+                          lambda r: job.set_progress(min(95, r['dirs_listed'] // 20), f"Scan... {r['files_indexed']} Dateien"))
+        job.set_progress(100, "Scan abgeschlossen")
         
-        thread = threading.Thread(target=self._complete_clean_install_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _complete_clean_install_thread(self):
-        try:
-            self.log_message("🧼 Starte Clean Install Simulation...", "INFO")
-            
-            steps = [
-                ("Deep Clean", 20),
-                ("System Junk", 40),
-                ("Registry", 60),
-                ("Disk", 80),
-                ("Finalisierung", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(1)
-            
-            self.log_message("✅ Clean Install Simulation abgeschlossen!", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+        self.log_message(f"✅ System-Scan abgeschlossen! ({scan['dirs']} Ordner in {scan['elapsed']:.2f}s)", "SUCCESS")
+        labels = {'temp': "Temporäre Dateien", 'junk': "System-Müll"}
+        for category, (count, size) in sorted(index.summary().items()):
+            self.log_message(f"✓ {labels.get(category, category)}: {count} Dateien, {format_bytes(size)}", "INFO")
+        
+        # Tweak-Zustand: ein gebündelter Abruf, danach beantworten alle Profile aus dem Snapshot
+        catalog = self.get_catalog()
+        prober = self.get_state_prober()
+        scan_profiles = ['gaming_mode', 'gpu', 'cpu_gaming', 'network_gaming',
+                         'services', 'disk_tweaks', 'responsiveness', 'visual']
+        prober.snapshot([catalog.tweaks[tid] for p in scan_profiles for tid in catalog.expand_profile(p)])
+        pending_total = 0
+        for profile in scan_profiles:
+            plan = TweakPlanner(catalog, probe=prober.applied).compile(profile)
+            pending = len(plan.steps)
+            pending_total += pending
+            if pending:
+                self.log_message(f"✓ {plan.label}: {pending} Tweaks offen", "INFO")
+            else:
+                self.log_message(f"✓ {plan.label} bereits aktiv", "INFO")
+        if pending_total == 0:
+            self.log_message("✓ System ist bereits vollständig optimiert", "SUCCESS")
     
-    def smart_system_scan(self):
-        if self.is_running:
-            self.log_message("⚠️ Optimierung läuft bereits", "WARNING")
+    def _emergency_restore_thread(self, job):
+        self.log_message("🛑 Starte Notfall-Wiederherstellung...", "CRITICAL")
+        
+        journal = self.get_journal()
+        if not journal.pending():
+            self.log_message("✓ Keine offenen Änderungen im Journal", "SUCCESS")
             return
         
-        self.is_running = True
-        self.show_progress(True)
+        # Journal rückwärts: Registry als ein Batch, Dienste/powercfg/netsh parallel
+        # Rücknahmen selbst nicht erneut protokollieren
+        replayer = JournalReplayer(lambda changes: self.get_registry_writer().apply_batch(changes, record=False),
+                                   lambda script: self.get_shell_pool().run(script, timeout=60, token=job.token),
+                                   handlers={'task': lambda entry: self.get_startup_backend().restore_task(entry),
+                                             'service': lambda entry: self.get_service_backend().restore_entry(entry)})
+        result = replayer.replay(journal, job.token, job.set_progress)
+        self.get_state_prober().invalidate()
         
-        thread = threading.Thread(target=self._smart_system_scan_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _smart_system_scan_thread(self):
-        try:
-            self.log_message("🔍 Starte System-Scan...", "INFO")
-            
-            for i in range(1, 101):
-                self.update_progress(i, f"Scan... {i}%")
-                time.sleep(0.03)
-            
-            self.log_message("✅ System-Scan abgeschlossen!", "SUCCESS")
-            self.log_message("✓ Temporäre Dateien gefunden", "INFO")
-            self.log_message("✓ Gaming-Modus nicht aktiviert", "INFO")
-            self.log_message("✓ System könnte schneller sein", "INFO")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
-    
-    # ========== ONE-CLICK OPTIMIERUNG ==========
-    
-    def ultimate_one_click_optimization(self):
-        reply = QMessageBox.question(
-            self, "One-Click Optimierung",
-            "Alle Optimierungen anwenden?\nDauert 2-5 Minuten.",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
+        for entry, detail in result['failed']:
+            self.log_message(f"⚠️ {entry['target']}: {detail}", "WARNING")
+        files = [e for e in result['irreversible'] if e['kind'] == 'file']
+        if files:
+            deleted = sum(e['new']['files'] for e in files)
+            self.log_message(f"ℹ️ {deleted} gelöschte Dateien aus {len(files)} Bereinigungen sind nicht umkehrbar", "INFO")
+        unknown = len(result['irreversible']) - len(files)
+        if unknown:
+            self.log_message(f"ℹ️ {unknown} Änderungen ohne bekannten Vorwert übersprungen", "INFO")
         
-        if reply == QMessageBox.StandardButton.Yes:
-            self.is_running = True
-            self.show_progress(True)
-            
-            thread = threading.Thread(target=self._ultimate_optimization_thread)
-            thread.daemon = True
-            thread.start()
+        if result['failed']:
+            self.log_message(f"⚠️ {result['restored']} Einstellungen zurückgesetzt, {len(result['failed'])} fehlgeschlagen "
+                             f"(bleiben im Journal)", "WARNING")
+        else:
+            self.log_message(f"✅ {result['restored']} Einstellungen in {result['elapsed']:.2f}s zurückgesetzt", "SUCCESS")
     
-    def _ultimate_optimization_thread(self):
-        try:
-            self.log_message("🚀 Starte One-Click Optimierung...", "INFO")
-            
-            steps = [
-                ("Temp-Bereinigung", 16),
-                ("Festplatten-Optimierung", 32),
-                ("System-Müll", 48),
-                ("Registry", 64),
-                ("Gaming-Modus", 80),
-                ("Dienste", 100),
-            ]
-            
-            for text, progress in steps:
-                self.update_progress(progress, text)
-                time.sleep(2)
-            
-            self.log_message("✅ One-Click Optimierung abgeschlossen!", "SUCCESS")
-            
-            reply = QMessageBox.question(
-                self, "Optimierung abgeschlossen",
-                "Für beste Ergebnisse jetzt neu starten?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                try:
-                    os.system('shutdown /r /t 30')
-                except:
-                    pass
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
-        finally:
-            self.show_progress(False)
-            self.is_running = False
+    # ========== EXPORT ==========
     
-    # ========== NOTFALL-FUNKTIONEN ==========
+    def _export_path(self, prefix, extension):
+        home = os.environ.get('USERPROFILE') or os.path.expanduser('~')
+        folder = os.path.join(home, 'Desktop')
+        if not os.path.isdir(folder):
+            folder = home
+        return os.path.join(folder, f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
     
-    def emergency_restore(self):
-        reply = QMessageBox.critical(
-            self, "Notstopp",
-            "Alle Änderungen rückgängig machen?\nKann zu Systeminstabilität führen!",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            self.is_running = True
-            self.show_progress(True)
-            
-            thread = threading.Thread(target=self._emergency_restore_thread)
-            thread.daemon = True
-            thread.start()
+    def _export_stats_csv_thread(self, job):
+        file_path = self._export_path("optimizer_stats", "csv")
+        count = self.stats_store.export_csv(file_path)
+        self.log_message(f"✅ Statistiken exportiert ({count} Läufe): {file_path}", "SUCCESS")
     
-    def _emergency_restore_thread(self):
+    def _generate_report_thread(self, job):
+        file_path = self._export_path("optimizer_report", "txt")
+        self.stats_store.write_report(file_path)
+        self.log_message(f"✅ Report generiert: {file_path}", "SUCCESS")
+
+
+# ========== HEADLESS: CLI & DAEMON ==========
+
+class HeadlessOptimizer(OptimizerCore):
+    # Kern ohne Fenster für geplante Aufgaben, CLI und Daemon – lädt kein Qt
+    def __init__(self, log_stream=None, log_level="INFO"):
+        self.setup_core(stdout_mirror=StdoutMirror(log_stream) if log_stream else None, log_level=log_level)
+
+    def close(self):
+        self.shutdown()
+
+
+def job_summary(job):
+    info = {
+        'id': job.id, 'name': job.name, 'status': job.status, 'progress': job.progress,
+        'duration': round(job.duration, 3), 'error': str(job.error) if job.error else None,
+    }
+    # run_profile liefert [(tweak, ok, detail), ...]
+    if isinstance(job.result, list):
+        info['steps'] = [{'id': tweak.id, 'kind': tweak.kind, 'ok': ok, 'detail': str(detail) if detail else None}
+                         for tweak, ok, detail in job.result]
+    return info
+
+
+def summary_succeeded(summary):
+    # Für lokale Jobs und für die serialisierte Antwort des Daemons
+    return summary['status'] == Job.DONE and all(step['ok'] for step in summary.get('steps', []))
+
+
+def job_succeeded(job):
+    return summary_succeeded(job_summary(job))
+
+
+def get_daemon_info_path():
+    return os.path.join(get_data_dir(), 'daemon.json')
+
+
+class DaemonServer:
+    # Nimmt Jobs über einen lokalen Socket an: eine JSON-Anfrage pro Zeile, eine Antwort pro Zeile.
+    # Unix-Socket (0600) wo verfügbar, sonst Loopback-TCP; Adresse und Token stehen in daemon.json
+    # im Datenverzeichnis des Benutzers, jede Anfrage muss das Token mitschicken.
+    MAX_FINISHED = 100
+
+    def __init__(self, core, info_path=None):
+        self.core = core
+        self.info_path = info_path or get_daemon_info_path()
+        self.token = uuid.uuid4().hex
+        self.jobs = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.sock = None
+        self.address = None
+
+    def start(self):
+        if hasattr(socket, 'AF_UNIX') and os.name != 'nt':
+            path = os.path.join(os.path.dirname(self.info_path), 'daemon.sock')
+            if os.path.exists(path):
+                os.remove(path)
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.bind(path)
+            os.chmod(path, 0o600)
+            self.address = {'family': 'unix', 'path': path}
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.bind(('127.0.0.1', 0))
+            self.address = {'family': 'tcp', 'host': '127.0.0.1', 'port': self.sock.getsockname()[1]}
+        self.sock.listen(16)
+        self.sock.settimeout(0.5)
+
+        fd = os.open(self.info_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump({**self.address, 'token': self.token, 'pid': os.getpid()}, fh)
+        return self
+
+    def serve_forever(self):
+        self.core.log_message(f"🛰️ Daemon bereit ({self.address['family']})", "SUCCESS")
         try:
-            self.log_message("🛑 Starte Notfall-Wiederherstellung...", "CRITICAL")
-            
-            for i in range(1, 101):
-                self.update_progress(i, f"Wiederherstellung... {i}%")
-                time.sleep(0.05)
-            
-            # Systemwiederherstellungspunkt
-            try:
-                ps_script = """
-                try {
-                    Checkpoint-Computer -Description "Ultimate Optimizer Emergency Restore"
-                    Write-Host "Systemwiederherstellungspunkt erstellt"
-                } catch {
-                    Write-Host "Konnte keinen Systemwiederherstellungspunkt erstellen"
-                }
-                """
-                subprocess.run(['powershell', '-Command', ps_script], shell=True, timeout=60)
-            except:
-                pass
-            
-            self.log_message("✅ Wiederherstellung gestartet", "SUCCESS")
-            
-        except Exception as e:
-            self.log_message(f"❌ Fehler: {e}", "ERROR")
+            while not self._stop.is_set():
+                try:
+                    conn, _ = self.sock.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
         finally:
-            self.show_progress(False)
-            self.is_running = False
-    
-    # ========== EINSTELLUNGEN ==========
-    
-    def save_settings(self):
-        self.log_message("✅ Einstellungen gespeichert", "SUCCESS")
-        QMessageBox.information(self, "Einstellungen", "Einstellungen wurden gespeichert!")
-    
-    def export_stats_csv(self):
-        try:
-            file_path = os.path.join(os.environ['USERPROFILE'], 'Desktop', f"optimizer_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-            self.log_message(f"✅ Statistiken exportiert: {file_path}", "SUCCESS")
-        except:
-            self.log_message("❌ Export fehlgeschlagen", "ERROR")
-    
-    def generate_report(self):
+            self.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            if self.address['family'] == 'unix' and os.path.exists(self.address['path']):
+                os.remove(self.address['path'])
+            if os.path.exists(self.info_path):
+                os.remove(self.info_path)
+
+    def _handle(self, conn):
+        with conn, conn.makefile('rwb') as stream:
+            for line in stream:
+                try:
+                    request = json.loads(line)
+                    if request.get('token') != self.token:
+                        response = {'ok': False, 'error': "Ungültiges Token"}
+                    else:
+                        response = self.dispatch(request)
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                stream.write(json.dumps(response).encode('utf-8') + b"\n")
+                stream.flush()
+
+    def _remember(self, job):
+        with self._lock:
+            self.jobs[job.id] = job
+            finished = [jid for jid, j in self.jobs.items() if j.is_finished]
+            for jid in finished[:max(0, len(finished) - self.MAX_FINISHED)]:
+                del self.jobs[jid]
+
+    def _job(self, request):
+        with self._lock:
+            job = self.jobs.get(request.get('id'))
+        if job is None:
+            raise KeyError(f"Unbekannter Job {request.get('id')}")
+        return job
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if op == 'run':
+            if request.get('profile'):
+                job = self.core.submit_profile(request['profile'])
+            else:
+                job = self.core.submit_action(request['action'])
+            if job is None:
+                return {'ok': False, 'error': "Job läuft bereits"}
+            self._remember(job)
+            if request.get('wait'):
+                job.wait()
+            return {'ok': True, 'job': job_summary(job)}
+        if op == 'job':
+            job = self._job(request)
+            if request.get('wait'):
+                job.wait(request.get('timeout'))
+            return {'ok': True, 'job': job_summary(job)}
+        if op == 'jobs':
+            with self._lock:
+                jobs = list(self.jobs.values())
+            return {'ok': True, 'jobs': [job_summary(j) for j in jobs]}
+        if op == 'cancel':
+            self.core.scheduler.cancel(self._job(request))
+            return {'ok': True}
+        if op == 'stats':
+            return {'ok': True, 'stats': dict(self.core.optimization_stats)}
+        if op == 'shutdown':
+            self.stop()
+            return {'ok': True}
+        return {'ok': False, 'error': f"Unbekannte Operation '{op}'"}
+
+
+def daemon_request(request, info_path=None, timeout=None):
+    with open(info_path or get_daemon_info_path(), encoding='utf-8') as fh:
+        info = json.load(fh)
+    if info['family'] == 'unix':
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(info['path'])
+    else:
+        sock = socket.create_connection((info['host'], info['port']))
+    sock.settimeout(timeout)
+    with sock, sock.makefile('rwb') as stream:
+        stream.write(json.dumps({**request, 'token': info['token']}).encode('utf-8') + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def _print_result(args, data, text):
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        print(text)
+
+
+def _cli_run(args):
+    # Bei --json gehört stdout allein dem Ergebnis, das Log geht nach stderr
+    core = HeadlessOptimizer(sys.stderr if args.json else sys.stdout, args.level)
+    core.temp_budget = args.budget
+    core.duplicate_roots = args.path
+    core.disk_usage_root = args.path[0] if args.path else None
+    if args.min_age is not None:
+        core.temp_min_age = args.min_age * 3600
+    try:
+        before = dict(core.optimization_stats)
         try:
-            file_path = os.path.join(os.environ['USERPROFILE'], 'Desktop', f"optimizer_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
-            self.log_message(f"✅ Report generiert: {file_path}", "SUCCESS")
-        except:
-            self.log_message("❌ Report-Generierung fehlgeschlagen", "ERROR")
+            job = core.submit_profile(args.profile) if args.profile else core.submit_action(args.action)
+        except KeyError as e:
+            print(f"❌ Unbekannt: {e}", file=sys.stderr)
+            return 2
+        job.wait()
+    finally:
+        core.close()
+
+    summary = job_summary(job)
+    summary['stats'] = {key: core.optimization_stats[key] - before.get(key, 0) for key in STAT_KEYS}
+    _print_result(args, summary, f"{job.name}: {job.status} in {job.duration:.2f}s")
+    return 0 if job_succeeded(job) else 1
+
+
+def _cli_list(args):
+    catalog = TweakCatalog.load()
+    profiles = {name: catalog.profile_label(name) for name in catalog.profiles}
+    actions = {name: spec[0] for name, spec in OptimizerCore.ACTIONS.items()}
+    lines = ["Profile:"] + [f"  {n:<24} {l}" for n, l in profiles.items()]
+    lines += ["Aktionen:"] + [f"  {n:<24} {l}" for n, l in actions.items()]
+    _print_result(args, {'profiles': profiles, 'actions': actions}, "\n".join(lines))
+    return 0
+
+
+def _cli_daemon(args):
+    core = HeadlessOptimizer(sys.stdout, args.level)
+    server = DaemonServer(core).start()
 
-def main():
+    def stop(signum, frame):
+        server.stop()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    finally:
+        core.close()
+    return 0
+
+
+def _cli_client(args):
+    if args.command == 'submit':
+        request = {'op': 'run', 'profile': args.profile, 'action': args.action, 'wait': args.wait}
+    elif args.command == 'status':
+        request = {'op': 'job', 'id': args.id, 'wait': args.wait} if args.id else {'op': 'jobs'}
+    elif args.command == 'cancel':
+        request = {'op': 'cancel', 'id': args.id}
+    else:
+        request = {'op': 'shutdown'}
+    try:
+        response = daemon_request(request)
+    except OSError as e:
+        print(f"❌ Daemon nicht erreichbar: {e}", file=sys.stderr)
+        return 2
+    jobs = [response['job']] if 'job' in response else response.get('jobs', [])
+    text = "\n".join(f"#{j['id']} {j['name']}: {j['status']} ({j['progress']}%)" for j in jobs) or \
+        ("OK" if response.get('ok') else f"❌ {response.get('error')}")
+    _print_result(args, response, text)
+    if not response.get('ok'):
+        return 1
+    if args.command == 'submit' and args.wait:
+        return 0 if summary_succeeded(response['job']) else 1
+    return 0
+
+
+def _cli_govern(args):
+    core = HeadlessOptimizer(sys.stdout, args.level)
+    target = int(args.target) if args.target and args.target.isdigit() else args.target
+    governor = core.start_governor(target)
+    if not governor.running:
+        core.close()
+        return 1
+
+    def stop(signum, frame):
+        governor.stop(wait=False)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
     try:
-        app = QApplication(sys.argv)
-        
-        # Dark Theme
-        app.setStyle("Fusion")
-        palette = app.palette()
-        palette.setColor(palette.ColorRole.Window, QColor(10, 10, 10))
-        palette.setColor(palette.ColorRole.WindowText, QColor(240, 240, 240))
-        palette.setColor(palette.ColorRole.Base, QColor(25, 25, 25))
-        palette.setColor(palette.ColorRole.Text, QColor(240, 240, 240))
-        palette.setColor(palette.ColorRole.Button, QColor(40, 40, 40))
-        palette.setColor(palette.ColorRole.ButtonText, QColor(240, 240, 240))
-        app.setPalette(palette)
-        
-        window = UltimateOptimizer()
-        window.show()
-        
-        print("✅ Programm erfolgreich gestartet!")
-        sys.exit(app.exec())
-        
-    except Exception as e:
-        print(f"❌ KRITISCHER FEHLER: {e}")
-        import traceback
-        traceback.print_exc()
-        input("\nDrücke Enter zum Beenden...")
+        # In Stücken warten, damit Signale ankommen
+        while not governor.wait(0.5):
+            pass
+    finally:
+        core.close()
+    return 0
+
+
+def _cli_gui(args):
+    from optimizer_gui import main as gui_main
+    gui_main(log_stdout=args.log_stdout, profile_startup=args.profile_startup)
+    return 0
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(prog="python -m ultimate_optimizer",
+                                     description="Ultimate PC Optimizer – GUI, CLI und Daemon")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def target(p, required=True):
+        group = p.add_mutually_exclusive_group(required=required)
+        group.add_argument('--profile', help="Profil aus tweak_catalog.json")
+        group.add_argument('--action', choices=list(OptimizerCore.ACTIONS))
+
+    def output(p):
+        p.add_argument('--json', action='store_true', help="Ergebnis als JSON auf stdout")
+
+    p = sub.add_parser('run', help="Profil oder Aktion ausführen und auf das Ende warten")
+    target(p)
+    output(p)
+    p.add_argument('--level', default="INFO", choices=list(LOG_LEVELS))
+    p.add_argument('--budget', type=parse_size, help="Temp-Bereinigung: nur so viel freigeben, z.B. 10GB")
+    p.add_argument('--min-age', type=float, help="Temp-Bereinigung: nur Dateien älter als so viele Stunden")
+    p.add_argument('--path', action='append', help="Duplikat-Suche/Speicherbelegung: Startordner (mehrfach möglich)")
+    p.set_defaults(handler=_cli_run)
+
+    p = sub.add_parser('list', help="Profile und Aktionen anzeigen")
+    output(p)
+    p.set_defaults(handler=_cli_list)
+
+    p = sub.add_parser('daemon', help="Im Hintergrund laufen und Jobs über einen lokalen Socket annehmen")
+    p.add_argument('--level', default="INFO", choices=list(LOG_LEVELS))
+    p.set_defaults(handler=_cli_daemon)
+
+    p = sub.add_parser('submit', help="Job an den Daemon schicken")
+    target(p)
+    output(p)
+    p.add_argument('--wait', action='store_true')
+    p.set_defaults(handler=_cli_client)
+
+    p = sub.add_parser('status', help="Jobs des Daemons anzeigen")
+    p.add_argument('--id', type=int)
+    p.add_argument('--wait', action='store_true')
+    output(p)
+    p.set_defaults(handler=_cli_client)
+
+    p = sub.add_parser('cancel', help="Job im Daemon abbrechen")
+    p.add_argument('id', type=int)
+    output(p)
+    p.set_defaults(handler=_cli_client)
+
+    p = sub.add_parser('stop', help="Daemon beenden")
+    output(p)
+    p.set_defaults(handler=_cli_client)
+
+    p = sub.add_parser('govern', help="Hintergrundprozesse drosseln, solange ein Spiel läuft")
+    p.add_argument('--target', help="Prozessname oder PID (Standard: nächstes Vordergrundfenster, nur Windows)")
+    p.add_argument('--level', default="INFO", choices=list(LOG_LEVELS))
+    p.set_defaults(handler=_cli_govern)
+
+    p = sub.add_parser('gui', help="Grafische Oberfläche starten (Standard)")
+    p.add_argument('--log-stdout', action='store_true')
+    p.add_argument('--profile-startup', action='store_true',
+                   help="Import- und Aufbauzeiten ausgeben und nach dem ersten Frame beenden")
+    p.set_defaults(handler=_cli_gui)
+    return parser
+
+
+def cli_main(argv):
+    if argv and argv[0] == '--bench':
+        run_benchmark(argv[1:])
+        return 0
+    # Ohne Befehl (Doppelklick, alte Verknüpfungen mit --log-stdout) startet wie bisher die GUI
+    if not argv or argv[0].startswith('-') and argv[0] not in ('-h', '--help'):
+        argv = ['gui'] + list(argv)
+    args = build_cli_parser().parse_args(argv)
+    return args.handler(args)
+
+
+def bench_startup(count=5):
+    # Importzeit und RSS eines frischen Prozesses: Headless-Pfad gegen GUI-Import
+    probe = (
+        "import time, sys; t = time.perf_counter(); {stmt}; t = time.perf_counter() - t; "
+        "import psutil, json; print(json.dumps({{'import_ms': t * 1000, "
+        "'rss_mb': psutil.Process().memory_info().rss / 2**20, 'qt': 'PySide6' in sys.modules}}))"
+    )
+    variants = {
+        'headless': "import ultimate_optimizer as u; u.HeadlessOptimizer().close()",
+        'gui_import': "import optimizer_gui",
+    }
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    results = {}
+    for name, stmt in variants.items():
+        runs = []
+        for _ in range(count):
+            out = subprocess.run([sys.executable, "-c", probe.format(stmt=stmt)], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)), env=env).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        results[name] = {
+            'import_ms': round(statistics.median(r['import_ms'] for r in runs), 1),
+            'rss_mb': round(statistics.median(r['rss_mb'] for r in runs), 1),
+            'qt_loaded': runs[0]['qt'],
+        }
+    return results
+
+
+def run_benchmark(argv):
+    parser = argparse.ArgumentParser(prog="ultimate_optimizer.py --bench")
+    parser.add_argument('name', choices=['cleanup', 'scan', 'log', 'shell', 'registry', 'monitor', 'suite', 'stats', 'startup', 'widgets', 'evict', 'dupes', 'dirsize', 'checkpoint', 'journal', 'governor', 'processes', 'memory', 'autostart', 'services'])
+    parser.add_argument('--files', type=int, default=None)
+    parser.add_argument('--dir', default=None)
+    parser.add_argument('--count', type=int, default=None)
+    parser.add_argument('--no-legacy', action='store_true')
+    parser.add_argument('--legacy', action='store_true')
+    parser.add_argument('--interval', type=float, default=0.1)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--trials', type=int, default=7)
+    parser.add_argument('--workload', action='append', choices=list(WORKLOADS))
+    parser.add_argument('--path', default=None, help="dirsize: vorhandenen Ordner messen statt eines synthetischen Baums")
+    args = parser.parse_args(argv)
+    
+    if args.name == 'cleanup':
+        results = bench_temp_cleanup(args.files or 1_000_000, args.dir, compare_legacy=not args.no_legacy)
+    elif args.name == 'scan':
+        results = bench_scan_index(args.files or 500_000, args.dir)
+    elif args.name == 'log':
+        from optimizer_gui import bench_log_console
+        results = bench_log_console(args.files or 100_000, legacy=args.legacy)
+    elif args.name == 'shell':
+        results = bench_shell_pool(args.count or 50)
+    elif args.name == 'registry':
+        results = bench_registry_batch(args.count or 10_000)
+    elif args.name == 'monitor':
+        results = bench_system_sampler(args.duration, args.interval)
+    elif args.name == 'suite':
+        results = bench_suite(args.trials, args.workload)
+    elif args.name == 'stats':
+        results = bench_stats_store(args.count or 100_000, args.dir)
+    elif args.name == 'startup':
+        results = bench_startup(args.count or 5)
+    elif args.name == 'services':
+        results = bench_services(args.count or 40, args.duration, args.interval)
+    elif args.name == 'autostart':
+        results = bench_autostart(args.count or 300, args.dir)
+    elif args.name == 'memory':
+        results = bench_memory(args.count or 200)
+    elif args.name == 'processes':
+        results = bench_process_table(args.count or 2000)
+    elif args.name == 'governor':
+        results = bench_governor(args.count or 200)
+    elif args.name == 'journal':
+        results = bench_journal(args.count or 10_000, args.dir)
+    elif args.name == 'checkpoint':
+        results = bench_checkpoints(args.files or 500_000, args.dir)
+    elif args.name == 'dirsize':
+        results = bench_dir_sizes(args.files or 200_000, args.dir, args.path)
+    elif args.name == 'dupes':
+        results = bench_duplicates(args.files or 1000, args.dir)
+    elif args.name == 'evict':
+        results = bench_eviction(args.files or 200_000, args.dir)
+    elif args.name == 'widgets':
+        from optimizer_gui import bench_widget_construction
+        results = bench_widget_construction(args.count or 400, args.trials)
+    print(json.dumps(results, indent=2))
+
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("ULTIMATE PC OPTIMIZER v6.0 - STABILE VERSION")
-    print("=" * 50)
-    main()
\ No newline at end of file
+    # "python -m ultimate_optimizer" läuft als __main__; optimizer_gui importiert das Modul
+    # per Namen und soll dieselben Klassen sehen statt eine zweite Kopie zu laden
+    sys.modules.setdefault('ultimate_optimizer', sys.modules[__name__])
+    sys.exit(cli_main(sys.argv[1:]))